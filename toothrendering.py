@@ -1,12 +1,19 @@
 import bpy
 import os
 import json
-import mathutils
 import math
 import subprocess
 import sys
 import time
 
+# 같은 폴더의 보조 모듈(toothrendering_*.py) import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from toothrendering_mesh import assign_material_indices
+from toothrendering_rigs import get_rig
+
 # 카메라 파라미터
 # 
 
@@ -110,41 +117,11 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         scene.cycles.caustics_reflective = True  # 반사 카우스틱 활성화
         scene.cycles.caustics_refractive = True  # 굴절 카우스틱 활성화
 
-        # === 카메라 포즈 정의 ===
-        target = mathutils.Vector((0, 100, 0))
-        distance = 100
-        
-        if Sequence:
-            # Sequence 모드: top -> left -> bottom 3개 키포인트만 사용
-            sequence_keypoints = [
-                ("top", mathutils.Vector((0, -1, 1))),
-                ("left", mathutils.Vector((-1, -1, 0))),
-                ("bottom", mathutils.Vector((0, -1, -1))),
-            ]
-            camera_positions = []
-            for name, view_dir in sequence_keypoints:
-                view_dir = view_dir.normalized()
-                cam_pos = target + view_dir * distance
-                camera_positions.append((name, cam_pos))
-        else:
-            # 기존 모드: 10개 카메라 각도 사용
-            camera_configs = [
-                ("front", mathutils.Vector((0, -1, 0))),
-                ("top", mathutils.Vector((0, -1, 1))),
-                ("bottom", mathutils.Vector((0, -1, -1))),
-                ("right", mathutils.Vector((1, -1, 0))),
-                ("left", mathutils.Vector((-1, -1, 0))),
-                ("front_top_right", mathutils.Vector((1, -1, 1))),
-                ("front_top_left", mathutils.Vector((-1, -1, 1))),
-                ("front_bottom_right", mathutils.Vector((1, -1, -1))),
-                ("front_bottom_left", mathutils.Vector((-1, -1, -1))),
-                ("front_slightly_up", mathutils.Vector((0, -1, 0.5))),
-            ]
-            camera_positions = []
-            for name, view_dir in camera_configs:
-                view_dir = view_dir.normalized()
-                cam_pos = target + view_dir * distance
-                camera_positions.append((name, cam_pos))
+        # === 카메라 포즈 정의 (toothrendering_rigs.py의 rig 정의) ===
+        # Sequence 모드: top -> left -> bottom 보간 30장 (orbit30), 기존 모드: 10개 카메라 각도 (seq0)
+        camera_rig = get_rig("orbit30" if Sequence else "seq0")
+        target = camera_rig.target_vector()
+        camera_positions = camera_rig.camera_positions()
 
         # === 잇몸 머티리얼 (AO 노드 적용) ===
         mat_gum = bpy.data.materials.get("Gingiva_mat") or bpy.data.materials.new(
@@ -626,37 +603,15 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
             with open(json_file) as f:
                 meta = json.load(f)
             labels = meta["labels"]
-            for poly in mesh.polygons:
-                face_labels = [labels[v] for v in poly.vertices]
-                if all(l == 0 for l in face_labels):
-                    poly.material_index = 0
-                elif all(l > 0 for l in face_labels):
-                    poly.material_index = 1
+            assign_material_indices(mesh, labels)
             file_prefix = f"{parent_folder}_{selected_folder}"
             
             # 카메라 루프
             if Sequence:
-                # Sequence 모드: top->left->bottom 보간으로 30장 생성
-                total_sequence_frames = 30
-                frames_per_segment = 15  # top->left: 15장, left->bottom: 15장
-                
-                for frame_idx in range(total_sequence_frames):
-                    # 프레임 인덱스에 따라 보간 계산
-                    if frame_idx < frames_per_segment:
-                        # top -> left 보간 (0~14)
-                        t = frame_idx / (frames_per_segment - 1)
-                        start_pos = camera_positions[0][1]  # top
-                        end_pos = camera_positions[1][1]    # left
-                        cam_pos = start_pos.lerp(end_pos, t)
-                        view_name = f"seq_{frame_idx:02d}_top_to_left"
-                    else:
-                        # left -> bottom 보간 (15~29)
-                        t = (frame_idx - frames_per_segment) / (frames_per_segment - 1)
-                        start_pos = camera_positions[1][1]  # left
-                        end_pos = camera_positions[2][1]    # bottom
-                        cam_pos = start_pos.lerp(end_pos, t)
-                        view_name = f"seq_{frame_idx:02d}_left_to_bottom"
-                    
+                # Sequence 모드: top->left->bottom 보간으로 30장 생성 (top->left: 15장, left->bottom: 15장)
+                total_sequence_frames = len(camera_positions)
+
+                for frame_idx, (view_name, cam_pos) in enumerate(camera_positions):
                     # 카메라 생성 및 렌더링
                     cam_data = bpy.data.cameras.new(view_name + "_cam")
                     cam_obj = bpy.data.objects.new(view_name + "_cam", cam_data)
@@ -666,7 +621,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
                     rot_quat = direction.to_track_quat("-Z", "Y")
                     cam_obj.rotation_euler = rot_quat.to_euler()
                     bpy.context.scene.camera = cam_obj
-                    cam_data.angle = math.radians(60)
+                    cam_data.angle = math.radians(camera_rig.fov_deg)
                     
                     # directional light 생성
                     light_data = bpy.data.lights.new(view_name + "_sun", type="SUN")
@@ -720,7 +675,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
                     rot_quat = direction.to_track_quat("-Z", "Y")
                     cam_obj.rotation_euler = rot_quat.to_euler()
                     bpy.context.scene.camera = cam_obj
-                    cam_data.angle = math.radians(60)
+                    cam_data.angle = math.radians(camera_rig.fov_deg)
                     # directional light 생성
                     light_data = bpy.data.lights.new(name + "_sun", type="SUN")
                     light_data.energy = 5
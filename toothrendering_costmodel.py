@@ -0,0 +1,260 @@
+import json
+import os
+import sys
+import time
+
+'''
+렌더링 비용 모델 모듈
+- (렌더링 타입, 엔진)별 뷰 한 장 렌더링 시간을 면 수에 대한 1차식(초 = a + b × 백만 면)으로 학습
+- (렌더링 타입, 파일 형식)별 뷰 한 장 출력 용량 평균 학습
+- 실행할 때마다 같은 JSON 파일에 누적 (오래된 관측은 DECAY로 천천히 잊음)
+- 저장할 때 파일을 다시 읽어 이번 프로세스의 새 관측만 더하므로 여러 워커가 같은 파일을 써도 관측이 사라지지 않음
+- 렌더링 스크립트의 ETA, 작업 큐 순서, --plan 예측(전체 시간/디스크 사용량), 마감 모드 계획에 사용
+- Cycles 패스는 샘플 수별("lit@32")로도 학습해서 샘플 수를 바꾼 설정의 시간을 예측
+- bpy 없이 동작 (일반 Python으로 실행)
+
+실행 예시:
+  python toothrendering_costmodel.py show <비용 모델 JSON>
+'''
+
+COST_MODEL_VERSION = 1
+COST_MODEL_FILENAME = "cost_model.json"
+DECAY = 0.98  # 관측 하나를 추가할 때 기존 통계에 곱하는 값 (GPU/드라이버가 바뀌어도 따라가도록)
+MIN_FACE_SPREAD = 0.05  # 면 수(백만) 표준편차가 이보다 작으면 기울기 대신 비례식 사용
+
+# 관측이 없을 때 사용하는 기본값
+DEFAULT_SECONDS_PER_VIEW = {"CYCLES": 2.0, "BLENDER_EEVEE_NEXT": 0.3}
+DEFAULT_BYTES_PER_VIEW = 300_000
+DEFAULT_FACES = 300_000
+
+
+def default_cost_model_path(output_base):
+    """기본 비용 모델 위치: output/cost_model.json"""
+    return os.path.join(output_base, COST_MODEL_FILENAME)
+
+
+def _decayed_add(stats, values):
+    for key in stats:
+        stats[key] *= DECAY
+    for key, value in values.items():
+        stats[key] = stats.get(key, 0.0) + value
+
+
+class CostModel:
+    """렌더링 시간/출력 용량 예측 모델 (JSON 파일 하나)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.passes = {}  # "타입/엔진" → 가중 합 {n, sx, sy, sxx, sxy} (x = 백만 면, y = 뷰당 초)
+        self.outputs = {}  # "타입/형식" → {n, bytes}
+        self.faces = {"n": 0.0, "sum": 0.0}
+        self._pending = []  # 마지막 저장 이후의 관측 [(섹션, 키, 값)] (저장할 때 파일의 최신 통계에 다시 더함)
+        stored = self._read(path) if path else None
+        if stored is not None:
+            self.passes, self.outputs, self.faces = stored
+
+    @staticmethod
+    def _read(path):
+        """파일의 통계 → (passes, outputs, faces), 파일이 없거나 버전이 다르면 None"""
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != COST_MODEL_VERSION:
+            print(f"  [WARNING] 비용 모델 버전이 달라 새로 학습합니다: {path}")
+            return None
+        return data["passes"], data["outputs"], data["faces"]
+
+    def _apply(self, section, key, values):
+        stats = getattr(self, section)
+        _decayed_add(stats if key is None else stats.setdefault(key, {}), values)
+
+    def _observe(self, section, key, values):
+        self._apply(section, key, values)
+        self._pending.append((section, key, values))
+
+    def mean_faces(self):
+        """지금까지 관측한 케이스 평균 면 수 (면 수를 모르는 케이스의 예측에 사용)"""
+        return self.faces["sum"] / self.faces["n"] if self.faces["n"] > 0 else DEFAULT_FACES
+
+    def observe(self, render_type, engine, faces, seconds_per_view):
+        """패스 하나(케이스 하나의 모든 뷰)의 뷰당 렌더링 시간 관측"""
+        x = faces / 1e6
+        self._observe("passes", f"{render_type}/{engine}",
+                      {"n": 1.0, "sx": x, "sy": seconds_per_view, "sxx": x * x, "sxy": x * seconds_per_view})
+
+    def observe_faces(self, faces):
+        self._observe("faces", None, {"n": 1.0, "sum": float(faces)})
+
+    def observe_bytes(self, render_type, file_format, bytes_per_view):
+        """패스 하나의 뷰당 출력 용량 관측 (결합 지오메트리 패스는 뷰당 모든 출력 파일 합)"""
+        self._observe("outputs", f"{render_type}/{file_format}", {"n": 1.0, "bytes": float(bytes_per_view)})
+
+    def coefficients(self, render_type, engine):
+        """뷰당 초 = a + b × 백만 면 → (a, b), 관측이 없으면 None"""
+        stats = self.passes.get(f"{render_type}/{engine}")
+        if not stats or stats["n"] <= 0:
+            return None
+        n = stats["n"]
+        mean_x = stats["sx"] / n
+        mean_y = stats["sy"] / n
+        var_x = stats["sxx"] / n - mean_x * mean_x
+        if var_x > MIN_FACE_SPREAD ** 2:
+            b = (stats["sxy"] / n - mean_x * mean_y) / var_x
+            a = mean_y - b * mean_x
+            if a >= 0 and b >= 0:
+                return a, b
+        # 면 수가 비슷한 케이스만 봤거나 기울기가 음수: 면 수에 비례
+        return 0.0, (mean_y / mean_x if mean_x > 0 else 0.0)
+
+    def predict_seconds(self, render_type, engine, faces):
+        """뷰 한 장 렌더링 예상 시간 (초)"""
+        coefficients = self.coefficients(render_type, engine)
+        if coefficients is None:
+            return DEFAULT_SECONDS_PER_VIEW.get(engine, 1.0)
+        a, b = coefficients
+        return a + b * faces / 1e6
+
+    def predict_samples_seconds(self, render_type, engine, faces, samples, base_samples):
+        """샘플 수를 바꾼 Cycles 패스의 뷰 한 장 예상 시간 (그 샘플 수 관측이 없으면 기본 샘플 수 예측에 비례)"""
+        key = f"{render_type}@{samples}"
+        if self.coefficients(key, engine) is not None:
+            return self.predict_seconds(key, engine, faces)
+        return self.predict_seconds(render_type, engine, faces) * samples / base_samples
+
+    def predict_bytes(self, render_type, file_format):
+        """뷰 한 장 출력 예상 용량 (바이트)"""
+        stats = self.outputs.get(f"{render_type}/{file_format}")
+        if not stats or stats["n"] <= 0:
+            return DEFAULT_BYTES_PER_VIEW
+        return stats["bytes"] / stats["n"]
+
+    def save(self):
+        """파일을 다시 읽어 마지막 저장 이후의 관측만 더한 뒤 임시 파일에 쓰고 원자적으로 교체
+
+        여러 워커가 같은 파일을 써도 다른 워커가 그 사이 저장한 관측을 덮어쓰지 않음
+        (다시 읽기와 교체 사이의 짧은 시간에 겹친 저장만 한쪽이 남음).
+        """
+        if not self.path:
+            return
+        stored = self._read(self.path)
+        if stored is not None:
+            self.passes, self.outputs, self.faces = stored
+            for section, key, values in self._pending:
+                self._apply(section, key, values)
+        self._pending = []
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": COST_MODEL_VERSION,
+                "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "passes": self.passes,
+                "outputs": self.outputs,
+                "faces": self.faces,
+            }, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def plan_batch(model, case_faces, passes, views):
+    """전체 배치 예측
+
+    case_faces: {케이스: 면 수 또는 None}, passes: [(렌더링 타입, 엔진, 파일 형식)], views: 뷰 수
+    → {'seconds', 'bytes', 'passes': {타입: {'seconds', 'bytes'}}, 'case_seconds': {케이스: 초}}
+    """
+    fallback_faces = model.mean_faces()
+    plan = {"seconds": 0.0, "bytes": 0.0, "passes": {}, "case_seconds": {}}
+    for case, faces in case_faces.items():
+        faces = faces or fallback_faces
+        case_seconds = 0.0
+        for render_type, engine, file_format in passes:
+            seconds = model.predict_seconds(render_type, engine, faces) * views
+            size = model.predict_bytes(render_type, file_format) * views
+            row = plan["passes"].setdefault(render_type, {"seconds": 0.0, "bytes": 0.0})
+            row["seconds"] += seconds
+            row["bytes"] += size
+            case_seconds += seconds
+            plan["bytes"] += size
+        plan["case_seconds"][case] = case_seconds
+        plan["seconds"] += case_seconds
+    return plan
+
+
+def parse_deadline(value, now=None):
+    """마감 시각 → epoch 초
+
+    숫자(또는 숫자 문자열): now부터의 초, 문자열: "YYYY-MM-DD HH:MM[:SS]" 현지 시각
+    """
+    now = time.time() if now is None else now
+    try:
+        return now + float(value)
+    except (TypeError, ValueError):
+        pass
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M"):
+        try:
+            return time.mktime(time.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise ValueError(f"마감 시각 형식 오류: {value} (\"YYYY-MM-DD HH:MM\" 또는 초)")
+
+
+def deadline_steps(sample_levels, optional_passes):
+    """마감 모드 품질 단계 (품질 높은 것부터) [(lit 샘플 수, 뺄 렌더링 타입 tuple)]
+
+    샘플 수를 먼저 단계별로 줄이고, 최저 샘플 수에서도 모자라면 선택 렌더링 타입을 순서대로 하나씩 뺌.
+    """
+    steps = [(samples, ()) for samples in sample_levels]
+    for count in range(1, len(optional_passes) + 1):
+        steps.append((sample_levels[-1], tuple(optional_passes[:count])))
+    return steps
+
+
+def choose_deadline_step(steps, predict, time_left):
+    """predict(samples, dropped) → 남은 케이스 예상 초, 남은 시간 안에 끝나는 첫 단계 선택
+
+    → (단계, 예상 초, 시간 안에 끝나는지) / 맞는 단계가 없으면 가장 싼 마지막 단계
+    """
+    for step in steps:
+        seconds = predict(*step)
+        if seconds <= time_left:
+            return step, seconds, True
+    return steps[-1], seconds, False
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def print_model(model):
+    print(f"Mean faces: {model.mean_faces():.0f}")
+    for key in sorted(model.passes):
+        a, b = model.coefficients(*key.split("/"))
+        print(f"  {key}: {a:.3f}s + {b:.3f}s/Mface per view (weight {model.passes[key]['n']:.1f})")
+    for key in sorted(model.outputs):
+        render_type, file_format = key.split("/")
+        print(f"  {key}: {format_bytes(model.predict_bytes(render_type, file_format))} per view")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering cost model")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    show = sub.add_parser("show", help="학습된 비용 모델 출력")
+    show.add_argument("model")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        if not os.path.exists(args.model):
+            sys.exit(f"비용 모델 없음: {args.model}")
+        print_model(CostModel(args.model))
+
+
+if __name__ == "__main__":
+    main()
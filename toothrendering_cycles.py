@@ -0,0 +1,367 @@
+import hashlib
+import json
+import os
+import platform
+import socket
+import sys
+import time
+
+try:
+    import bpy
+except ImportError:  # Blender 밖(일반 Python)에서 import 하는 경우 (캐시 확인만 가능)
+    bpy = None
+
+'''
+Cycles 장치/스레드/타일 자동 튜닝 모듈
+- 고정된 보정 씬(SSS 구 + sun 라이트)을 장치/스레드/타일 설정 후보마다 렌더링해서 가장 빠른 설정 선택
+- 결과는 호스트 fingerprint(호스트명, CPU, GPU 장치, Blender 버전)별로 JSON 캐시에 저장해서 다음 실행부터 바로 사용
+- GPU가 없는 노드는 CPU 후보만 측정 (CPU 전용 경로)
+- 튜닝/적용은 Blender 안에서만, 캐시 확인(show)은 일반 Python에서도 가능
+
+실행 예시:
+  blender -b -P toothrendering_cycles.py -- tune [--cache PATH] [--retune]
+  python toothrendering_cycles.py show <튜닝 캐시 JSON>
+'''
+
+TUNING_VERSION = 1
+TUNING_FILENAME = "cycles_tuning.json"
+GPU_BACKENDS = ("OPTIX", "CUDA", "HIP", "METAL", "ONEAPI")
+GPU_TILE_SIZES = (256, 512, 2048)
+CPU_TILE_SIZES = (256, 2048)
+
+# 보정 씬: 실제 lit 패스(512px, SSS 치아 머티리얼)와 비슷한 부하를 짧게
+CALIBRATION_RESOLUTION = 256
+CALIBRATION_SAMPLES = 16
+CALIBRATION_SCENE_NAME = "cycles_calibration"
+
+# 튜닝하지 않고 GPU가 없을 때 사용하는 설정
+CPU_SETTINGS = {"device": "CPU", "backend": "NONE", "tile_size": 2048, "threads": 0}
+
+# 같은 호스트의 여러 프로세스(farm 워커)가 동시에 튜닝하지 않도록 fingerprint별 lock 파일 사용
+TUNING_LOCK_SECONDS = 1800.0  # 이 시간보다 오래된 lock은 죽은 프로세스가 남긴 것으로 보고 치움 (전체 측정 시간보다 충분히 크게)
+TUNING_LOCK_POLL_SECONDS = 5.0  # 다른 프로세스의 튜닝이 끝나기를 기다리는 확인 간격
+
+
+def default_tuning_path(output_base):
+    """기본 튜닝 캐시 위치: output/cycles_tuning.json (노드마다 fingerprint로 구분)"""
+    return os.path.join(output_base, TUNING_FILENAME)
+
+
+def _cycles_preferences():
+    return bpy.context.preferences.addons["cycles"].preferences
+
+
+def available_gpu_backends():
+    """사용 가능한 GPU 백엔드 → {백엔드: [장치 이름]} (GPU가 없으면 빈 dict)"""
+    prefs = _cycles_preferences()
+    backends = {}
+    for backend in GPU_BACKENDS:
+        try:
+            devices = prefs.get_devices_for_type(backend)
+        except (TypeError, ValueError):
+            continue
+        names = [device.name for device in devices if device.type == backend]
+        if names:
+            backends[backend] = names
+    return backends
+
+
+def host_fingerprint():
+    """튜닝 결과를 재사용할 수 있는 호스트 조건 → (키, 내용 dict)"""
+    info = {
+        "host": socket.gethostname(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "blender": bpy.app.version_string if bpy else None,
+        "gpus": available_gpu_backends() if bpy else None,
+    }
+    key = hashlib.sha1(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return key, info
+
+
+def candidate_settings(gpu_backends=None):
+    """측정할 설정 후보 목록 (GPU 백엔드마다 타일 크기, CPU는 스레드 자동/물리 코어 수)"""
+    gpu_backends = available_gpu_backends() if gpu_backends is None else gpu_backends
+    candidates = []
+    for backend in gpu_backends:
+        for tile_size in GPU_TILE_SIZES:
+            candidates.append({"device": "GPU", "backend": backend, "tile_size": tile_size, "threads": 0})
+    thread_counts = [0]
+    if os.cpu_count() and os.cpu_count() > 2:
+        thread_counts.append(os.cpu_count() // 2)  # 하이퍼스레딩 노드에서 물리 코어 수
+    for threads in thread_counts:
+        for tile_size in CPU_TILE_SIZES:
+            candidates.append({"device": "CPU", "backend": "NONE", "tile_size": tile_size, "threads": threads})
+    return candidates
+
+
+def apply_cycles_settings(scene, settings):
+    """장치/백엔드/타일/스레드 설정 적용 (GPU면 해당 백엔드의 GPU 장치만 켬)"""
+    prefs = _cycles_preferences()
+    if settings["device"] == "GPU":
+        prefs.compute_device_type = settings["backend"]
+        for device in prefs.get_devices_for_type(settings["backend"]):
+            device.use = device.type == settings["backend"]
+    scene.cycles.device = settings["device"]
+    scene.cycles.use_auto_tile = True
+    scene.cycles.tile_size = settings["tile_size"]
+    if settings["threads"]:
+        scene.render.threads_mode = "FIXED"
+        scene.render.threads = settings["threads"]
+    else:
+        scene.render.threads_mode = "AUTO"
+
+
+def _build_calibration_scene():
+    """보정 씬 생성: SSS Principled 구 + 바닥 + sun 라이트 + 카메라"""
+    import bmesh
+    import mathutils
+
+    scene = bpy.data.scenes.new(CALIBRATION_SCENE_NAME)
+    scene.render.engine = "CYCLES"
+    scene.render.resolution_x = scene.render.resolution_y = CALIBRATION_RESOLUTION
+    scene.render.resolution_percentage = 100
+    scene.cycles.samples = CALIBRATION_SAMPLES
+    scene.cycles.use_adaptive_sampling = False
+    scene.cycles.use_denoising = False
+    scene.cycles.max_bounces = 8
+
+    material = bpy.data.materials.new(CALIBRATION_SCENE_NAME)
+    material.use_nodes = True
+    bsdf = material.node_tree.nodes.get("Principled BSDF")
+    if bsdf is not None:
+        bsdf.inputs["Base Color"].default_value = (0.9, 0.85, 0.75, 1.0)
+        for name in ("Subsurface Weight", "Subsurface"):
+            if name in bsdf.inputs:
+                bsdf.inputs[name].default_value = 0.5
+                break
+
+    for name, radius, location in (("sphere", 1.0, (0, 0, 0)), ("ground", 8.0, (0, 0, -9.0))):
+        mesh = bpy.data.meshes.new(f"{CALIBRATION_SCENE_NAME}_{name}")
+        bm = bmesh.new()
+        bmesh.ops.create_uvsphere(bm, u_segments=64, v_segments=32, radius=radius)
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.materials.append(material)
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        obj.location = location
+        scene.collection.objects.link(obj)
+
+    cam_data = bpy.data.cameras.new(CALIBRATION_SCENE_NAME)
+    cam_obj = bpy.data.objects.new(cam_data.name, cam_data)
+    cam_obj.location = (0.0, -4.0, 1.5)
+    cam_obj.rotation_euler = (mathutils.Vector((0, 0, 0)) - cam_obj.location).to_track_quat("-Z", "Y").to_euler()
+    scene.collection.objects.link(cam_obj)
+    scene.camera = cam_obj
+
+    light_data = bpy.data.lights.new(CALIBRATION_SCENE_NAME, type="SUN")
+    light_data.energy = 5
+    light_obj = bpy.data.objects.new(light_data.name, light_data)
+    light_obj.rotation_euler = (0.6, 0.2, 0.0)
+    scene.collection.objects.link(light_obj)
+    return scene
+
+
+def _remove_calibration_scene(scene):
+    objects = list(scene.collection.objects)
+    bpy.data.scenes.remove(scene)
+    for obj in objects:
+        data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if isinstance(data, bpy.types.Mesh):
+            bpy.data.meshes.remove(data)
+        elif isinstance(data, bpy.types.Camera):
+            bpy.data.cameras.remove(data)
+        elif isinstance(data, bpy.types.Light):
+            bpy.data.lights.remove(data)
+    material = bpy.data.materials.get(CALIBRATION_SCENE_NAME)
+    if material is not None:
+        bpy.data.materials.remove(material)
+
+
+def benchmark(candidates):
+    """후보마다 보정 씬을 두 번 렌더링해서 두 번째 시간 측정 (첫 번째는 커널 로드/컴파일) → [(설정, 초 또는 None)]"""
+    scene = _build_calibration_scene()
+    results = []
+    try:
+        for settings in candidates:
+            try:
+                apply_cycles_settings(scene, settings)
+                bpy.ops.render.render(scene=scene.name)
+                start = time.perf_counter()
+                bpy.ops.render.render(scene=scene.name)
+                seconds = time.perf_counter() - start
+            except Exception as e:
+                print(f"  [WARNING] Cycles tuning failed for {format_settings(settings)}: {e}")
+                seconds = None
+            results.append((settings, seconds))
+            if seconds is not None:
+                print(f"  {format_settings(settings)}: {seconds:.2f}s")
+    finally:
+        _remove_calibration_scene(scene)
+    return results
+
+
+def load_tuning_cache(path):
+    if not os.path.exists(path):
+        return {"version": TUNING_VERSION, "hosts": {}}
+    with open(path, encoding="utf-8") as f:
+        cache = json.load(f)
+    if cache.get("version") != TUNING_VERSION:
+        return {"version": TUNING_VERSION, "hosts": {}}
+    return cache
+
+
+def save_tuning_cache(path, cache):
+    """임시 파일에 쓴 뒤 원자적으로 교체"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _tuning_lock_path(cache_path, key):
+    return f"{cache_path}.{key}.lock"
+
+
+def _try_tuning_lock(lock_path):
+    """lock 파일을 O_EXCL로 생성 (이미 있으면 False)"""
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    try:
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"host": socket.gethostname(), "pid": os.getpid(),
+                   "acquired": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+    return True
+
+
+def _reclaim_stale_tuning_lock(lock_path):
+    """TUNING_LOCK_SECONDS 넘게 남아 있는 lock을 rename으로 치움 (여러 프로세스가 동시에 시도해도 하나만 성공)"""
+    try:
+        age = time.time() - os.path.getmtime(lock_path)
+    except OSError:
+        return  # 그 사이 해제됨
+    if age < TUNING_LOCK_SECONDS:
+        return
+    stale_path = f"{lock_path}.{os.getpid()}.stale"
+    try:
+        os.rename(lock_path, stale_path)
+    except OSError:
+        return  # 다른 프로세스가 먼저 치움
+    os.remove(stale_path)
+    print(f"  [WARNING] Removed stale Cycles tuning lock ({age:.0f}s old): {lock_path}")
+
+
+def _cached_settings(cache_path, key):
+    entry = load_tuning_cache(cache_path)["hosts"].get(key)
+    if entry is not None:
+        print(f"Cycles tuning (cached, {entry['tuned']}): {format_settings(entry['settings'])}")
+    return entry
+
+
+def auto_tune(cache_path, retune=False):
+    """이 호스트의 튜닝 결과 반환 (캐시에 없거나 retune이면 보정 씬으로 측정 후 캐시에 저장)
+    - 같은 호스트에서는 lock을 잡은 프로세스 하나만 측정하고, 나머지는 끝나기를 기다렸다가 캐시를 다시 읽음
+    """
+    key, info = host_fingerprint()
+    entry = None if retune else _cached_settings(cache_path, key)
+    if entry is not None:
+        return entry["settings"]
+
+    lock_path = _tuning_lock_path(cache_path, key)
+    waited = False
+    while not _try_tuning_lock(lock_path):
+        if not waited:
+            print(f"Cycles tuning: waiting for another process on {info['host']} ({lock_path})")
+            waited = True
+        time.sleep(TUNING_LOCK_POLL_SECONDS)
+        _reclaim_stale_tuning_lock(lock_path)
+    try:
+        # 기다리는 동안(또는 캐시 확인과 lock 사이에) 다른 프로세스가 튜닝을 끝냈으면 그 결과 사용
+        # (retune이어도 방금 측정된 결과는 그대로 사용)
+        if waited or not retune:
+            entry = _cached_settings(cache_path, key)
+            if entry is not None:
+                return entry["settings"]
+        return _tune_and_store(cache_path, key, info)
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def _tune_and_store(cache_path, key, info):
+    """보정 씬으로 후보를 측정해서 가장 빠른 설정을 캐시에 저장 (호출하는 쪽이 lock을 잡고 있어야 함)"""
+    candidates = candidate_settings(info["gpus"])
+    print(f"Cycles tuning: {len(candidates)} configurations on {info['host']} "
+          f"(GPU: {', '.join(info['gpus']) or 'none'})")
+    results = benchmark(candidates)
+    measured = [(settings, seconds) for settings, seconds in results if seconds is not None]
+    if not measured:
+        print(f"  [WARNING] Cycles tuning failed for all configurations, using CPU")
+        return dict(CPU_SETTINGS)
+    best, best_seconds = min(measured, key=lambda result: result[1])
+    print(f"Cycles tuning: {format_settings(best)} ({best_seconds:.2f}s)")
+
+    # 다른 노드가 그 사이 기록한 결과를 덮어쓰지 않도록 저장 직전에 다시 읽음
+    cache = load_tuning_cache(cache_path)
+    cache["hosts"][key] = {
+        "fingerprint": info,
+        "tuned": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "settings": best,
+        "results": [{"settings": settings, "seconds": seconds} for settings, seconds in results],
+    }
+    save_tuning_cache(cache_path, cache)
+    return best
+
+
+def format_settings(settings):
+    threads = settings["threads"] or "auto"
+    if settings["device"] == "GPU":
+        return f"GPU {settings['backend']}, tile {settings['tile_size']}"
+    return f"CPU threads {threads}, tile {settings['tile_size']}"
+
+
+def _script_args():
+    """blender -b -P 실행 시 '--' 뒤의 인자만 사용"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cycles device/thread/tile tuning")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    tune = sub.add_parser("tune", help="보정 씬으로 설정 후보를 측정해서 캐시에 저장 (Blender 안에서 실행)")
+    tune.add_argument("--cache", default=TUNING_FILENAME)
+    tune.add_argument("--retune", action="store_true", help="캐시에 있어도 다시 측정")
+
+    show = sub.add_parser("show", help="튜닝 캐시 출력")
+    show.add_argument("cache")
+
+    args = parser.parse_args(_script_args() if argv is None else argv)
+
+    if args.command == "tune":
+        if bpy is None:
+            sys.exit("tune은 Blender 안에서 실행해야 합니다: blender -b -P toothrendering_cycles.py -- tune")
+        auto_tune(args.cache, args.retune)
+    elif args.command == "show":
+        for key, entry in load_tuning_cache(args.cache)["hosts"].items():
+            info = entry["fingerprint"]
+            print(f"{info['host']} ({key}, {info['cpu_count']} CPUs, GPU: {', '.join(info['gpus'] or []) or 'none'}, "
+                  f"tuned {entry['tuned']}): {format_settings(entry['settings'])}")
+            for result in entry["results"]:
+                seconds = f"{result['seconds']:.2f}s" if result["seconds"] is not None else "failed"
+                print(f"  {format_settings(result['settings'])}: {seconds}")
+
+
+if __name__ == "__main__":
+    main()
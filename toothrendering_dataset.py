@@ -0,0 +1,275 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 같은 폴더의 보조 모듈(toothrendering_*.py) import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from toothrendering_mesh import case_matrix_world, find_obj_json_files, load_labels, parse_obj
+
+'''
+데이터셋 사전 스캔 모듈
+- 입력 폴더의 케이스를 프로세스 풀로 한 번에 검사해서 케이스 인덱스(JSON) 생성
+- 렌더링 스크립트는 인덱스를 읽어 깨진 케이스를 렌더링 전에 건너뜀
+- bpy 없이 동작 (일반 Python으로 실행)
+
+실행 예시:
+  python toothrendering_dataset.py scan <케이스 루트 폴더> [--index PATH] [--workers N]
+  python toothrendering_dataset.py summary <케이스 인덱스 JSON>
+'''
+
+CASE_INDEX_VERSION = 1
+CASE_INDEX_FILENAME = "case_index.json"
+
+# 케이스 상태: ok = 정상, warning = 렌더링 가능하지만 확인 필요, error = 렌더링 불가
+STATUS_OK = "ok"
+STATUS_WARNING = "warning"
+STATUS_ERROR = "error"
+
+# 렌더링 워커 exit code: 스크립트 예외는 1 (blender --python-exit-code), 실행은 끝났지만 에러가 기록된 케이스가 있으면 2
+EXIT_CASE_ERRORS = 2
+
+
+def default_output_dir(input_root):
+    """렌더링 출력 폴더: <입력 폴더의 상위>/output (렌더링 스크립트와 동일한 규칙)"""
+    selected_root = os.path.normpath(input_root)
+    selected_parent = os.path.dirname(selected_root)
+    if not selected_parent or selected_parent == selected_root:
+        selected_parent = selected_root
+    return os.path.join(selected_parent, "output")
+
+
+def default_case_index_path(input_root):
+    """기본 케이스 인덱스 위치: <입력 폴더의 상위>/output/case_index.json"""
+    return os.path.join(default_output_dir(input_root), CASE_INDEX_FILENAME)
+
+
+def list_case_folders(input_root, reverse=False):
+    """입력 폴더의 케이스 폴더 이름 목록 (정렬)"""
+    return [
+        f
+        for f in sorted(os.listdir(input_root), reverse=reverse)
+        if os.path.isdir(os.path.join(input_root, f))
+    ]
+
+
+def write_error_log_entry(log_path, case_idx, case_name, error_msg, traceback_str=None):
+    """error_log.txt 형식으로 에러 한 건 추가"""
+    import datetime
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write("=" * 80 + "\n")
+        f.write(f"[{timestamp}] Case #{case_idx}: {case_name}\n")
+        f.write(f"Error: {error_msg}\n")
+        if traceback_str:
+            f.write("\nFull Traceback:\n")
+            f.write(traceback_str)
+        f.write("=" * 80 + "\n\n")
+
+
+def _file_info(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def scan_case(case_path, label_cache_dir=None, use_label_cache=True):
+    """케이스 폴더 하나 검사 → 인덱스 행 (dict)
+
+    bbox는 케이스 배치(임포트 축 변환 + -45도 회전, 이동) 후 월드 좌표 기준.
+    """
+    row = {
+        "case": os.path.basename(os.path.normpath(case_path)),
+        "path": os.path.abspath(case_path),
+        "obj_file": None,
+        "json_file": None,
+        "obj_size": None,
+        "json_size": None,
+        "obj_mtime_ns": None,
+        "json_mtime_ns": None,
+        "vertex_count": None,
+        "face_count": None,
+        "corner_count": None,
+        "label_count": None,
+        "label_histogram": {},
+        "bbox_min": None,
+        "bbox_max": None,
+        "status": STATUS_OK,
+        "issues": [],
+        "scan_seconds": None,
+    }
+    start_time = time.perf_counter()
+
+    def issue(status, message):
+        row["issues"].append(message)
+        if status == STATUS_ERROR or row["status"] == STATUS_OK:
+            row["status"] = status
+
+    try:
+        entries = os.listdir(case_path)
+        obj_count = sum(f.endswith(".obj") for f in entries)
+        json_count = sum(f.endswith(".json") for f in entries)
+        obj_file, json_file = find_obj_json_files(case_path)
+        if obj_count > 1:
+            issue(STATUS_WARNING, f"{obj_count}개의 OBJ 파일 중 {os.path.basename(obj_file)} 사용")
+        if json_count > 1:
+            issue(STATUS_WARNING, f"{json_count}개의 JSON 파일 중 {os.path.basename(json_file)} 사용")
+        if not obj_file:
+            issue(STATUS_ERROR, "OBJ 파일 없음")
+        if not json_file:
+            issue(STATUS_ERROR, "JSON 파일 없음")
+
+        if obj_file:
+            info = _file_info(obj_file)
+            row.update(obj_file=obj_file, obj_size=info["size"], obj_mtime_ns=info["mtime_ns"])
+            vertices, loop_start, loop_vertices = parse_obj(obj_file)
+            row.update(vertex_count=len(vertices), face_count=len(loop_start), corner_count=len(loop_vertices))
+            if len(loop_start) == 0:
+                issue(STATUS_ERROR, "면이 없는 OBJ")
+            else:
+                matrix = case_matrix_world()
+                world = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+                row["bbox_min"] = [round(float(v), 4) for v in world.min(axis=0)]
+                row["bbox_max"] = [round(float(v), 4) for v in world.max(axis=0)]
+
+        if json_file:
+            info = _file_info(json_file)
+            row.update(json_file=json_file, json_size=info["size"], json_mtime_ns=info["mtime_ns"])
+            labels = load_labels(json_file, label_cache_dir, use_label_cache)
+            values, counts = np.unique(np.asarray(labels), return_counts=True)
+            row["label_count"] = len(labels)
+            row["label_histogram"] = {str(int(v)): int(c) for v, c in zip(values, counts)}
+            if row["vertex_count"] is not None and len(labels) != row["vertex_count"]:
+                # 렌더링 시 패딩/자르기로 처리되지만 라벨이 어긋났을 가능성이 높음
+                issue(STATUS_WARNING, f"라벨/버텍스 개수 불일치: labels={len(labels)} vs vertices={row['vertex_count']}")
+    except Exception as e:
+        issue(STATUS_ERROR, f"{type(e).__name__}: {e}")
+
+    row["scan_seconds"] = round(time.perf_counter() - start_time, 3)
+    return row
+
+
+def _scan_case_worker(args):
+    return scan_case(*args)
+
+
+def scan_dataset(input_root, index_path=None, workers=None, label_cache_dir=None, use_label_cache=True):
+    """입력 폴더의 모든 케이스를 병렬로 검사하고 케이스 인덱스 JSON 기록, 인덱스 dict 반환"""
+    input_root = os.path.abspath(input_root)
+    index_path = index_path or default_case_index_path(input_root)
+    case_folders = list_case_folders(input_root)
+    jobs = [(os.path.join(input_root, f), label_cache_dir, use_label_cache) for f in case_folders]
+
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    print(f"Scanning {len(jobs)} cases with {workers} workers: {input_root}")
+
+    rows = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # 큰 케이스가 섞여 있어도 고르게 분배되도록 chunksize 1
+        results = pool.map(_scan_case_worker, jobs, chunksize=1) if pool else map(_scan_case_worker, jobs)
+        for row in results:
+            rows.append(row)
+            if row["status"] != STATUS_OK:
+                print(f"  [{row['status'].upper()}] {row['case']}: {'; '.join(row['issues'])}")
+    finally:
+        if pool:
+            pool.shutdown()
+
+    index = {
+        "version": CASE_INDEX_VERSION,
+        "input_root": input_root,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "scan_seconds": round(time.time() - start_time, 1),
+        "cases": rows,
+    }
+    write_case_index(index_path, index)
+    print_summary(index)
+    print(f"Case index: {index_path}")
+    return index
+
+
+def write_case_index(index_path, index):
+    """케이스 인덱스를 임시 파일에 쓴 뒤 원자적으로 교체"""
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+
+def load_case_index(index_path):
+    """케이스 인덱스 JSON 로드 (버전이 다르면 ValueError)"""
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("version") != CASE_INDEX_VERSION:
+        raise ValueError(f"지원하지 않는 케이스 인덱스 버전: {index.get('version')} ({index_path})")
+    return index
+
+
+def is_row_stale(row):
+    """스캔 이후 OBJ/JSON 파일이 바뀌었거나 사라졌으면 True"""
+    for key in ("obj", "json"):
+        path = row.get(f"{key}_file")
+        if not path:
+            continue
+        try:
+            info = _file_info(path)
+        except OSError:
+            return True
+        if info["size"] != row.get(f"{key}_size") or info["mtime_ns"] != row.get(f"{key}_mtime_ns"):
+            return True
+    return False
+
+
+def print_summary(index):
+    rows = index["cases"]
+    by_status = {}
+    for row in rows:
+        by_status[row["status"]] = by_status.get(row["status"], 0) + 1
+    faces = [row["face_count"] for row in rows if row["face_count"]]
+    print(f"Cases: {len(rows)} "
+          f"(ok {by_status.get(STATUS_OK, 0)}, warning {by_status.get(STATUS_WARNING, 0)}, "
+          f"error {by_status.get(STATUS_ERROR, 0)})")
+    if faces:
+        print(f"Faces: min {min(faces)}, median {int(np.median(faces))}, max {max(faces)}, total {sum(faces)}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering dataset utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="케이스 폴더를 병렬로 검사해서 케이스 인덱스 생성")
+    scan.add_argument("input_root")
+    scan.add_argument("--index", default=None, help=f"기본값: <입력 폴더의 상위>/output/{CASE_INDEX_FILENAME}")
+    scan.add_argument("--workers", type=int, default=None, help="기본값: CPU 코어 수")
+    scan.add_argument("--label-cache-dir", default=None)
+    scan.add_argument("--no-label-cache", action="store_true", help="라벨 .npy 캐시를 쓰지 않음")
+
+    summary = sub.add_parser("summary", help="케이스 인덱스 요약 출력")
+    summary.add_argument("index")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "scan":
+        scan_dataset(args.input_root, args.index, args.workers, args.label_cache_dir, not args.no_label_cache)
+    elif args.command == "summary":
+        index = load_case_index(args.index)
+        print_summary(index)
+        for row in index["cases"]:
+            if row["status"] != STATUS_OK:
+                print(f"  [{row['status'].upper()}] {row['case']}: {'; '.join(row['issues'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# 같은 폴더의 보조 모듈(toothrendering_*.py) import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from toothrendering_costmodel import parse_deadline
+from toothrendering_dataset import (
+    EXIT_CASE_ERRORS, STATUS_ERROR, default_case_index_path, default_output_dir, list_case_folders, load_case_index,
+    write_error_log_entry,
+)
+
+'''
+렌더 팜 코디네이터
+- 케이스 폴더를 N개로 겹치지 않게 나누고 워커마다 blender -b -P toothrendering_optimized.py 실행
+- 워커 출력은 output/farm/worker_NN.log에 저장하면서 진행 상황을 모아서 출력
+- 워커별 에러 로그를 기존 output/error_log.txt 형식으로 합치고 전체 요약(output/farm/farm_summary.json) 작성
+- bpy 없이 동작 (일반 Python으로 실행)
+
+실행 예시:
+  python toothrendering_farm.py run <케이스 루트 폴더> --workers 4 --threads 8 [--blender PATH] [--resume]
+                                   [--deadline "YYYY-MM-DD HH:MM"]
+  python toothrendering_farm.py shards <케이스 루트 폴더> --workers 4
+'''
+
+WORKER_SCRIPT = os.path.join(SCRIPT_DIR, "toothrendering_optimized.py")
+FARM_DIRNAME = "farm"
+PROGRESS_INTERVAL = 30.0  # 전체 진행 상황 출력 간격 (초)
+
+# 워커 출력에서 진행 상황 판별
+_CASE_START = re.compile(r"^\[(\d+)/(\d+)\] Processing: (.+)$")
+_CASE_ERROR = re.compile(r"^\s*\[(ERROR|SKIP)\] ")
+
+
+def select_cases(input_root, start_case=1, max_cases=None, reverse=False):
+    """렌더링 스크립트의 START_CASE/MAX_CASES 규칙으로 케이스 폴더 선택"""
+    case_folders = list_case_folders(input_root, reverse)
+    end_idx = len(case_folders) if max_cases is None else min(max_cases, len(case_folders))
+    return case_folders[start_case - 1:end_idx]
+
+
+def case_weights(case_index, cases):
+    """케이스 인덱스의 면 수를 작업량으로 사용 (인덱스에 없으면 평균값)"""
+    rows = {row["case"]: row for row in case_index["cases"]} if case_index else {}
+    known = [rows[c]["face_count"] for c in cases if c in rows and rows[c]["face_count"]]
+    fallback = sum(known) / len(known) if known else 1
+    return {c: (rows[c]["face_count"] if c in rows and rows[c]["face_count"] else fallback) for c in cases}
+
+
+def shard_cases(cases, workers, weights=None):
+    """케이스를 워커 수만큼 겹치지 않게 나눔 → [[케이스, ...], ...]
+
+    weights가 있으면 큰 케이스부터 작업량이 가장 적은 워커에 배정, 없으면 순서대로 번갈아 배정.
+    워커 안에서는 원래 케이스 순서를 유지.
+    """
+    workers = max(1, min(workers, len(cases)))
+    order = {case: i for i, case in enumerate(cases)}
+    shards = [[] for _ in range(workers)]
+    if weights is None:
+        for i, case in enumerate(cases):
+            shards[i % workers].append(case)
+    else:
+        loads = [0] * workers
+        for case in sorted(cases, key=lambda c: -weights[c]):
+            target = loads.index(min(loads))
+            shards[target].append(case)
+            loads[target] += weights[case]
+    return [sorted(shard, key=order.get) for shard in shards]
+
+
+def plan_shards(input_root, workers, start_case=1, max_cases=None, reverse=False, index_path=None):
+    """케이스 선택 + 워커별 배정 → (shards, weights 또는 None)
+
+    케이스 인덱스가 있으면 면 수 기준으로 작업량을 나누고, 렌더링 불가(error) 케이스는 워커에 보내지 않음.
+    """
+    cases = select_cases(input_root, start_case, max_cases, reverse)
+    index_path = index_path or default_case_index_path(input_root)
+    case_index = load_case_index(index_path) if os.path.exists(index_path) else None
+    weights = None
+    if case_index is not None:
+        broken = {row["case"] for row in case_index["cases"] if row["status"] == STATUS_ERROR}
+        skipped = [c for c in cases if c in broken]
+        cases = [c for c in cases if c not in broken]
+        if skipped:
+            print(f"Skipping {len(skipped)} cases marked as error in {index_path}")
+        weights = case_weights(case_index, cases)
+    if not cases:
+        return [], weights
+    return shard_cases(cases, workers, weights), weights
+
+
+def default_workers():
+    """기본 워커 수: CPU 코어 8개당 1개"""
+    return max(1, (os.cpu_count() or 1) // 8)
+
+
+class FarmWorker:
+    """blender -b 워커 프로세스 하나 (출력은 로그 파일에 저장하면서 진행 상황 집계)"""
+
+    def __init__(self, worker_id, cases, farm_dir):
+        self.worker_id = worker_id
+        self.cases = cases
+        name = f"worker_{worker_id:02d}"
+        self.cases_path = os.path.join(farm_dir, f"{name}_cases.txt")
+        self.log_path = os.path.join(farm_dir, f"{name}.log")
+        self.error_log_path = os.path.join(farm_dir, f"{name}_error_log.txt")
+        self.summary_path = os.path.join(farm_dir, f"{name}_summary.json")
+        self.process = None
+        self.current = 0
+        self.errors = 0
+        self.start_time = None
+        self.end_time = None
+        self._reader = None
+
+    def command(self, blender, input_root, threads, resume=False, deadline=None):
+        cmd = [blender, "-b"]
+        if threads:
+            cmd += ["-t", str(threads)]
+        # 스크립트 예외로 끝나면 exit code 1 (기본값은 0으로 종료됨)
+        cmd += ["--python-exit-code", "1", "-P", WORKER_SCRIPT, "--",
+                "--input", input_root,
+                "--case-list", self.cases_path,
+                "--error-log", self.error_log_path,
+                "--summary", self.summary_path,
+                # 모든 워커가 output/render_journal.jsonl 하나에 기록 (다시 실행할 때 --resume으로 이어서 렌더링)
+                "--journal", "auto"]
+        if resume:
+            cmd.append("--resume")
+        if deadline:
+            # 워커마다 자기 케이스 목록을 같은 마감 시각에 맞춰 계획
+            cmd += ["--deadline", deadline]
+        return cmd
+
+    def start(self, blender, input_root, threads, echo=False, resume=False, deadline=None):
+        with open(self.cases_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.cases) + "\n")
+        for path in (self.error_log_path, self.summary_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.start_time = time.time()
+        self.process = subprocess.Popen(
+            self.command(blender, input_root, threads, resume, deadline),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            encoding="utf-8", errors="replace", bufsize=1,
+        )
+        self._reader = threading.Thread(target=self._read_output, args=(echo,), daemon=True)
+        self._reader.start()
+
+    def _read_output(self, echo):
+        with open(self.log_path, "w", encoding="utf-8") as log:
+            for line in self.process.stdout:
+                log.write(line)
+                log.flush()
+                line = line.rstrip("\n")
+                match = _CASE_START.match(line)
+                if match:
+                    self.current = int(match.group(1))
+                elif _CASE_ERROR.match(line):
+                    self.errors += 1
+                if echo:
+                    print(f"[w{self.worker_id:02d}] {line}")
+
+    def poll(self):
+        """종료됐으면 exit code, 실행 중이면 None"""
+        code = self.process.poll()
+        if code is not None and self.end_time is None:
+            self._reader.join()
+            self.end_time = time.time()
+        return code
+
+    def terminate(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+
+    def load_summary(self):
+        if not os.path.exists(self.summary_path):
+            return None
+        with open(self.summary_path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def merge_error_logs(workers, error_log_path, exit_codes):
+    """워커별 에러 로그를 error_log.txt에 이어 붙이고, 비정상 종료한 워커도 같은 형식으로 기록"""
+    with open(error_log_path, "a", encoding="utf-8") as out:
+        for worker in workers:
+            if os.path.exists(worker.error_log_path):
+                with open(worker.error_log_path, encoding="utf-8") as f:
+                    out.write(f.read())
+    for worker, code in zip(workers, exit_codes):
+        summary = worker.load_summary()
+        # 케이스 에러로 끝난 워커(EXIT_CASE_ERRORS)의 에러는 위의 워커 에러 로그에 이미 있음
+        if code not in (0, EXIT_CASE_ERRORS) or summary is None:
+            write_error_log_entry(
+                error_log_path, f"w{worker.worker_id:02d}", f"worker_{worker.worker_id:02d}",
+                f"워커가 비정상 종료됨 (exit code {code}, 요약 {'있음' if summary else '없음'}), "
+                f"케이스 {len(worker.cases)}개 중 {worker.current}번째까지 진행: 로그 {worker.log_path}")
+
+
+def print_progress(workers, total_cases, start_time):
+    done = sum(w.current for w in workers)
+    errors = sum(w.errors for w in workers)
+    per_worker = ", ".join(f"w{w.worker_id:02d} {w.current}/{len(w.cases)}" for w in workers)
+    print(f"Farm: {done}/{total_cases} cases started | errors {errors} | "
+          f"elapsed {time.time() - start_time:.0f}s | {per_worker}")
+
+
+def run_farm(input_root, workers=None, threads=None, blender=None, start_case=1, max_cases=None, reverse=False,
+             index_path=None, echo=False, resume=False, deadline=None):
+    """케이스를 워커 수만큼 나눠 blender 워커들을 실행하고, 결과를 합친 요약 dict 반환
+
+    deadline: 마감 모드 목표 시각 (초로 주면 코디네이터 시작 시각 기준 절대 시각으로 바꿔서 모든 워커에 같은 값 전달)
+    """
+    input_root = os.path.abspath(input_root)
+    output_base = default_output_dir(input_root)
+    farm_dir = os.path.join(output_base, FARM_DIRNAME)
+    os.makedirs(farm_dir, exist_ok=True)
+
+    workers = workers or default_workers()
+    threads = (os.cpu_count() or 1) // workers if threads is None else threads
+    blender = blender or os.environ.get("BLENDER", "blender")
+
+    shards, _ = plan_shards(input_root, workers, start_case, max_cases, reverse, index_path)
+    if not shards:
+        print(f"No cases found: {input_root}")
+        return None
+    cases = [case for shard in shards for case in shard]
+
+    print(f"=== RENDER FARM ===")
+    print(f"Cases: {len(cases)}, workers: {len(shards)}, threads per worker: {threads or 'auto'}")
+    print(f"Blender: {blender}")
+    print(f"Farm logs: {farm_dir}")
+    if deadline:
+        deadline = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(parse_deadline(deadline)))
+        print(f"Deadline: {deadline}")
+
+    farm_workers = [FarmWorker(i + 1, shard, farm_dir) for i, shard in enumerate(shards)]
+    start_time = time.time()
+    try:
+        for worker in farm_workers:
+            worker.start(blender, input_root, threads, echo, resume, deadline)
+            print(f"  worker_{worker.worker_id:02d}: {len(worker.cases)} cases (pid {worker.process.pid})")
+
+        last_progress = time.time()
+        while any(worker.poll() is None for worker in farm_workers):
+            time.sleep(1.0)
+            if time.time() - last_progress >= PROGRESS_INTERVAL:
+                print_progress(farm_workers, len(cases), start_time)
+                last_progress = time.time()
+    except KeyboardInterrupt:
+        print("Interrupted, stopping workers...")
+        for worker in farm_workers:
+            worker.terminate()
+        raise
+
+    exit_codes = [worker.poll() for worker in farm_workers]
+    error_log_path = os.path.join(output_base, "error_log.txt")
+    merge_error_logs(farm_workers, error_log_path, exit_codes)
+
+    # 워커 요약 합치기
+    worker_rows = []
+    for worker, code in zip(farm_workers, exit_codes):
+        summary = worker.load_summary() or {}
+        worker_rows.append({
+            "worker": worker.worker_id,
+            "cases": len(worker.cases),
+            "exit_code": code,
+            "seconds": round(worker.end_time - worker.start_time, 1),
+            "completed_renders": summary.get("completed_renders"),
+            # 요약 없이 끝난 워커는 출력에서 센 에러 수 사용
+            "error_count": summary.get("error_count", worker.errors),
+            "failed_cases": summary.get("failed_cases", []),
+            "log": worker.log_path,
+        })
+    total_time = time.time() - start_time
+    farm_summary = {
+        "input_root": input_root,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "workers": len(farm_workers),
+        "threads": threads,
+        "cases": len(cases),
+        "completed_renders": sum(row["completed_renders"] or 0 for row in worker_rows),
+        "error_count": sum(row["error_count"] or 0 for row in worker_rows),
+        "failed_cases": [case for row in worker_rows for case in row["failed_cases"]],
+        "failed_workers": [row["worker"] for row in worker_rows if row["exit_code"] != 0],
+        "total_seconds": round(total_time, 1),
+        "worker_results": worker_rows,
+    }
+    summary_path = os.path.join(farm_dir, "farm_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(farm_summary, f, indent=2, ensure_ascii=False)
+
+    print_summary(farm_summary)
+    print(f"Error log: {error_log_path}")
+    print(f"Farm summary: {summary_path}")
+    return farm_summary
+
+
+def print_summary(farm_summary):
+    print(f"\nFarm finished in {farm_summary['total_seconds']:.0f}s: {farm_summary['cases']} cases, "
+          f"{farm_summary['completed_renders']} images, {farm_summary['error_count']} errors")
+    for row in farm_summary["worker_results"]:
+        if row["exit_code"] == 0:
+            status = "ok"
+        elif row["exit_code"] == EXIT_CASE_ERRORS:
+            status = "case errors"
+        else:
+            status = f"exit {row['exit_code']}"
+        images = row["completed_renders"] if row["completed_renders"] is not None else "?"
+        print(f"  worker_{row['worker']:02d}: {row['cases']} cases, {images} images, "
+              f"{row['error_count']} errors, {row['seconds']:.0f}s ({status})")
+    if farm_summary["failed_workers"]:
+        print(f"⚠️  Failed workers: {farm_summary['failed_workers']}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering farm coordinator")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_case_args(p):
+        p.add_argument("input_root")
+        p.add_argument("--workers", type=int, default=None, help="기본값: CPU 코어 수 / 8")
+        p.add_argument("--start-case", type=int, default=1)
+        p.add_argument("--max-cases", type=int, default=None)
+        p.add_argument("--reverse", action="store_true", help="폴더 순서 역순")
+        p.add_argument("--index", default=None, help="케이스 인덱스 JSON (기본값: output/case_index.json, 있으면 사용)")
+
+    run = sub.add_parser("run", help="워커를 실행해서 케이스를 나눠 렌더링")
+    add_case_args(run)
+    run.add_argument("--threads", type=int, default=None, help="워커당 렌더 스레드 수 (blender -t, 기본값: CPU 코어 수 / 워커 수, 0: 자동)")
+    run.add_argument("--blender", default=None, help="Blender 실행 파일 (기본값: $BLENDER 또는 blender)")
+    run.add_argument("--echo", action="store_true", help="워커 출력을 그대로 함께 출력")
+    run.add_argument("--resume", action="store_true", help="렌더링 완료 저널에 기록된 뷰는 건너뛰고 이어서 렌더링")
+    run.add_argument("--deadline", default=None,
+                     help="마감 모드 목표 시각 (\"YYYY-MM-DD HH:MM\" 또는 지금부터의 초): 워커가 lit 샘플 수/선택 렌더링 타입 자동 조절")
+
+    shards = sub.add_parser("shards", help="워커별 케이스 배정만 출력")
+    add_case_args(shards)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run_farm(args.input_root, args.workers, args.threads, args.blender, args.start_case, args.max_cases,
+                 args.reverse, args.index, args.echo, args.resume, args.deadline)
+    elif args.command == "shards":
+        shards, weights = plan_shards(os.path.abspath(args.input_root), args.workers or default_workers(),
+                                      args.start_case, args.max_cases, args.reverse, args.index)
+        for i, shard in enumerate(shards, 1):
+            load = f", {sum(weights[c] for c in shard):.0f} faces" if weights else ""
+            print(f"worker_{i:02d}: {len(shard)} cases{load}")
+            for case in shard:
+                print(f"  {case}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:  # Blender 밖(일반 Python)에서 import 하는 경우
+    bpy = None
+
+'''
+렌더링 결과 이미지 비교 모듈
+- Blender 안에서는 bpy.data.images로, 밖에서는 Pillow(설치된 경우)로 이미지를 읽음
+- EXR은 Blender 안에서만 읽을 수 있음
+- quality: 기준 폴더(예: 기존 64샘플 lit 출력) 대비 뷰별 SSIM/PSNR (NumPy만 사용, GPU 없는 노드에서도 실행)
+
+실행 예시:
+  python toothrendering_imaging.py compare <이미지 또는 폴더 A> <이미지 또는 폴더 B> [--json PATH]
+  python toothrendering_imaging.py quality <기준 폴더> <비교 폴더> [--case-list ref.txt] [--min-ssim 0.95] [--json PATH]
+  blender -b -P toothrendering_imaging.py -- compare <A> <B>
+'''
+
+# 이 값보다 큰 채널 차이가 있으면 "바뀐 픽셀"로 집계 (8비트 1단계)
+CHANGED_PIXEL_THRESHOLD = 1.0 / 255.0
+
+IMAGE_EXTENSIONS = (".png", ".webp", ".exr", ".jpg", ".jpeg")
+
+# SSIM: 11×11 가우시안 창 (sigma 1.5), 밝기 범위 0~1 (Wang et al. 2004 기본값)
+SSIM_WINDOW = 11
+SSIM_SIGMA = 1.5
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+
+
+def load_image_array(path):
+    """이미지 → (H, W, C) float32 배열 (0~1, 위쪽 행부터)"""
+    if bpy is not None:
+        image = bpy.data.images.load(path, check_existing=False)
+        try:
+            width, height = image.size
+            channels = image.channels
+            pixels = np.empty(width * height * channels, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+        finally:
+            bpy.data.images.remove(image)
+        # Blender 이미지는 아래쪽 행부터 저장됨
+        return pixels.reshape(height, width, channels)[::-1]
+
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError("Blender 밖에서 이미지를 읽으려면 Pillow가 필요합니다 (pip install pillow)")
+    with Image.open(path) as image:
+        array = np.asarray(image)
+    if array.ndim == 2:
+        array = array[:, :, None]
+    scale = 65535.0 if array.dtype == np.uint16 else 255.0
+    return array.astype(np.float32) / scale
+
+
+def image_diff(a, b, threshold=CHANGED_PIXEL_THRESHOLD):
+    """두 이미지 배열의 픽셀 차이 (채널 수가 다르면 공통 채널만 비교)"""
+    if a.shape[:2] != b.shape[:2]:
+        raise ValueError(f"이미지 크기가 다릅니다: {a.shape[:2]} vs {b.shape[:2]}")
+    channels = min(a.shape[2], b.shape[2])
+    diff = np.abs(a[:, :, :channels].astype(np.float32) - b[:, :, :channels].astype(np.float32))
+    return {
+        "mean_abs_diff": float(diff.mean()),
+        "rmse": float(np.sqrt(np.mean(diff * diff))),
+        "max_abs_diff": float(diff.max()),
+        "changed_fraction": float((diff.max(axis=2) > threshold).mean()),
+    }
+
+
+def _color_channels(a, b):
+    """비교할 공통 색 채널 (알파 제외, 최대 3채널) float64 배열 두 개"""
+    if a.shape[:2] != b.shape[:2]:
+        raise ValueError(f"이미지 크기가 다릅니다: {a.shape[:2]} vs {b.shape[:2]}")
+    channels = min(a.shape[2], b.shape[2], 3)
+    return (np.clip(a[:, :, :channels], 0.0, 1.0).astype(np.float64),
+            np.clip(b[:, :, :channels], 0.0, 1.0).astype(np.float64))
+
+
+def psnr(a, b):
+    """PSNR (dB, 밝기 범위 0~1, 같은 이미지면 inf)"""
+    a, b = _color_channels(a, b)
+    mse = float(np.mean((a - b) ** 2))
+    return float("inf") if mse == 0 else float(10.0 * np.log10(1.0 / mse))
+
+
+def _gaussian_filter(image):
+    """(H, W, C) 배열에 분리형 가우시안 창 적용 (경계는 잘라냄: valid 영역만)"""
+    x = np.arange(SSIM_WINDOW) - SSIM_WINDOW // 2
+    kernel = np.exp(-(x * x) / (2.0 * SSIM_SIGMA ** 2))
+    kernel /= kernel.sum()
+    height = image.shape[0] - SSIM_WINDOW + 1
+    width = image.shape[1] - SSIM_WINDOW + 1
+    rows = sum(weight * image[i:i + height] for i, weight in enumerate(kernel))
+    return sum(weight * rows[:, i:i + width] for i, weight in enumerate(kernel))
+
+
+def ssim(a, b):
+    """평균 SSIM (색 채널별 SSIM 맵의 평균, 1 = 같은 이미지)"""
+    a, b = _color_channels(a, b)
+    if min(a.shape[:2]) < SSIM_WINDOW:
+        raise ValueError(f"SSIM 창({SSIM_WINDOW})보다 작은 이미지: {a.shape[:2]}")
+    c1 = SSIM_K1 ** 2
+    c2 = SSIM_K2 ** 2
+    mu_a = _gaussian_filter(a)
+    mu_b = _gaussian_filter(b)
+    var_a = _gaussian_filter(a * a) - mu_a * mu_a
+    var_b = _gaussian_filter(b * b) - mu_b * mu_b
+    cov = _gaussian_filter(a * b) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim_map.mean())
+
+
+def compare_images(path_a, path_b, threshold=CHANGED_PIXEL_THRESHOLD):
+    """이미지 파일 두 개 비교 → image_diff 결과"""
+    return image_diff(load_image_array(path_a), load_image_array(path_b), threshold)
+
+
+def _image_files(directory):
+    return sorted(f for f in os.listdir(directory) if f.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def compare_directories(dir_a, dir_b, threshold=CHANGED_PIXEL_THRESHOLD):
+    """두 폴더에서 파일명이 같은 이미지끼리 비교 → [{"file": ..., 지표...}]"""
+    names_b = set(_image_files(dir_b))
+    rows = []
+    for name in _image_files(dir_a):
+        if name not in names_b:
+            continue
+        row = {"file": name}
+        row.update(compare_images(os.path.join(dir_a, name), os.path.join(dir_b, name), threshold))
+        rows.append(row)
+    return rows
+
+
+def summarize_diffs(rows):
+    """compare_directories 결과의 평균/최댓값"""
+    if not rows:
+        return {"images": 0}
+    return {
+        "images": len(rows),
+        "mean_abs_diff": float(np.mean([row["mean_abs_diff"] for row in rows])),
+        "max_abs_diff": float(max(row["max_abs_diff"] for row in rows)),
+        "changed_fraction": float(np.mean([row["changed_fraction"] for row in rows])),
+    }
+
+
+def compare_quality(reference_dir, test_dir, cases=None):
+    """기준 폴더와 비교 폴더에서 파일명이 같은 이미지(뷰)끼리 SSIM/PSNR → [{"file", "ssim", "psnr"}]
+
+    cases: 케이스 폴더 이름 목록이면 파일명({상위폴더}_{케이스}_{뷰})에 "_{케이스}_"가 들어 있는 이미지만
+    비교 폴더에 없는 뷰는 "missing": True로 표시.
+    """
+    names_test = set(_image_files(test_dir))
+    rows = []
+    for name in _image_files(reference_dir):
+        if cases is not None and not any(f"_{case}_" in name for case in cases):
+            continue
+        if name not in names_test:
+            rows.append({"file": name, "missing": True})
+            continue
+        reference = load_image_array(os.path.join(reference_dir, name))
+        test = load_image_array(os.path.join(test_dir, name))
+        rows.append({"file": name, "ssim": ssim(test, reference), "psnr": psnr(test, reference)})
+    return rows
+
+
+def summarize_quality(rows):
+    """compare_quality 결과의 평균/최솟값 (inf PSNR은 평균에서 제외)"""
+    compared = [row for row in rows if not row.get("missing")]
+    summary = {"images": len(compared), "missing": len(rows) - len(compared)}
+    if not compared:
+        return summary
+    finite_psnr = [row["psnr"] for row in compared if np.isfinite(row["psnr"])]
+    summary.update({
+        "mean_ssim": float(np.mean([row["ssim"] for row in compared])),
+        "min_ssim": float(min(row["ssim"] for row in compared)),
+        "mean_psnr": float(np.mean(finite_psnr)) if finite_psnr else float("inf"),
+        "min_psnr": float(min(row["psnr"] for row in compared)),
+    })
+    return summary
+
+
+def _script_args():
+    """blender -b -P 실행 시 '--' 뒤의 인자만 사용"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering image utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compare = sub.add_parser("compare", help="이미지 두 개 또는 폴더 두 개(같은 파일명끼리) 비교")
+    compare.add_argument("a")
+    compare.add_argument("b")
+    compare.add_argument("--threshold", type=float, default=CHANGED_PIXEL_THRESHOLD)
+    compare.add_argument("--json", default=None, help="결과를 JSON으로 저장")
+
+    quality = sub.add_parser("quality", help="기준 폴더 대비 뷰별 SSIM/PSNR (예: 기존 lit 출력 vs fast 프로파일 출력)")
+    quality.add_argument("reference", help="기준 이미지 폴더 (예: output/lit)")
+    quality.add_argument("test", help="비교할 이미지 폴더 (예: output/lit_fast)")
+    quality.add_argument("--case-list", default=None, help="기준 케이스 폴더 이름 목록 파일 (한 줄에 하나)")
+    quality.add_argument("--min-ssim", type=float, default=None, help="이 값보다 낮은 뷰나 빠진 뷰가 있으면 exit code 1")
+    quality.add_argument("--json", default=None, help="결과를 JSON으로 저장")
+
+    args = parser.parse_args(_script_args() if argv is None else argv)
+
+    if args.command == "compare":
+        if os.path.isdir(args.a):
+            rows = compare_directories(args.a, args.b, args.threshold)
+        else:
+            rows = [dict(file=os.path.basename(args.a), **compare_images(args.a, args.b, args.threshold))]
+        for row in rows:
+            print(f"{row['file']}: mean {row['mean_abs_diff']:.5f}, max {row['max_abs_diff']:.4f}, "
+                  f"changed {row['changed_fraction'] * 100:.2f}%")
+        summary = summarize_diffs(rows)
+        print(f"Summary: {json.dumps(summary)}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"summary": summary, "images": rows}, f, indent=2)
+
+    elif args.command == "quality":
+        cases = None
+        if args.case_list:
+            with open(args.case_list, encoding="utf-8") as f:
+                cases = [line.strip() for line in f if line.strip()]
+        rows = compare_quality(args.reference, args.test, cases)
+        failed = 0
+        for row in rows:
+            if row.get("missing"):
+                failed += 1
+                print(f"{row['file']}: missing in {args.test}")
+                continue
+            low = args.min_ssim is not None and row["ssim"] < args.min_ssim
+            failed += low
+            print(f"{row['file']}: SSIM {row['ssim']:.4f}, PSNR {row['psnr']:.2f} dB{'  [LOW]' if low else ''}")
+        summary = summarize_quality(rows)
+        print(f"Summary: {json.dumps(summary)}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"reference": os.path.abspath(args.reference), "test": os.path.abspath(args.test),
+                           "summary": summary, "images": rows}, f, indent=2)
+        if args.min_ssim is not None and (failed or not summary["images"]):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
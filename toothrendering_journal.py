@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+'''
+렌더링 완료 기록(저널) 모듈
+- 뷰 하나의 출력 이미지 저장이 끝날 때마다 (케이스, 렌더링 타입, 뷰)와 파일별 크기/체크섬을 JSON 한 줄로 추가 (fsync)
+- 이어서 렌더링(resume)할 때 저널에 완료로 기록되고 파일이 그대로 남아 있는 뷰는 건너뜀
+  (파일이 없거나 크기/체크섬이 다르면 다시 렌더링)
+- 중단 중 마지막 줄이 잘려도 그 줄만 무시하고 읽음
+- bpy 없이 동작 (일반 Python으로 실행)
+
+실행 예시:
+  python toothrendering_journal.py summary <저널 파일> [--verify]
+'''
+
+JOURNAL_FILENAME = "render_journal.jsonl"
+CHECKSUM_CHUNK = 1 << 20
+
+
+def default_journal_path(output_base):
+    """기본 저널 위치: output/render_journal.jsonl"""
+    return os.path.join(output_base, JOURNAL_FILENAME)
+
+
+def file_checksum(path):
+    """파일 SHA-256 (hex)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def output_record(path):
+    """출력 파일 하나의 저널 기록 {path, size, sha256}"""
+    return {"path": os.path.abspath(path), "size": os.path.getsize(path), "sha256": file_checksum(path)}
+
+
+def check_output(record, verify_checksum=False):
+    """저널 기록과 실제 파일 비교 → 문제 설명 (정상이면 None)"""
+    try:
+        size = os.path.getsize(record["path"])
+    except OSError:
+        return "파일 없음"
+    if size != record["size"]:
+        return f"크기 불일치 ({size} != {record['size']})"
+    if verify_checksum and file_checksum(record["path"]) != record["sha256"]:
+        return "체크섬 불일치"
+    return None
+
+
+def read_journal(path):
+    """저널 파일 → {(case, pass, view): 마지막 기록} (읽을 수 없는 줄은 무시)"""
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                entries[(entry["case"], entry["pass"], entry["view"])] = entry
+            except (ValueError, KeyError, TypeError):
+                continue
+    return entries
+
+
+class RenderJournal:
+    """추가 전용 렌더링 완료 저널 (한 줄 = 뷰 하나의 출력 파일들)
+
+    기록은 줄마다 O_APPEND로 한 번에 쓰고 fsync하므로 같은 저널에 여러 워커가 기록해도 줄이 섞이지 않음.
+    """
+
+    def __init__(self, path, verify_checksum=False):
+        self.path = path
+        self.verify_checksum = verify_checksum
+        self.entries = read_journal(path)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # 중단으로 마지막 줄이 잘렸으면 다음 기록이 그 줄에 붙지 않도록 줄바꿈 추가
+        if os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    os.write(self._fd, b"\n")
+
+    def record(self, case, render_pass, view, paths):
+        """뷰 하나의 출력 파일 저장 완료 기록"""
+        entry = {
+            "case": case,
+            "pass": render_pass,
+            "view": view,
+            "outputs": [output_record(path) for path in paths],
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        os.write(self._fd, (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        os.fsync(self._fd)
+        self.entries[(case, render_pass, view)] = entry
+
+    def is_complete(self, case, render_pass, view, expected_outputs=1):
+        """기록된 출력 파일 수가 맞고 모든 파일이 크기(설정 시 체크섬까지) 그대로 남아 있으면 True"""
+        entry = self.entries.get((case, render_pass, view))
+        if entry is None or len(entry["outputs"]) != expected_outputs:
+            return False
+        return all(check_output(record, self.verify_checksum) is None for record in entry["outputs"])
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def print_summary(path, verify_checksum=False):
+    entries = read_journal(path)
+    cases = {key[0] for key in entries}
+    by_pass = {}
+    for key in entries:
+        by_pass[key[1]] = by_pass.get(key[1], 0) + 1
+    print(f"Journal: {path}")
+    print(f"Cases: {len(cases)}, views: {len(entries)} "
+          f"({', '.join(f'{name} {count}' for name, count in sorted(by_pass.items()))})")
+
+    invalid = 0
+    for (case, render_pass, view), entry in sorted(entries.items()):
+        for record in entry["outputs"]:
+            problem = check_output(record, verify_checksum)
+            if problem:
+                invalid += 1
+                print(f"  [INVALID] {case} {render_pass} {view}: {record['path']} ({problem})")
+    print(f"Invalid outputs: {invalid} (다음 resume 실행에서 다시 렌더링)")
+    return invalid
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering journal utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    summary = sub.add_parser("summary", help="저널 요약 및 없어지거나 잘린 출력 파일 확인")
+    summary.add_argument("journal")
+    summary.add_argument("--verify", action="store_true", help="크기뿐 아니라 체크섬까지 확인")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        invalid = print_summary(args.journal, args.verify)
+        sys.exit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
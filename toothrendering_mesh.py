@@ -0,0 +1,1119 @@
+import glob
+import hashlib
+import json
+import os
+import queue
+import re
+import math
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    import bpy
+    import mathutils
+except ImportError:  # Blender 밖(일반 Python)에서 import 하는 경우
+    bpy = None
+    mathutils = None
+
+'''
+메시 / 라벨 처리 보조 모듈
+- toothrendering*.py 스크립트들이 공통으로 사용
+- NumPy 배열 연산 부분은 bpy 없이도 동작 (벤치마크, 전처리용)
+
+실행 예시:
+  python toothrendering_mesh.py bench-material-index
+  blender -b -P toothrendering_mesh.py -- bench-material-index
+  blender -b -P toothrendering_mesh.py -- preprocess <케이스 루트 폴더> [--cache-dir DIR] [--bake-transform]
+  python toothrendering_mesh.py preprocess <케이스 루트 폴더> --loader numpy  (Blender 없이 변환)
+  blender -b -P toothrendering_mesh.py -- bench-obj-loader <OBJ 파일>
+'''
+
+# material_index (잇몸: 0, 치아: 1)
+GUM_MATERIAL_INDEX = 0
+TOOTH_MATERIAL_INDEX = 1
+
+# 라벨 캐시 파일 접미사: <json 이름>.<크기>_<mtime_ns>.labels.npy
+LABEL_CACHE_SUFFIX = ".labels.npy"
+
+# 메시 캐시: <내용 해시>.mesh.npz (형식이 바뀌면 버전을 올려 기존 캐시를 무효화)
+MESH_CACHE_VERSION = 1
+MESH_CACHE_SUFFIX = ".mesh.npz"
+MESH_CACHE_MANIFEST = "manifest.json"
+
+# 케이스 배치: OBJ 임포트 후 X축 -45도 회전, (0, 29.29, 70) 이동
+PLACEMENT_ROTATION_X_DEG = -45.0
+PLACEMENT_OFFSET = (0.0, 29.29, 70.0)
+
+# OBJ 임포터 기본 축 변환 (-Z forward, Y up → Blender Z up): 오브젝트 X축 +90도 회전
+OBJ_AXIS_ROTATION_X_DEG = 90.0
+
+# NumPy OBJ 파서가 한 번에 읽는 크기
+OBJ_PARSE_CHUNK_BYTES = 64 << 20
+_OBJ_FACE_SUFFIX_RE = re.compile(rb"/[^\s]*")
+
+
+# === 라벨 캐시 ===
+
+def label_cache_path(json_file, cache_dir=None):
+    """라벨 JSON에 대응하는 캐시 파일 경로 (JSON 크기와 mtime을 키로 사용)"""
+    stat = os.stat(json_file)
+    base = os.path.splitext(os.path.basename(json_file))[0]
+    if cache_dir:
+        # 공용 캐시 폴더에서는 케이스 간 파일명 충돌을 피하기 위해 경로 해시를 붙임
+        path_hash = hashlib.sha1(os.path.abspath(json_file).encode("utf-8")).hexdigest()[:8]
+        base = f"{base}_{path_hash}"
+        directory = cache_dir
+    else:
+        directory = os.path.dirname(os.path.abspath(json_file))
+    return os.path.join(directory, f"{base}.{stat.st_size}_{stat.st_mtime_ns}{LABEL_CACHE_SUFFIX}")
+
+
+def _compact_label_dtype(labels):
+    """라벨 값 범위에 맞는 가장 작은 정수 타입"""
+    if labels.size == 0:
+        return np.uint8
+    low, high = int(labels.min()), int(labels.max())
+    if low >= 0 and high <= np.iinfo(np.uint8).max:
+        return np.uint8
+    if low >= 0 and high <= np.iinfo(np.uint16).max:
+        return np.uint16
+    return np.int32
+
+
+def read_labels_json(json_file):
+    """라벨 JSON을 직접 파싱해서 정수 배열로 반환"""
+    with open(json_file) as f:
+        meta = json.load(f)
+    labels = np.asarray(meta["labels"], dtype=np.int64)
+    return labels.astype(_compact_label_dtype(labels))
+
+
+def load_labels(json_file, cache_dir=None, use_cache=True):
+    """라벨 배열 로드
+
+    캐시(.npy)가 있으면 memory-map으로 읽고, 없으면 JSON을 파싱한 뒤 uint8/uint16 캐시를 기록.
+    JSON의 크기나 mtime이 바뀌면 캐시 키가 달라지므로 자동으로 다시 생성됨.
+    """
+    if not use_cache:
+        return read_labels_json(json_file)
+
+    cache_path = label_cache_path(json_file, cache_dir)
+    if os.path.exists(cache_path):
+        try:
+            return np.load(cache_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"  [WARNING] Label cache unreadable, rebuilding: {cache_path} ({e})")
+
+    labels = read_labels_json(json_file)
+    try:
+        _write_label_cache(cache_path, labels)
+    except OSError as e:
+        print(f"  [WARNING] Label cache write failed: {cache_path} ({e})")
+    return labels
+
+
+def _write_label_cache(cache_path, labels):
+    """라벨 캐시를 임시 파일에 쓴 뒤 원자적으로 교체하고, 같은 JSON의 오래된 캐시는 삭제"""
+    directory = os.path.dirname(cache_path)
+    os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, labels)
+    os.replace(tmp_path, cache_path)
+
+    # <json 이름>.<이전 크기>_<이전 mtime>.labels.npy 정리
+    prefix = os.path.basename(cache_path).rsplit(".", 3)[0]
+    for stale in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(prefix)}.*{LABEL_CACHE_SUFFIX}")):
+        key = os.path.basename(stale)[len(prefix) + 1:-len(LABEL_CACHE_SUFFIX)]
+        if not re.fullmatch(r"\d+_\d+", key):
+            continue  # 다른 JSON의 캐시 (예: 이름에 점이 포함된 경우)
+        if os.path.abspath(stale) != os.path.abspath(cache_path):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def fit_labels_to_vertices(labels, vertex_count, pad_value=0, verbose=True):
+    """라벨 개수를 버텍스 개수에 맞춤 (부족하면 pad_value로 패딩, 많으면 초과분 자르기)"""
+    labels = np.asarray(labels)
+    label_count = len(labels)
+    if label_count == vertex_count:
+        return labels
+
+    if verbose:
+        print(f"  [WARNING] Label/Vertex mismatch: labels={label_count} vs vertices={vertex_count}")
+
+    if label_count < vertex_count:
+        # 라벨이 부족한 경우: pad_value로 패딩
+        padding = np.full(vertex_count - label_count, pad_value, dtype=labels.dtype)
+        if verbose:
+            print(f"  [WARNING] Padded {vertex_count - label_count} labels with {pad_value}")
+        return np.concatenate([labels, padding])
+
+    # 라벨이 너무 많은 경우: 초과분 자르기
+    if verbose:
+        print(f"  [WARNING] Truncated {label_count - vertex_count} excess labels")
+    return labels[:vertex_count]
+
+
+def face_material_indices(loop_start, loop_vertices, labels, current=None, mixed_index=None):
+    """면별 material_index를 한 번에 계산
+
+    모든 꼭짓점 라벨이 0이면 잇몸(0), 모두 0보다 크면 치아(1).
+    라벨이 섞인 면은 mixed_index가 None이면 current 값을 유지하고, 아니면 mixed_index로 설정.
+    loop_start는 면마다 첫 loop 위치 (Blender의 polygons.loop_start와 동일)
+    """
+    loop_start = np.asarray(loop_start, dtype=np.int64)
+    loop_vertices = np.asarray(loop_vertices, dtype=np.int64)
+    labels = np.asarray(labels)
+    face_count = len(loop_start)
+
+    if current is None:
+        current = np.zeros(face_count, dtype=np.int32)
+    result = np.array(current, dtype=np.int32, copy=True)
+    if mixed_index is not None:
+        result[:] = mixed_index
+    if face_count == 0:
+        return result
+
+    # reduceat은 구간 시작 위치가 오름차순이어야 함 (Blender 메시는 보통 이미 정렬되어 있음)
+    order = None
+    if np.any(loop_start[1:] < loop_start[:-1]):
+        order = np.argsort(loop_start, kind="stable")
+        loop_start = loop_start[order]
+
+    corner_labels = labels[loop_vertices]
+    face_min = np.minimum.reduceat(corner_labels, loop_start)
+    face_max = np.maximum.reduceat(corner_labels, loop_start)
+
+    all_gum = (face_min == 0) & (face_max == 0)
+    all_tooth = face_min > 0
+
+    if order is None:
+        result[all_gum] = GUM_MATERIAL_INDEX
+        result[all_tooth] = TOOTH_MATERIAL_INDEX
+    else:
+        result[order[all_gum]] = GUM_MATERIAL_INDEX
+        result[order[all_tooth]] = TOOTH_MATERIAL_INDEX
+    return result
+
+
+def read_mesh_topology(mesh):
+    """bpy 메시에서 loop_start / loop 꼭짓점 인덱스를 NumPy 배열로 읽기 (foreach_get)"""
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    return loop_start, loop_vertices
+
+
+def assign_material_indices(mesh, labels, mixed_index=None):
+    """라벨 배열로 mesh.polygons의 material_index를 일괄 설정 (foreach_get / foreach_set 한 번씩)"""
+    loop_start, loop_vertices = read_mesh_topology(mesh)
+
+    current = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", current)
+
+    indices = face_material_indices(loop_start, loop_vertices, labels, current, mixed_index)
+    mesh.polygons.foreach_set("material_index", indices)
+    mesh.update()
+    return indices
+
+
+def fill_mesh(mesh, vertices, loop_start, loop_vertices):
+    """비어 있는 bpy 메시에 꼭짓점/면을 foreach_set으로 채우기"""
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+    loop_start = np.ascontiguousarray(loop_start, dtype=np.int32)
+    loop_vertices = np.ascontiguousarray(loop_vertices, dtype=np.int32)
+
+    mesh.vertices.add(len(vertices))
+    mesh.loops.add(len(loop_vertices))
+    mesh.polygons.add(len(loop_start))
+
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.polygons.foreach_set("loop_start", loop_start)
+
+    # Blender 4.x 이전 버전은 loop_total도 직접 설정해야 함 (4.x에서는 읽기 전용)
+    try:
+        loop_total = np.diff(np.append(loop_start, len(loop_vertices))).astype(np.int32)
+        mesh.polygons.foreach_set("loop_total", loop_total)
+    except (AttributeError, TypeError, RuntimeError):
+        pass
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+# === 케이스 파일 / 임포트 ===
+
+def find_obj_json_files(case_path):
+    """케이스 폴더에서 OBJ와 JSON 파일을 찾아서 반환 (여러 개면 마지막으로 발견된 파일)"""
+    obj_file = None
+    json_file = None
+    for f in os.listdir(case_path):
+        if f.endswith(".obj"):
+            obj_file = os.path.join(case_path, f)
+        elif f.endswith(".json"):
+            json_file = os.path.join(case_path, f)
+    return obj_file, json_file
+
+
+def import_obj_operator(obj_file):
+    """bpy.ops.wm.obj_import로 OBJ 임포트 후 생성된 오브젝트 반환"""
+    bpy.ops.wm.obj_import(filepath=obj_file)
+    return bpy.context.selected_objects[0]
+
+
+def apply_case_placement(obj):
+    """메시 변환: X축 -45도 회전 후 (0, 29.29, 70) 이동"""
+    obj.rotation_euler.x += math.radians(PLACEMENT_ROTATION_X_DEG)
+    obj.location += mathutils.Vector(PLACEMENT_OFFSET)
+
+
+def case_matrix_world():
+    """임포트(X축 +90도) + 케이스 배치 후의 오브젝트 월드 행렬 (4x4)"""
+    angle = math.radians(OBJ_AXIS_ROTATION_X_DEG + PLACEMENT_ROTATION_X_DEG)
+    matrix = np.identity(4)
+    matrix[1, 1] = matrix[2, 2] = math.cos(angle)
+    matrix[1, 2] = -math.sin(angle)
+    matrix[2, 1] = math.sin(angle)
+    matrix[:3, 3] = PLACEMENT_OFFSET
+    return matrix
+
+
+def import_obj(obj_file, loader="operator"):
+    """OBJ 임포트 (loader: "operator" = bpy.ops.wm.obj_import, "numpy" = load_obj_numpy)"""
+    if loader == "numpy":
+        return load_obj_numpy(obj_file)
+    return import_obj_operator(obj_file)
+
+
+# === NumPy OBJ 로더 ===
+
+def _parse_obj_vertices(payloads):
+    """v 레코드 본문들 → (N, 3) float 배열 (정점 색상 등 추가 값은 무시)"""
+    if not payloads:
+        return np.empty((0, 3), dtype=np.float64)
+    values = np.fromstring(b" ".join(payloads).decode("ascii"), sep=" ")
+    if len(values) == 3 * len(payloads):
+        return values.reshape(-1, 3)
+    # 한 줄에 3개가 아닌 값이 있는 경우 (v x y z r g b 등)
+    rows = [p.split()[:3] for p in payloads]
+    if any(len(row) != 3 for row in rows):
+        raise ValueError("OBJ vertex record with fewer than 3 coordinates")
+    return np.array(rows).astype(np.float64)
+
+
+def _uniform_corners(joined, corners, slashes, double_slash):
+    """모든 꼭짓점이 첫 꼭짓점과 같은 형식인지 (꼭짓점마다 "/" 개수가 같고 "//" 개수도 맞는지, 벡터화 검사)
+
+    숫자 개수 합만 보면 형식이 섞인 면(a/b/c와 a가 섞이면 a/b처럼 보임)을 구분할 수 없음.
+    """
+    if joined.count(b"/") != corners * slashes or joined.count(b"//") != (corners if double_slash else 0):
+        return False
+    if slashes == 0:
+        return True
+    raw = np.frombuffer(joined, dtype=np.uint8)
+    separator = (raw == ord(" ")) | (raw == ord("\t")) | (raw == ord("\r"))
+    # 꼭짓점 토큰의 마지막 글자 (다음 글자가 구분자이거나 끝)
+    token_end = ~separator & np.append(separator[1:], True)
+    per_token = np.diff(np.cumsum(raw == ord("/"))[token_end], prepend=0)
+    return len(per_token) == corners and bool((per_token == slashes).all())
+
+
+def _parse_obj_faces(payloads):
+    """f 레코드 본문들 → (면별 꼭짓점 수, 0-based 꼭짓점 인덱스) (vt/vn 인덱스는 무시)"""
+    if not payloads:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    joined = b" ".join(payloads)
+
+    # 꼭짓점 하나당 숫자 개수 (1, 1/2, 1//3 → 1, 2, 2 / 1/2/3 → 3)
+    first_corner = payloads[0].split()[0]
+    per_corner = len([c for c in first_corner.split(b"/") if c])
+    slashes = first_corner.count(b"/")
+    values = np.fromstring(joined.replace(b"/", b" ").decode("ascii"), sep=" ", dtype=np.int64)
+
+    if len(values) == 3 * per_corner * len(payloads):
+        # 모든 면이 최소 3개 꼭짓점이므로 합계가 3배면 전부 삼각형
+        counts = np.full(len(payloads), 3, dtype=np.int64)
+    else:
+        counts = np.fromiter((len(p.split()) for p in payloads), dtype=np.int64, count=len(payloads))
+
+    if counts.sum() * per_corner == len(values) and _uniform_corners(joined, counts.sum(), slashes,
+                                                                     b"//" in first_corner):
+        indices = values[::per_corner]
+    else:
+        # 면마다 vt/vn 형식이 섞여 있는 경우: 첫 번째 값만 남기고 다시 파싱
+        indices = np.fromstring(_OBJ_FACE_SUFFIX_RE.sub(b"", joined).decode("ascii"), sep=" ", dtype=np.int64)
+        counts = np.fromiter((len(p.split()) for p in payloads), dtype=np.int64, count=len(payloads))
+        if counts.sum() != len(indices):
+            raise ValueError("OBJ face records could not be parsed")
+
+    if len(indices) and indices.min() < 1:
+        raise ValueError("OBJ with relative (negative) or zero face indices is not supported")
+    return counts, indices - 1
+
+
+def parse_obj(obj_file, chunk_bytes=OBJ_PARSE_CHUNK_BYTES):
+    """OBJ의 v / f 레코드만 청크 단위로 파싱
+
+    반환: vertices (N, 3) float32, loop_start (F,) int32, loop_vertices (L,) int32
+    bpy.ops.wm.obj_import와 같이 면에서 참조되지 않는 꼭짓점은 제거하고 인덱스를 다시 매김.
+    """
+    vertex_chunks = []
+    count_chunks = []
+    index_chunks = []
+
+    with open(obj_file, "rb") as f:
+        remainder = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                data = remainder
+            else:
+                data = remainder + block
+                cut = data.rfind(b"\n") + 1
+                data, remainder = data[:cut], data[cut:]
+            if data:
+                lines = data.split(b"\n")
+                vertex_chunks.append(_parse_obj_vertices([line[2:] for line in lines if line[:2] == b"v "]))
+                counts, indices = _parse_obj_faces([line[2:] for line in lines if line[:2] == b"f "])
+                count_chunks.append(counts)
+                index_chunks.append(indices)
+            if not block:
+                break
+
+    vertices = np.concatenate(vertex_chunks) if vertex_chunks else np.empty((0, 3))
+    counts = np.concatenate(count_chunks) if count_chunks else np.empty(0, dtype=np.int64)
+    loop_vertices = np.concatenate(index_chunks) if index_chunks else np.empty(0, dtype=np.int64)
+
+    if len(loop_vertices) and loop_vertices.max() >= len(vertices):
+        raise ValueError(f"OBJ face index {loop_vertices.max() + 1} out of range ({len(vertices)} vertices)")
+
+    # 사용되지 않는 꼭짓점 제거 (임포터와 동일한 꼭짓점 순서 유지)
+    used = np.zeros(len(vertices), dtype=bool)
+    used[loop_vertices] = True
+    if not used.all():
+        remap = np.cumsum(used) - 1
+        vertices = vertices[used]
+        loop_vertices = remap[loop_vertices]
+
+    loop_start = np.zeros(len(counts), dtype=np.int64)
+    if len(counts):
+        loop_start[1:] = np.cumsum(counts)[:-1]
+
+    return (vertices.astype(np.float32),
+            loop_start.astype(np.int32),
+            loop_vertices.astype(np.int32))
+
+
+def load_obj_numpy(obj_file, name=None, collection=None):
+    """parse_obj 결과로 bpy 메시 오브젝트 생성 (bpy.ops / UI 컨텍스트 불필요)
+
+    임포터와 같은 축 변환(X축 +90도)을 오브젝트에 설정. 머티리얼, UV, 노멀(vn)은 만들지 않음.
+    """
+    vertices, loop_start, loop_vertices = parse_obj(obj_file)
+    name = name or os.path.splitext(os.path.basename(obj_file))[0]
+
+    mesh = bpy.data.meshes.new(name)
+    fill_mesh(mesh, vertices, loop_start, loop_vertices)
+
+    obj = bpy.data.objects.new(name, mesh)
+    (collection or bpy.context.collection).objects.link(obj)
+    obj.rotation_euler.x = math.radians(OBJ_AXIS_ROTATION_X_DEG)
+    return obj
+
+
+def mesh_arrays_from_obj(obj_file, labels, bake_transform=False):
+    """OBJ + 라벨로 캐시용 메시 배열 생성 (bpy 없이, NumPy 로더 기준)"""
+    vertices, loop_start, loop_vertices = parse_obj(obj_file)
+    labels = fit_labels_to_vertices(labels, len(vertices))
+    matrix_world = case_matrix_world()
+    arrays = {
+        "vertices": vertices,
+        "loop_start": loop_start,
+        "loop_vertices": loop_vertices,
+        "material_index": face_material_indices(loop_start, loop_vertices, labels).astype(np.uint8),
+        "use_smooth": np.zeros(len(loop_start), dtype=bool),
+        "labels": np.asarray(labels),
+    }
+    if bake_transform:
+        arrays["vertices"] = (vertices @ matrix_world[:3, :3].T + matrix_world[:3, 3]).astype(np.float32)
+        matrix_world = np.identity(4)
+    arrays["matrix_world"] = matrix_world
+    return arrays
+
+
+# === 메시 캐시 ===
+
+def _hash_file(hasher, path, chunk_size=1 << 20):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            hasher.update(chunk)
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def default_mesh_cache_dir(input_root):
+    """기본 메시 캐시 위치: <입력 폴더의 상위>/output/mesh_cache (렌더링 출력 폴더와 동일한 규칙)"""
+    selected_root = os.path.normpath(input_root)
+    selected_parent = os.path.dirname(selected_root)
+    if not selected_parent or selected_parent == selected_root:
+        selected_parent = selected_root
+    return os.path.join(selected_parent, "output", "mesh_cache")
+
+
+class MeshCache:
+    """OBJ + 라벨 JSON을 변환한 바이너리 메시 캐시
+
+    캐시 파일명은 OBJ/JSON 내용 해시이며, manifest.json에 (크기, mtime) → 해시를 기록해서
+    파일이 바뀌지 않았으면 다시 해시하지 않음.
+    """
+
+    def __init__(self, cache_dir, bake_transform=False):
+        self.cache_dir = cache_dir
+        self.bake_transform = bake_transform
+        self.manifest_path = os.path.join(cache_dir, MESH_CACHE_MANIFEST)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._manifest = self._read_manifest()
+        self._lock = threading.Lock()  # 프리페치 스레드와 manifest 공유
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def key(self, obj_file, json_file):
+        """OBJ/JSON 내용 + 캐시 형식 버전 + 변환 적용 여부의 해시"""
+        manifest_key = f"{os.path.abspath(obj_file)}|{os.path.abspath(json_file)}|{int(self.bake_transform)}"
+        signature = _file_signature(obj_file) + _file_signature(json_file)
+        with self._lock:
+            entry = self._manifest.get(manifest_key)
+        if entry and entry.get("signature") == signature and entry.get("version") == MESH_CACHE_VERSION:
+            return entry["hash"]
+
+        hasher = hashlib.sha1()
+        hasher.update(f"v{MESH_CACHE_VERSION}|bake={int(self.bake_transform)}|".encode("utf-8"))
+        _hash_file(hasher, obj_file)
+        hasher.update(b"|")
+        _hash_file(hasher, json_file)
+        content_hash = hasher.hexdigest()
+
+        with self._lock:
+            self._manifest[manifest_key] = {
+                "signature": signature,
+                "version": MESH_CACHE_VERSION,
+                "hash": content_hash,
+            }
+            try:
+                self._write_manifest()
+            except OSError as e:
+                print(f"  [WARNING] Mesh cache manifest write failed: {e}")
+        return content_hash
+
+    def path_for(self, obj_file, json_file, variant=None):
+        """variant: 같은 케이스의 파생 메시 (예: "lod0.5") → <해시>.<variant>.mesh.npz"""
+        suffix = f".{variant}{MESH_CACHE_SUFFIX}" if variant else MESH_CACHE_SUFFIX
+        return os.path.join(self.cache_dir, self.key(obj_file, json_file) + suffix)
+
+    def load(self, obj_file, json_file, variant=None):
+        """캐시가 있으면 메시 배열 dict 반환, 없으면 None"""
+        path = self.path_for(obj_file, json_file, variant)
+        if not os.path.exists(path):
+            return None
+        try:
+            return load_mesh_arrays(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  [WARNING] Mesh cache unreadable, ignoring: {path} ({e})")
+            return None
+
+    def store(self, obj_file, json_file, arrays, variant=None):
+        """메시 배열을 캐시에 기록하고 경로 반환"""
+        path = self.path_for(obj_file, json_file, variant)
+        save_mesh_arrays(path, arrays)
+        return path
+
+
+def save_mesh_arrays(path, arrays):
+    """메시 배열을 비압축 .npz로 원자적으로 저장"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(f, version=np.int32(MESH_CACHE_VERSION), **arrays)
+        os.replace(tmp_path, path)
+    except OSError:
+        # 디스크가 가득 찼을 때 등: 쓰다 만 임시 파일을 남기지 않음
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_mesh_arrays(path):
+    """save_mesh_arrays로 저장한 메시 배열 로드"""
+    with np.load(path) as data:
+        if int(data["version"]) != MESH_CACHE_VERSION:
+            raise ValueError(f"mesh cache version {int(data['version'])} != {MESH_CACHE_VERSION}")
+        return {name: data[name] for name in data.files if name != "version"}
+
+
+def _read_corner_normals(mesh):
+    """커스텀 노멀이 있는 메시의 loop(코너) 노멀 읽기 (Blender 버전별 API 차이 처리)"""
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if hasattr(mesh, "corner_normals"):
+        mesh.corner_normals.foreach_get("vector", normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+
+def extract_mesh_arrays(obj, labels, bake_transform=False):
+    """설정이 끝난 bpy 오브젝트에서 캐시용 배열 추출
+
+    vertices / loop_start / loop_vertices / material_index / labels / matrix_world와
+    셰이딩 정보(use_smooth, 커스텀 노멀)를 포함. bake_transform이면 월드 변환을 꼭짓점에 적용.
+    """
+    mesh = obj.data
+    vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+    vertices = vertices.reshape(-1, 3)
+
+    loop_start, loop_vertices = read_mesh_topology(mesh)
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    use_smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", use_smooth)
+
+    matrix_world = np.array(obj.matrix_world, dtype=np.float64)
+    arrays = {
+        "vertices": vertices,
+        "loop_start": loop_start,
+        "loop_vertices": loop_vertices,
+        "material_index": material_index.astype(np.uint8),
+        "use_smooth": use_smooth,
+        "labels": np.asarray(labels),
+    }
+
+    if mesh.has_custom_normals:
+        arrays["corner_normals"] = _read_corner_normals(mesh)
+
+    if bake_transform:
+        arrays["vertices"] = (vertices @ matrix_world[:3, :3].T + matrix_world[:3, 3]).astype(np.float32)
+        if "corner_normals" in arrays:
+            normal_matrix = np.linalg.inv(matrix_world[:3, :3]).T
+            normals = arrays["corner_normals"] @ normal_matrix.T
+            normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+            arrays["corner_normals"] = normals.astype(np.float32)
+        matrix_world = np.identity(4)
+
+    arrays["matrix_world"] = matrix_world
+    return arrays
+
+
+def create_mesh_object(name, arrays, collection=None):
+    """캐시 배열로 bpy 메시 오브젝트 생성 (foreach_set, 임포터 사용 안 함)"""
+    mesh = bpy.data.meshes.new(name)
+    fill_mesh(mesh, arrays["vertices"], arrays["loop_start"], arrays["loop_vertices"])
+    apply_mesh_attributes(mesh, arrays)
+
+    obj = bpy.data.objects.new(name, mesh)
+    (collection or bpy.context.collection).objects.link(obj)
+    obj.matrix_world = mathutils.Matrix(np.asarray(arrays["matrix_world"]).tolist())
+    return obj
+
+
+def apply_mesh_attributes(mesh, arrays):
+    """material_index / 셰이딩 / 커스텀 노멀을 채워진 메시에 적용"""
+    if "material_index" in arrays:
+        mesh.polygons.foreach_set("material_index", np.asarray(arrays["material_index"], dtype=np.int32))
+    if "use_smooth" in arrays:
+        mesh.polygons.foreach_set("use_smooth", np.asarray(arrays["use_smooth"], dtype=bool))
+    if "corner_normals" in arrays:
+        if hasattr(mesh, "use_auto_smooth"):  # Blender 4.1 이전
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set(np.asarray(arrays["corner_normals"], dtype=np.float32).tolist())
+    mesh.update()
+
+
+def preprocess_cases(input_root, cache_dir=None, bake_transform=False, force=False, loader="operator"):
+    """입력 폴더의 모든 케이스를 메시 캐시로 변환 (OBJ 파싱은 케이스당 한 번)
+
+    loader="operator"는 Blender 안에서 임포터로, loader="numpy"는 Blender 없이 parse_obj로 변환.
+    """
+    if bpy is None and loader != "numpy":
+        raise RuntimeError("operator 로더는 Blender 안에서 실행해야 합니다 (또는 --loader numpy 사용)")
+
+    cache = MeshCache(cache_dir or default_mesh_cache_dir(input_root), bake_transform)
+    case_folders = [
+        f for f in sorted(os.listdir(input_root))
+        if os.path.isdir(os.path.join(input_root, f))
+    ]
+
+    start_time = time.time()
+    converted = skipped = failed = 0
+    for idx, case_name in enumerate(case_folders, 1):
+        case_path = os.path.join(input_root, case_name)
+        obj_file, json_file = find_obj_json_files(case_path)
+        if not obj_file or not json_file:
+            print(f"[{idx}/{len(case_folders)}] {case_name}: OBJ 또는 JSON 파일 없음, 건너뜀")
+            failed += 1
+            continue
+
+        cache_path = cache.path_for(obj_file, json_file)
+        if os.path.exists(cache_path) and not force:
+            skipped += 1
+            continue
+
+        try:
+            case_start = time.time()
+            if loader == "numpy":
+                arrays = mesh_arrays_from_obj(obj_file, load_labels(json_file), bake_transform)
+            else:
+                obj = import_obj_operator(obj_file)
+                apply_case_placement(obj)
+                bpy.context.view_layer.update()
+
+                labels = fit_labels_to_vertices(load_labels(json_file), len(obj.data.vertices))
+                assign_material_indices(obj.data, labels)
+                arrays = extract_mesh_arrays(obj, labels, bake_transform)
+
+            cache.store(obj_file, json_file, arrays)
+            converted += 1
+            print(f"[{idx}/{len(case_folders)}] {case_name}: {os.path.basename(cache_path)} "
+                  f"({len(arrays['loop_start'])} faces, {time.time() - case_start:.1f}s)")
+        except Exception as e:
+            failed += 1
+            print(f"[{idx}/{len(case_folders)}] [ERROR] {case_name}: {e}")
+        finally:
+            if bpy is not None:
+                for block in list(bpy.data.objects):
+                    bpy.data.objects.remove(block, do_unlink=True)
+                for block in list(bpy.data.meshes):
+                    bpy.data.meshes.remove(block, do_unlink=True)
+
+    print(f"Mesh cache: {converted} converted, {skipped} up to date, {failed} failed "
+          f"({time.time() - start_time:.1f}s) -> {cache.cache_dir}")
+    return converted, skipped, failed
+
+
+
+# === LOD (단순화 메시) ===
+
+def triangulate_faces(loop_start, loop_vertices):
+    """다각형을 삼각형 fan으로 분할 → (T, 3) 꼭짓점 인덱스, 각 삼각형의 원본 면 인덱스"""
+    loop_start = np.asarray(loop_start, dtype=np.int64)
+    loop_vertices = np.asarray(loop_vertices, dtype=np.int64)
+    counts = np.diff(np.append(loop_start, len(loop_vertices)))
+    tri_counts = np.maximum(counts - 2, 0)
+    source_face = np.repeat(np.arange(len(counts)), tri_counts)
+    fan_offset = np.arange(int(tri_counts.sum())) - np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts)
+    first = loop_start[source_face]
+    triangles = np.stack([
+        loop_vertices[first],
+        loop_vertices[first + fan_offset + 1],
+        loop_vertices[first + fan_offset + 2],
+    ], axis=1)
+    return triangles, source_face
+
+
+def decimate_mesh_arrays(arrays, cell_size):
+    """격자 꼭짓점 클러스터링으로 메시 배열 단순화 (라벨 경계 보존)
+
+    꼭짓점을 (격자 셀, 닿아 있는 면의 material_index 조합)으로 묶기 때문에 잇몸 면에만 닿은 점,
+    치아 면에만 닿은 점, 경계 점은 서로 합쳐지지 않음. 면의 material_index는 원본 값을 유지하고
+    퇴화/중복 삼각형은 제거. 결과는 삼각형 메시 (커스텀 노멀 없음).
+    """
+    vertices = np.asarray(arrays["vertices"], dtype=np.float64)
+    material_index = np.asarray(arrays["material_index"], dtype=np.int64)
+    use_smooth = np.asarray(arrays.get("use_smooth", np.zeros(len(material_index), dtype=bool)), dtype=bool)
+    labels = np.asarray(arrays["labels"]) if "labels" in arrays else None
+    triangles, source_face = triangulate_faces(arrays["loop_start"], arrays["loop_vertices"])
+    triangle_material = material_index[source_face]
+
+    # 꼭짓점별로 닿아 있는 면의 material_index 비트 조합 (잇몸만: 1, 치아만: 2, 경계: 3)
+    vertex_class = np.zeros(len(vertices), dtype=np.int64)
+    for material in np.unique(triangle_material):
+        touched = np.bincount(triangles[triangle_material == material].ravel(), minlength=len(vertices)) > 0
+        vertex_class[touched] |= 1 << int(material)
+
+    # (셀 좌표, 클래스) → 하나의 int64 키
+    cells = np.floor((vertices - vertices.min(axis=0)) / cell_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    class_count = int(vertex_class.max()) + 1
+    keys = ((cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]) * class_count + vertex_class
+    _, cluster, cluster_size = np.unique(keys, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+
+    # 클러스터 대표점: 평균 위치, 라벨은 클러스터에서 가장 앞선 꼭짓점의 라벨
+    new_vertices = np.stack([
+        np.bincount(cluster, weights=vertices[:, axis], minlength=len(cluster_size)) / cluster_size
+        for axis in range(3)
+    ], axis=1)
+    representative = np.full(len(cluster_size), len(vertices), dtype=np.int64)
+    np.minimum.at(representative, cluster, np.arange(len(vertices)))
+
+    # 퇴화 삼각형 제거 후 같은 꼭짓점 조합의 중복 삼각형 제거 (앞선 삼각형 유지)
+    new_triangles = cluster[triangles]
+    keep = ((new_triangles[:, 0] != new_triangles[:, 1])
+            & (new_triangles[:, 1] != new_triangles[:, 2])
+            & (new_triangles[:, 0] != new_triangles[:, 2]))
+    new_triangles = new_triangles[keep]
+    kept_faces = source_face[keep]
+    _, first_index = np.unique(np.sort(new_triangles, axis=1), axis=0, return_index=True)
+    first_index.sort()
+    new_triangles = new_triangles[first_index]
+    kept_faces = kept_faces[first_index]
+
+    # 삼각형에서 참조되지 않는 클러스터 제거
+    used = np.zeros(len(cluster_size), dtype=bool)
+    used[new_triangles.ravel()] = True
+    remap = np.cumsum(used) - 1
+    new_triangles = remap[new_triangles]
+
+    result = {
+        "vertices": new_vertices[used].astype(np.float32),
+        "loop_start": np.arange(0, 3 * len(new_triangles), 3, dtype=np.int32),
+        "loop_vertices": new_triangles.ravel().astype(np.int32),
+        "material_index": material_index[kept_faces].astype(np.uint8),
+        "use_smooth": use_smooth[kept_faces],
+        "matrix_world": np.asarray(arrays["matrix_world"]),
+    }
+    if labels is not None:
+        result["labels"] = labels[representative[used]]
+    return result
+
+
+# === 백그라운드 프리페치 ===
+
+class PrefetchResult:
+    """프리페치 결과 (item: 입력, result: load_fn 반환값, error: 발생한 예외)"""
+
+    __slots__ = ("item", "result", "error", "load_seconds", "wait_seconds")
+
+    def __init__(self, item, result, error, load_seconds, wait_seconds=0.0):
+        self.item = item
+        self.result = result
+        self.error = error
+        self.load_seconds = load_seconds  # 백그라운드에서 읽는 데 걸린 시간
+        self.wait_seconds = wait_seconds  # 메인 스레드가 결과를 기다린 시간
+
+    @property
+    def hidden_seconds(self):
+        """렌더링과 겹쳐서 숨겨진 로드 시간"""
+        return max(0.0, self.load_seconds - self.wait_seconds)
+
+
+class CasePrefetcher:
+    """다음 케이스들의 파일 읽기/파싱을 백그라운드 스레드에서 미리 수행
+
+    load_fn은 bpy를 사용하지 않아야 함 (bpy는 메인 스레드 전용).
+    큐 크기(depth)만큼만 앞서 읽으므로 메모리에는 최대 depth + 1 케이스 분량만 올라감.
+    결과는 items 순서대로 반환되며, load_fn의 예외는 PrefetchResult.error로 전달됨.
+    """
+
+    _DONE = object()
+
+    def __init__(self, items, load_fn, depth=1):
+        self._items = list(items)
+        self._load_fn = load_fn
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="case-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for item in self._items:
+            if self._stop.is_set():
+                return
+            load_start = time.perf_counter()
+            try:
+                result, error = self._load_fn(item), None
+            except Exception as e:
+                result, error = None, e
+            if not self._put(PrefetchResult(item, result, error, time.perf_counter() - load_start)):
+                return
+        self._put(self._DONE)
+
+    def _put(self, entry):
+        # close()가 호출되면 큐가 가득 차 있어도 멈출 수 있도록 timeout으로 대기
+        while not self._stop.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        while True:
+            wait_start = time.perf_counter()
+            entry = self._queue.get()
+            if entry is self._DONE:
+                return
+            entry.wait_seconds = time.perf_counter() - wait_start
+            yield entry
+
+    def close(self):
+        """워커 스레드 종료 (남은 결과는 버림)"""
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join(timeout=5.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# === 벤치마크 ===
+
+def _synthetic_mesh(face_count, band_width=40):
+    """벤치마크용 삼각형 격자 메시와 라벨 생성 (잇몸/치아 띠가 번갈아 나타나 경계 면이 생김)"""
+    width = max(2, int(np.sqrt(face_count / 2)) + 1)
+    height = max(2, int(np.ceil(face_count / (2 * (width - 1)))) + 1)
+
+    ys, xs = np.mgrid[0:height, 0:width]
+    vertices = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)], axis=1).astype(np.float32)
+
+    quad = (ys[:-1, :-1] * width + xs[:-1, :-1]).ravel()
+    tris = np.concatenate([
+        np.stack([quad, quad + 1, quad + width], axis=1),
+        np.stack([quad + 1, quad + width + 1, quad + width], axis=1),
+    ])[:face_count]
+
+    loop_vertices = tris.ravel().astype(np.int32)
+    loop_start = np.arange(0, len(loop_vertices), 3, dtype=np.int32)
+
+    # 띠 모양 라벨: 0(잇몸) / 1~16(치아 번호)
+    band = xs.ravel() // band_width
+    labels = np.where(band % 2 == 0, 0, band % 16 + 1).astype(np.int64)
+    return vertices, loop_start, loop_vertices, labels
+
+
+def _legacy_material_indices(loop_start, loop_vertices, labels):
+    """기존 방식 (면마다 Python 리스트 생성) - 벤치마크 비교용"""
+    loop_start = loop_start.tolist()
+    loop_vertices = loop_vertices.tolist()
+    labels = labels.tolist()
+    ends = loop_start[1:] + [len(loop_vertices)]
+    result = [0] * len(loop_start)
+    for face_idx, (start, end) in enumerate(zip(loop_start, ends)):
+        face_labels = [labels[v] for v in loop_vertices[start:end]]
+        if all(l == 0 for l in face_labels):
+            result[face_idx] = 0
+        elif all(l > 0 for l in face_labels):
+            result[face_idx] = 1
+    return result
+
+
+def benchmark_material_index(face_counts=(300_000, 800_000), repeat=3):
+    """material_index 할당: 기존 면별 루프 vs NumPy 일괄 처리 비교
+
+    Blender 안에서 실행하면 실제 bpy 메시(poly.material_index 루프 vs foreach_set)도 비교
+    """
+    results = []
+    for face_count in face_counts:
+        vertices, loop_start, loop_vertices, labels = _synthetic_mesh(face_count)
+
+        legacy_times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            legacy = _legacy_material_indices(loop_start, loop_vertices, labels)
+            legacy_times.append(time.perf_counter() - t0)
+
+        numpy_times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            bulk = face_material_indices(loop_start, loop_vertices, labels)
+            numpy_times.append(time.perf_counter() - t0)
+
+        if not np.array_equal(np.asarray(legacy), bulk):
+            raise AssertionError("NumPy material_index 결과가 기존 루프와 다릅니다")
+
+        row = {
+            'faces': len(loop_start),
+            'array_legacy_s': min(legacy_times),
+            'array_numpy_s': min(numpy_times),
+        }
+
+        if bpy is not None:
+            row.update(_benchmark_bpy_material_index(vertices, loop_start, loop_vertices, labels, repeat))
+
+        results.append(row)
+
+    for row in results:
+        line = (f"faces={row['faces']:>8} | arrays: loop {row['array_legacy_s']:.3f}s, "
+                f"numpy {row['array_numpy_s']:.3f}s (x{row['array_legacy_s'] / max(row['array_numpy_s'], 1e-9):.1f})")
+        if 'bpy_legacy_s' in row:
+            line += (f" | bpy: loop {row['bpy_legacy_s']:.3f}s, "
+                     f"foreach {row['bpy_numpy_s']:.3f}s (x{row['bpy_legacy_s'] / max(row['bpy_numpy_s'], 1e-9):.1f})")
+        print(line)
+    return results
+
+
+def _benchmark_bpy_material_index(vertices, loop_start, loop_vertices, labels, repeat):
+    """실제 bpy 메시에서 기존 루프와 assign_material_indices 비교"""
+    mesh = bpy.data.meshes.new("bench_material_index")
+    try:
+        fill_mesh(mesh, vertices, loop_start, loop_vertices)
+        label_list = labels.tolist()
+
+        legacy_times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for poly in mesh.polygons:
+                face_labels = [label_list[v] for v in poly.vertices]
+                if all(l == 0 for l in face_labels):
+                    poly.material_index = 0
+                elif all(l > 0 for l in face_labels):
+                    poly.material_index = 1
+            legacy_times.append(time.perf_counter() - t0)
+
+        legacy = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", legacy)
+
+        numpy_times = []
+        for _ in range(repeat):
+            mesh.polygons.foreach_set("material_index", np.zeros(len(mesh.polygons), dtype=np.int32))
+            t0 = time.perf_counter()
+            bulk = assign_material_indices(mesh, labels)
+            numpy_times.append(time.perf_counter() - t0)
+
+        if not np.array_equal(legacy, bulk):
+            raise AssertionError("foreach_set material_index 결과가 기존 루프와 다릅니다")
+        return {'bpy_legacy_s': min(legacy_times), 'bpy_numpy_s': min(numpy_times)}
+    finally:
+        bpy.data.meshes.remove(mesh, do_unlink=True)
+
+
+def _peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량 (MB), 측정할 수 없으면 None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _measure_obj_loader(obj_file, loader):
+    """현재 프로세스에서 로더 한 번 실행 후 시간 / 최대 메모리 증가량 측정"""
+    import gc
+    gc.collect()
+    rss_before = _peak_rss_mb()
+    t0 = time.perf_counter()
+    obj = import_obj(obj_file, loader)
+    elapsed = time.perf_counter() - t0
+    rss_after = _peak_rss_mb()
+    return {
+        'loader': loader,
+        'seconds': elapsed,
+        'peak_rss_delta_mb': None if rss_before is None else rss_after - rss_before,
+        'vertices': len(obj.data.vertices),
+        'faces': len(obj.data.polygons),
+    }
+
+
+def benchmark_obj_loader(obj_file, loaders=("operator", "numpy")):
+    """bpy.ops.wm.obj_import vs NumPy 로더 속도 / 최대 메모리 비교
+
+    최대 메모리(ru_maxrss)는 프로세스 단위로만 증가하므로 로더마다 별도 Blender 프로세스에서 측정.
+    """
+    import subprocess
+
+    results = []
+    for loader in loaders:
+        cmd = [bpy.app.binary_path, "-b", "--factory-startup", "-P", os.path.abspath(__file__),
+               "--", "bench-obj-loader", obj_file, "--loader", loader, "--in-process"]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        marker = [line for line in proc.stdout.splitlines() if line.startswith("OBJ_LOADER_RESULT ")]
+        if proc.returncode != 0 or not marker:
+            print(f"[ERROR] {loader} loader benchmark failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+            continue
+        results.append(json.loads(marker[-1][len("OBJ_LOADER_RESULT "):]))
+
+    for row in results:
+        peak = "n/a" if row['peak_rss_delta_mb'] is None else f"{row['peak_rss_delta_mb']:.0f} MB"
+        print(f"{row['loader']:>8}: {row['seconds']:.2f}s, peak RSS +{peak} "
+              f"({row['vertices']} vertices, {row['faces']} faces)")
+    return results
+
+
+def _script_args():
+    """blender -b -P 실행 시 '--' 뒤의 인자만 사용"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering mesh utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench-material-index", help="material_index 할당 벤치마크")
+    bench.add_argument("--faces", type=int, nargs="+", default=[300_000, 800_000])
+    bench.add_argument("--repeat", type=int, default=3)
+
+    prep = sub.add_parser("preprocess", help="케이스 OBJ/라벨을 바이너리 메시 캐시로 변환 (Blender 필요)")
+    prep.add_argument("input_root")
+    prep.add_argument("--cache-dir", default=None, help="기본값: <입력 폴더의 상위>/output/mesh_cache")
+    prep.add_argument("--bake-transform", action="store_true", help="케이스 배치 변환을 꼭짓점에 미리 적용")
+    prep.add_argument("--force", action="store_true", help="기존 캐시가 있어도 다시 변환")
+    prep.add_argument("--loader", choices=["operator", "numpy"], default="operator")
+
+    bench_obj = sub.add_parser("bench-obj-loader", help="obj_import 오퍼레이터 vs NumPy 로더 비교 (Blender 필요)")
+    bench_obj.add_argument("obj_file")
+    bench_obj.add_argument("--loader", choices=["operator", "numpy"], action="append")
+    bench_obj.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(_script_args() if argv is None else argv)
+
+    if args.command == "bench-material-index":
+        benchmark_material_index(args.faces, args.repeat)
+    elif args.command == "preprocess":
+        preprocess_cases(args.input_root, args.cache_dir, args.bake_transform, args.force, args.loader)
+    elif args.command == "bench-obj-loader":
+        if bpy is None:
+            parser.error("bench-obj-loader는 Blender 안에서 실행해야 합니다")
+        if args.in_process:
+            result = _measure_obj_loader(args.obj_file, args.loader[0])
+            print("OBJ_LOADER_RESULT " + json.dumps(result))
+        else:
+            benchmark_obj_loader(args.obj_file, args.loader or ("operator", "numpy"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,41 @@
 import bpy
+import glob
 import os
 import json
 import mathutils
 import math
+import shutil
 import subprocess
 import sys
 import time
+from collections import defaultdict
+
+import numpy as np
+
+# 같은 폴더의 보조 모듈(toothrendering_*.py) import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from toothrendering_mesh import (
+    CasePrefetcher, MeshCache, apply_case_placement, apply_mesh_attributes, assign_material_indices, create_mesh_object,
+    decimate_mesh_arrays, default_mesh_cache_dir, extract_mesh_arrays, fill_mesh, find_obj_json_files, fit_labels_to_vertices, import_obj,
+    load_labels, mesh_arrays_from_obj,
+)
+from toothrendering_dataset import (
+    EXIT_CASE_ERRORS, STATUS_ERROR, default_case_index_path, default_output_dir, is_row_stale, list_case_folders, load_case_index,
+    write_error_log_entry,
+)
+from toothrendering_cycles import (
+    CPU_SETTINGS, apply_cycles_settings, auto_tune, available_gpu_backends, default_tuning_path, format_settings,
+)
+from toothrendering_costmodel import (
+    CostModel, choose_deadline_step, deadline_steps, default_cost_model_path, format_bytes, parse_deadline, plan_batch,
+)
+from toothrendering_imaging import compare_images, load_image_array, image_diff, summarize_diffs
+from toothrendering_journal import RenderJournal, default_journal_path
+from toothrendering_queue import WorkQueue, default_queue_dir, queue_status
+from toothrendering_rigs import camera_parameters, get_rig, sequence_rig
 
 '''
 카메라의 위치, 각도
@@ -20,7 +50,8 @@ intrinsic projection matrix, view matrix 총 5개
 MAX_CASES = 1  # 처리할 최대 케이스 수
 START_CASE = 1  # 시작 케이스 번호 (1부터 시작)
 Reverses = False  # 폴더 순서 역순 여부
-Sequence = 0 # 0: 기존 10개 카메라 각도, 1: 연속 카메라 각도 (40개), 2: 6개 각도, 3: 44개 각도 (11x4 grid)
+Sequence = 0 # 0: 기존 10개 카메라 각도, 1: 연속 카메라 각도 (40개), 2: 6개 각도, 3: 44개 각도 (11x4 grid), 4: 54개 각도 (5 ring)
+CAMERA_RIG = None  # None: Sequence 값의 내장 rig (seq0~seq4), 또는 toothrendering_rigs.py에 등록된 rig 이름
 
 '''
 ring1 (top-ish) : elevation +30도 -> 좌우 360도 회전하면서 12개 view
@@ -51,8 +82,156 @@ RENDER_POSITION = False  # 포지션 맵 (EEVEE) - 3D 월드 좌표
 # 파일 형식 설정
 USE_OPTIMIZED_FORMATS = False  # True: WebP/EXR 등 최적 형식, False: 모두 PNG
 
-# Windows에서 별도 콘솔창 띄우기
-if sys.platform == "win32":
+# 라벨 캐시 설정 (JSON 대신 uint8/uint16 .npy 캐시를 memory-map으로 읽음)
+USE_LABEL_CACHE = True
+LABEL_CACHE_DIR = None  # None: 케이스 폴더(JSON 옆)에 저장
+
+# 메시 캐시 설정 (toothrendering_mesh.py preprocess로 미리 변환해 두면 OBJ 임포트를 건너뜀)
+USE_MESH_CACHE = False
+MESH_CACHE_DIR = None  # None: output/mesh_cache
+MESH_CACHE_BAKE_TRANSFORM = False  # True: 배치 변환(-45도 회전, 이동)을 꼭짓점에 미리 적용해서 저장
+
+# OBJ 로더: "operator" = bpy.ops.wm.obj_import, "numpy" = v/f 레코드만 파싱 (vn 커스텀 노멀, UV, 머티리얼 생성 안 함)
+OBJ_LOADER = "operator"
+
+# 케이스마다 씬을 지우고 새로 임포트하는 대신 "jaw" 오브젝트 하나를 유지하고 지오메트리만 교체
+# (메시 캐시 또는 NumPy 파서로 읽음, OBJ_LOADER 설정은 사용하지 않음)
+REUSE_MESH_OBJECT = False
+PERSISTENT_OBJECT_NAME = "jaw"
+
+# 카메라 + 카메라에 부모 연결된 sun 라이트를 실행 중 한 쌍만 만들고 뷰마다 matrix_world로 위치만 변경
+# (False: 뷰마다 카메라/라이트를 새로 생성하는 이전 방식, 뷰 준비 시간 비교용)
+REUSE_CAMERA_RIG = True
+RIG_CAMERA_NAME = "render_cam"
+RIG_LIGHT_NAME = "render_sun"
+
+# 패스마다 뷰별 render(write_still) 호출 대신, 카메라 rig 포즈를 프레임별 키프레임(1프레임 = 1뷰)으로 기록하고
+# render(animation=True) 한 번으로 모든 뷰를 렌더링 (REUSE_CAMERA_RIG 필요, LOD_REPORT_VIEWS 비교는 건너뜀)
+# 프레임 번호 파일은 저장 직후 {file_prefix}_{view_name} 이름으로 바뀜
+RENDER_AS_ANIMATION = False
+ANIMATION_FIRST_FRAME = 1
+# 중단된 패스 이어서 렌더링: None = 처음부터, N = N번째 뷰(0부터)부터, "auto" = 출력 파일이 없는 첫 뷰부터
+ANIMATION_RESUME_FROM = None
+
+# 케이스 인덱스 (toothrendering_dataset.py scan 결과): 폴더 탐색 대신 사용하고 검사에 실패한 케이스는 미리 제외
+# (None: 사용 안 함, "auto": output/case_index.json, 또는 인덱스 파일 경로)
+CASE_INDEX_PATH = None
+
+# LOD(단순화 메시): 빠른 미리보기/QA용으로 렌더링 타입별 지오메트리 선택 ("full": 원본, "lod": 단순화 메시)
+# 단순화 메시는 라벨 경계(잇몸/치아)를 보존하는 꼭짓점 클러스터링으로 만들고 메시 캐시 폴더에 저장
+PASS_GEOMETRY = {
+    'lit': "full",
+    'unlit': "full",
+    'matt': "full",
+    'depth': "full",
+    'normal': "full",
+    'curvature': "full",
+    'position': "full",
+}
+LOD_CELL_SIZE = 0.5  # 클러스터링 격자 크기 (메시 단위, mm) - 클수록 면 수가 줄어듦
+LOD_REPORT_VIEWS = 0  # LOD 패스마다 처음 N개 뷰를 원본 메시로도 렌더링해서 시간/픽셀 차이 기록 (output/lod_report)
+
+# 결합 지오메트리 패스: unlit 렌더링 한 번에 Z/Normal/Position 뷰 레이어 패스를 함께 켜고
+# 컴포지터 File Output 노드로 depth/normal/position 이미지를 각 폴더에 저장 (뷰당 렌더링 최대 4회 → 1회)
+# RENDER_UNLIT이 켜져 있을 때만 사용 (position 배경은 개별 패스와 같이 월드 색)
+COMBINED_GEOMETRY_PASS = False
+
+# 엔진 우선 스케줄: K개 케이스 메시를 한 번에 올려두고 블록 전체에 EEVEE 패스 → 블록 전체에 Cycles 패스 순서로 렌더링
+# (케이스마다 EEVEE/Cycles를 오가는 엔진 전환, 셰이더 컴파일, Cycles 후 GPU 정리 횟수를 줄임)
+# 0 또는 1: 케이스 순서대로 렌더링 / 메시 캐시 또는 NumPy 파서 사용, REUSE_MESH_OBJECT와 OBJ_LOADER 설정은 사용하지 않음
+ENGINE_MAJOR_BLOCK = 0
+ENGINE_MAJOR_MAX_FACES = 5_000_000  # 블록에 올린 메시의 면 수 합이 이 값에 도달하면 K개가 안 되어도 블록 렌더링
+
+# Cycles 장치/스레드/타일 자동 튜닝 (toothrendering_cycles.py): 시작 시 보정 씬으로 설정 후보를 측정해서 가장 빠른 설정 사용
+# 결과는 호스트 fingerprint별로 캐시 (다음 실행부터 측정 없이 사용), lit/curvature 패스에 적용
+# False여도 GPU가 없는 노드에서는 CPU 설정 사용
+CYCLES_AUTO_TUNE = False
+CYCLES_TUNING_PATH = "auto"  # "auto": output/cycles_tuning.json, 또는 파일 경로
+CYCLES_RETUNE = False  # True: 캐시에 있어도 다시 측정
+
+# lit 패스 렌더링 프로파일 (LIT_PROFILES의 Cycles 설정을 lit 패스에만 적용, 품질 목표 모드/마감 모드는 그 위에서 샘플 수를 줄임)
+# "default": 실행 시작 시 씬 설정 그대로 (64 샘플, 적응 샘플링 최소 32 샘플, 디노이즈)
+# "fast": 저샘플 + OpenImageDenoise (albedo/normal 가이드 패스), 최소 샘플 0 (Cycles가 임계값에서 자동 결정) - CPU 노드용
+# 도입 전에는 기준 케이스 목록을 LIT_OUTPUT_DIRNAME만 바꿔 다시 렌더링하고 기존 lit 출력과 비교:
+#   blender -b -P toothrendering_optimized.py -- --input <케이스 루트> --case-list ref.txt --passes lit \
+#       --set LIT_PROFILE=fast --set LIT_OUTPUT_DIRNAME=lit_fast --journal none
+#   (저널은 렌더링 타입 이름 "lit"으로 기록하므로 비교용 렌더링은 기록하지 않음)
+#   python toothrendering_imaging.py quality output/lit output/lit_fast --case-list ref.txt
+LIT_PROFILE = "default"
+LIT_PROFILES = {
+    "default": {},
+    "fast": {
+        "samples": 8,
+        "adaptive_threshold": 0.05,
+        "adaptive_min_samples": 0,
+        "use_denoising": True,
+        "denoiser": "OPENIMAGEDENOISE",
+        "denoising_input_passes": "RGB_ALBEDO_NORMAL",
+        "denoising_prefilter": "ACCURATE",
+    },
+}
+LIT_OUTPUT_DIRNAME = "lit"  # lit 출력 폴더 이름 (다른 프로파일 결과를 기존 lit 출력 옆에 저장해서 비교할 때 변경)
+
+# lit 패스 품질 목표 모드: 케이스마다 보정 뷰 하나를 고샘플 기준 이미지와 비교해서 목표 오차(RMSE, 0~1)를 만족하는
+# 가장 싼 (샘플 수, 적응 샘플링 임계값)을 골라 그 케이스의 lit 패스 전체에 사용 (선택 결과는 output/case_meta에 기록)
+# (None: 고정 샘플 64 / 보정 렌더링은 LIT_QUALITY_RESOLUTION 해상도, 기준 이미지가 가장 비쌈)
+LIT_QUALITY_TARGET = None
+LIT_QUALITY_VIEW = None  # 보정 뷰 이름 (None: 첫 뷰, 배경이 적고 치아가 크게 보이는 뷰가 좋음)
+LIT_QUALITY_RESOLUTION = 256
+LIT_QUALITY_REFERENCE_SAMPLES = 1024
+LIT_QUALITY_CANDIDATES = [(8, 0.05), (16, 0.03), (32, 0.02), (64, 0.01), (128, 0.005)]  # 싼 것부터
+
+# Cycles 뷰 배치 모드: Cycles 패스(lit, curvature)에서 persistent data를 켜서 뷰 사이에 씬 동기화/BVH를 유지
+# (REUSE_CAMERA_RIG 필요: 뷰마다 카메라 변환만 바뀜 / 케이스 안에서 Cycles 패스를 마지막에 이어서 렌더링,
+#  GPU 메모리 정리는 Cycles 패스마다가 아니라 케이스가 끝날 때 한 번)
+CYCLES_PERSISTENT_DATA = False
+
+# 셰이더 워밍업: 머티리얼 생성 직후 활성화된 렌더링 타입마다 임시 메시를 작은 해상도로 한 번씩 렌더링
+# (EEVEE 셰이더 컴파일, Cycles 커널 로드를 첫 케이스의 첫 뷰 대신 실행 시작 시 한 번만 / 소요 시간은 따로 출력)
+WARMUP_SHADERS = True
+WARMUP_RESOLUTION = 32
+
+# 렌더 팜 워커 설정 (toothrendering_farm.py가 워커 실행 시 지정)
+CASE_LIST_FILE = None  # 케이스 폴더 이름 목록 파일 (한 줄에 하나): 지정하면 폴더 탐색/케이스 인덱스 대신 이 목록만 렌더링
+ERROR_LOG_PATH = None  # None: output/error_log.txt
+RUN_SUMMARY_PATH = None  # 실행 요약 JSON 저장 경로 (None: 저장 안 함)
+
+# 렌더링 완료 저널 (toothrendering_journal.py): 뷰마다 저장한 출력 파일의 크기/체크섬을 fsync로 기록
+# 기본값으로 항상 기록해서 중단된 실행을 나중에 --resume으로 이어서 렌더링할 수 있게 함
+# ("auto": output/render_journal.jsonl, 저널 파일 경로, 또는 None: 기록 안 함)
+RENDER_JOURNAL_PATH = "auto"
+# 이어서 렌더링: 저널에 완료로 기록되고 파일이 그대로 남아 있는 (케이스, 렌더링 타입, 뷰)는 건너뜀
+# (RENDER_JOURNAL_PATH가 None이어도 "auto" 저널을 읽음, 없어지거나 잘린 파일은 다시 렌더링)
+RESUME = False
+RESUME_VERIFY_CHECKSUM = False  # True: 크기뿐 아니라 체크섬까지 확인 (완료된 출력 파일을 모두 다시 읽음)
+
+# 공유 파일시스템 작업 큐 (toothrendering_queue.py): 여러 노드가 같은 입력 폴더의 케이스를 lease로 나눠 렌더링
+# 고정된 START_CASE~MAX_CASES 순서 대신 큐에서 다음 케이스를 가져옴 (모든 노드가 같은 케이스 범위 설정 사용)
+# (None: 사용 안 함, "auto": output/queue, 또는 큐 폴더 경로 / PREFETCH_CASES는 사용하지 않음)
+WORK_QUEUE_DIR = None
+
+# 렌더링 비용 모델 (toothrendering_costmodel.py): (렌더링 타입, 엔진)별 뷰당 시간을 면 수 기준으로 학습해서 실행마다 누적
+# ETA, 작업 큐 순서(오래 걸리는 케이스부터), --plan 예측(전체 시간/디스크 사용량)에 사용
+# (None: 사용 안 함, "auto": output/cost_model.json, 또는 파일 경로)
+COST_MODEL_PATH = "auto"
+
+# 마감 모드: 배치가 목표 시각까지 끝나도록 케이스를 시작할 때마다 남은 케이스의 예상 시간(비용 모델 × 실제 경과/렌더링 시간 비율)으로
+# lit 샘플 수와 건너뛸 선택 렌더링 타입을 다시 계획 (샘플 수를 DEADLINE_SAMPLE_LEVELS 순서로 먼저 줄이고, 최저 샘플 수로도
+# 모자라면 DEADLINE_OPTIONAL_PASSES 순서로 렌더링 타입을 뺌 / 케이스별 실제 렌더링 설정은 output/case_meta에 기록)
+# (None: 사용 안 함, "YYYY-MM-DD HH:MM" 현지 시각 또는 실행 시작부터의 초 / 비용 모델 필요)
+DEADLINE = None
+DEADLINE_SAMPLE_LEVELS = [64, 48, 32, 16, 8]  # lit 샘플 수 단계 (첫 값이 기본 품질)
+DEADLINE_OPTIONAL_PASSES = ['curvature', 'matt', 'position']  # 시간이 모자랄 때 빼는 순서 (나머지 타입은 항상 렌더링)
+DEADLINE_MARGIN = 0.05  # 예측 오차 여유 (남은 시간의 이 비율은 계획에 쓰지 않음)
+
+# 다음 케이스의 OBJ/라벨을 현재 케이스 렌더링 중에 백그라운드 스레드에서 미리 읽기
+# (0: 사용 안 함, N: 최대 N 케이스까지 미리 읽음 / 메시 캐시 또는 NumPy 파서 사용, OBJ_LOADER 설정은 사용하지 않음)
+PREFETCH_CASES = 0
+
+def _open_progress_console():
+    """Windows에서 별도 콘솔창 띄우기 (UI에서 오퍼레이터를 등록할 때만)"""
+    if sys.platform != "win32" or bpy.app.background:
+        return
     try:
         import ctypes
 
@@ -73,14 +252,14 @@ if sys.platform == "win32":
         pass
 
 
-class OT_SelectFolderAndColorize(bpy.types.Operator):
-    bl_idname = "object.select_folder_and_colorize"
-    bl_label = "Select Folder and Apply Gingiva/Tooth Materials (Optimized)"
-    bl_options = {"REGISTER", "UNDO"}
+class RenderPipeline:
+    """케이스 폴더 일괄 렌더링 (UI 오퍼레이터와 커맨드라인 실행이 같은 코드 사용, 설정은 모듈 전역 변수)"""
 
-    folder_path: bpy.props.StringProperty(name="folder", subtype="DIR_PATH")
+    def __init__(self, folder_path, report=None):
+        self.folder_path = folder_path
+        self._report = report  # 오퍼레이터의 self.report (없으면 print)
 
-    def execute(self, context):
+    def run(self):
 
         # === 씬 정리 ===
         bpy.ops.object.select_all(action="SELECT")
@@ -102,7 +281,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         if not selected_parent or selected_parent == selected_root:
             selected_parent = selected_root
         output_base = os.path.join(selected_parent, "output")
-        lit_dir = os.path.join(output_base, "lit")
+        lit_dir = os.path.join(output_base, LIT_OUTPUT_DIRNAME)
         unlit_dir = os.path.join(output_base, "unlit")
         matt_dir = os.path.join(output_base, "matt")
         depth_dir = os.path.join(output_base, "depth")
@@ -117,6 +296,41 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         os.makedirs(curvature_dir, exist_ok=True)
         os.makedirs(position_dir, exist_ok=True)
 
+        # 렌더링 완료 저널 (이어서 렌더링할 때 완료된 뷰 판별)
+        self.journal = None
+        self.output_pass = None  # 현재 렌더링 중인 (file_prefix, 렌더링 타입): 저장한 출력 파일 기록용
+        self.pending_views = None  # 현재 렌더링 타입에서 렌더링할 뷰 이름 (None: 모든 뷰)
+        journal_path = RENDER_JOURNAL_PATH or ("auto" if RESUME else None)
+        if journal_path:
+            if journal_path == "auto":
+                journal_path = default_journal_path(output_base)
+            self.journal = RenderJournal(journal_path, RESUME_VERIFY_CHECKSUM)
+            print(f"Render journal: {journal_path} ({len(self.journal.entries)} views recorded"
+                  f"{', resume' if RESUME else ''})")
+
+        # 케이스 전환(REUSE_MESH_OBJECT) 시간 기록
+        self.mesh_switch_times = []
+
+        # 결합 지오메트리 패스에서 File Output 노드가 저장하는 패스 이미지 [(출력 폴더, file_prefix, 확장자)]
+        self.file_outputs = []
+
+        # 렌더 엔진 전환 횟수/비용 (전환 직후 첫 뷰의 추가 렌더 시간 + Cycles 후 GPU 정리 시간)
+        self.engine_switch_count = 0
+        self.engine_switch_seconds = 0.0
+
+        # 메시 캐시 (캐시에 없는 케이스는 OBJ 임포트 후 캐시에 기록)
+        self.mesh_cache = None
+        if USE_MESH_CACHE:
+            cache_dir = MESH_CACHE_DIR or default_mesh_cache_dir(self.folder_path)
+            self.mesh_cache = MeshCache(cache_dir, MESH_CACHE_BAKE_TRANSFORM)
+            print(f"Mesh cache: {cache_dir}")
+
+        # LOD 메시 캐시 (PASS_GEOMETRY에 "lod"가 있을 때만, 메시 캐시를 사용하지 않으면 기본 캐시 폴더 사용)
+        self.lod_cache = None
+        self.lod_report = []
+        if "lod" in PASS_GEOMETRY.values():
+            self.lod_cache = self.mesh_cache or MeshCache(default_mesh_cache_dir(self.folder_path))
+
         # === 렌더 엔진 및 해상도 설정 ===
         scene = bpy.context.scene
         scene.render.resolution_x = 512
@@ -137,341 +351,282 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         scene.cycles.caustics_reflective = False  # 카우스틱 비활성화로 메모리 절약
         scene.cycles.caustics_refractive = False  # 카우스틱 비활성화로 메모리 절약
 
-        # === 카메라 포즈 정의 ===
-        target = mathutils.Vector((0, 100, 0))
-        distance = 100
-
-        if Sequence == 1:
-            # Sequence 1 모드: 8×5=40개 카메라 각도 생성
-            # 기본 벡터 (0, -1, -1)을 기준으로
-            # 1. X축 중심으로 -20, -10, 0, 10, 20도 회전 (각도 단위)
-            # 2. Y축 중심으로 0, 45, 90, 135, 180, 225, 270, 315도 회전 (각도 단위)
-            camera_positions = []
-            x_angles = [0, 45, 90, 135, 180, 225, 270, 315]  # Y축 중심 회전 (도)
-            z_angle_offsets = [-20, -10, 0, 10, 20]  # X축 중심 회전 (도)
-            
-            # 기본 벡터 (0, -1, -1)
-            base_vec = mathutils.Vector((0, -1, 0))
-            
-            for z_idx, x_angle_offset in enumerate(z_angle_offsets):
-                # 먼저 X축 중심으로 회전
-                if x_angle_offset == 0:
-                    vec_after_x = base_vec
-                else:
-                    x_rotation_rad = math.radians(x_angle_offset)
-                    x_rotation_matrix = mathutils.Matrix.Rotation(x_rotation_rad, 3, 'X')
-                    vec_after_x = x_rotation_matrix @ base_vec
-                
-                # 그 다음 Y축 중심으로 8번 회전 (0, 45, 90, ... 315도)
-                for x_idx, y_angle in enumerate(x_angles):
-                    if y_angle == 0:
-                        rotated_vec = vec_after_x
-                    else:
-                        y_rotation_rad = math.radians(y_angle)
-                        y_rotation_matrix = mathutils.Matrix.Rotation(y_rotation_rad, 3, 'Z')
-                        rotated_vec = y_rotation_matrix @ vec_after_x
-                    
-                    # 정규화
-                    rotated_vec = rotated_vec.normalized()
-                    cam_pos = target + rotated_vec * distance
-                    
-                    # 파일명 생성
-                    name = f"z_{x_idx:02d}_x{x_angle_offset:+03d}"
-                    camera_positions.append((name, cam_pos))
-        elif Sequence == 2:
-            # Sequence 2 모드: 6개 카메라 각도
-            # Elevation(고도): [0°, 0°, 0°, 0°, 89.99°, -89.99°]
-            # Azimuth(방위각): [-90°, 0°, 90°, 180°, 90°, 90°]
-
-            # 직접 벡터로 계산 (Sequence 0 방식과 동일)
-            # 기본: (0, -1, 0) = 정면
-            # X 좌표: 좌(-)/우(+), Y 좌표: 앞(-)/뒤(+), Z 좌표: 아래(-)/위(+)
-
-            camera_configs = [
-                # Elevation 0°, Azimuth -90° → 왼쪽 (left)
-                ("view_0", mathutils.Vector((-1, 0, 0))),
-
-                # Elevation 0°, Azimuth 0° → 정면 (front)
-                ("view_1", mathutils.Vector((0, -1, 0))),
-
-                # Elevation 0°, Azimuth 90° → 오른쪽 (right)
-                ("view_2", mathutils.Vector((1, 0, 0))),
-
-                # Elevation 0°, Azimuth 180° → 뒤 (back)
-                ("view_3", mathutils.Vector((0, 1, 0))),
-
-                # Elevation 89.99°, Azimuth 90° → 위 (top)
-                ("view_4", mathutils.Vector((0, 0, 1))),
-
-                # Elevation -89.99°, Azimuth 90° → 아래 (bottom)
-                ("view_5", mathutils.Vector((0, 0, -1))),
-            ]
-
-            camera_positions = []
-            for name, view_dir in camera_configs:
-                view_dir = view_dir.normalized()
-                cam_pos = target + view_dir * distance
-                camera_positions.append((name, cam_pos))
-        elif Sequence == 3:
-            # Sequence 3 모드: 11×4=44개 카메라 각도
-            # 방위각(Azimuth): 15도 간격으로 11개 (-75, -60, -45, -30, -15, 0, 15, 30, 45, 60, 75)
-            # 고도(Elevation): 4개 (-15, 0, 15, 30)
-            camera_positions = []
-
-            # 기본 벡터 (0, -1, 0) - 정면
-            base_vec = mathutils.Vector((0, -1, 0))
-
-            azimuths = [-75, -60, -45, -30, -15, 0, 15, 30, 45, 60, 75]  # 방위각 (Z축 회전, 좌우)
-            elevations = [-15, 0, 15, 30]  # 고도 (X축 회전, 상하)
-
-            for elev_idx, elevation in enumerate(elevations):
-                # 먼저 Elevation 회전 (X축 중심) - 상하 각도
-                if elevation == 0:
-                    vec_after_elevation = base_vec
-                else:
-                    elevation_rotation = mathutils.Matrix.Rotation(math.radians(elevation), 3, 'X')
-                    vec_after_elevation = elevation_rotation @ base_vec
-
-                # 그 다음 Azimuth 회전 (Z축 중심) - 좌우 각도
-                for azim_idx, azimuth in enumerate(azimuths):
-                    if azimuth == 0:
-                        rotated_vec = vec_after_elevation
-                    else:
-                        azimuth_rotation = mathutils.Matrix.Rotation(math.radians(azimuth), 3, 'Z')
-                        rotated_vec = azimuth_rotation @ vec_after_elevation
-
-                    # 정규화
-                    rotated_vec = rotated_vec.normalized()
-                    cam_pos = target + rotated_vec * distance
-
-                    # 파일명 생성
-                    name = f"elev{elevation:+03d}_azim{azimuth:+03d}"
-                    camera_positions.append((name, cam_pos))
-
-        elif Sequence == 4:
-            # Sequence 4 모드: 54개 카메라 각도 (5개 ring)
-            camera_positions = []
-
-            # 기본 벡터 (0, -1, 0) - 정면
-            base_vec = mathutils.Vector((0, -1, 0))
-
-            # Ring 1: elevation +30°, azimuth 360° (12개, 30° 간격)
-            elevation1 = 30
-            azimuths1 = [i * 30 for i in range(12)]  # 0°, 30°, 60°, ..., 330°
-
-            ring1_count = 0
-            for azimuth in azimuths1:
-                # Elevation 회전 (X축 중심)
-                elevation_rotation = mathutils.Matrix.Rotation(math.radians(elevation1), 3, 'X')
-                vec_after_elevation = elevation_rotation @ base_vec
-
-                # Azimuth 회전 (Z축 중심)
-                azimuth_rotation = mathutils.Matrix.Rotation(math.radians(azimuth), 3, 'Z')
-                rotated_vec = azimuth_rotation @ vec_after_elevation
-
-                # 정규화
-                rotated_vec = rotated_vec.normalized()
-                cam_pos = target + rotated_vec * distance
-                ring1_count += 1
-                camera_positions.append((f"ring1_{ring1_count:05d}", cam_pos))
-
-            # Ring 2: elevation 0°, azimuth 360° (18개, 20° 간격)
-            elevation2 = 0
-            azimuths2 = [i * 20 for i in range(18)]  # 0°, 20°, 40°, ..., 340°
-
-            ring2_count = 0
-            for azimuth in azimuths2:
-                # Elevation 회전 (0°이므로 생략)
-                vec_after_elevation = base_vec
-
-                # Azimuth 회전 (Z축 중심)
-                azimuth_rotation = mathutils.Matrix.Rotation(math.radians(azimuth), 3, 'Z')
-                rotated_vec = azimuth_rotation @ vec_after_elevation
-
-                # 정규화
-                rotated_vec = rotated_vec.normalized()
-                cam_pos = target + rotated_vec * distance
-                ring2_count += 1
-                camera_positions.append((f"ring2_{ring2_count:05d}", cam_pos))
-
-            # Ring 3: elevation -30°, azimuth 360° (12개, 30° 간격)
-            elevation3 = -30
-            azimuths3 = [i * 30 for i in range(12)]  # 0°, 30°, 60°, ..., 330°
-
-            ring3_count = 0
-            for azimuth in azimuths3:
-                # Elevation 회전 (X축 중심)
-                elevation_rotation = mathutils.Matrix.Rotation(math.radians(elevation3), 3, 'X')
-                vec_after_elevation = elevation_rotation @ base_vec
-
-                # Azimuth 회전 (Z축 중심)
-                azimuth_rotation = mathutils.Matrix.Rotation(math.radians(azimuth), 3, 'Z')
-                rotated_vec = azimuth_rotation @ vec_after_elevation
-
-                # 정규화
-                rotated_vec = rotated_vec.normalized()
-                cam_pos = target + rotated_vec * distance
-                ring3_count += 1
-                camera_positions.append((f"ring3_{ring3_count:05d}", cam_pos))
-
-            # Ring 4: elevation +60° to -60° (10개, 12° 간격), azimuth 0° (정면)
-            azimuth4 = 0
-            elevations4 = [60 - i * 12 for i in range(10)]  # 60°, 48°, 36°, ..., -60°
-
-            ring4_count = 0
-            for elevation in elevations4:
-                # Elevation 회전 (X축 중심)
-                elevation_rotation = mathutils.Matrix.Rotation(math.radians(elevation), 3, 'X')
-                vec_after_elevation = elevation_rotation @ base_vec
-
-                # Azimuth 회전 (Z축 중심)
-                azimuth_rotation = mathutils.Matrix.Rotation(math.radians(azimuth4), 3, 'Z')
-                rotated_vec = azimuth_rotation @ vec_after_elevation
-
-                # 정규화
-                rotated_vec = rotated_vec.normalized()
-                cam_pos = target + rotated_vec * distance
-                ring4_count += 1
-                camera_positions.append((f"ring4_{ring4_count:05d}", cam_pos))
-
-            # Ring 5: elevation +90°, -90° (2개), azimuth 90°
-            azimuth5 = 90
-            elevations5 = [90, -90]
-
-            ring5_count = 0
-            for elevation in elevations5:
-                # Elevation 회전 (X축 중심)
-                elevation_rotation = mathutils.Matrix.Rotation(math.radians(elevation), 3, 'X')
-                vec_after_elevation = elevation_rotation @ base_vec
-
-                # Azimuth 회전 (Z축 중심)
-                azimuth_rotation = mathutils.Matrix.Rotation(math.radians(azimuth5), 3, 'Z')
-                rotated_vec = azimuth_rotation @ vec_after_elevation
-
-                # 정규화
-                rotated_vec = rotated_vec.normalized()
-                cam_pos = target + rotated_vec * distance
-                ring5_count += 1
-                camera_positions.append((f"ring5_{ring5_count:05d}", cam_pos))
-        else:  # Sequence == 0
-            # 기존 모드: 10개 카메라 각도 사용
-            camera_configs = [
-                ("front", mathutils.Vector((0, -1, 0))),
-                ("top", mathutils.Vector((0, -1, 1))),
-                ("bottom", mathutils.Vector((0, -1, -1))),
-                ("right", mathutils.Vector((1, -1, 0))),
-                ("left", mathutils.Vector((-1, -1, 0))),
-                ("front_top_right", mathutils.Vector((1, -1, 1))),
-                ("front_top_left", mathutils.Vector((-1, -1, 1))),
-                ("front_bottom_right", mathutils.Vector((1, -1, -1))),
-                ("front_bottom_left", mathutils.Vector((-1, -1, -1))),
-                ("front_slightly_up", mathutils.Vector((0, -1, 0.5))),
-            ]
-            camera_positions = []
-            for name, view_dir in camera_configs:
-                view_dir = view_dir.normalized()
-                cam_pos = target + view_dir * distance
-                camera_positions.append((name, cam_pos))
-
-        # === 카메라 파라미터 추출 (Sequence == 1 또는 2 모드일 때) ===
-        self._extract_camera_parameters(scene, camera_positions, target, output_base)
+        # 장치/스레드/타일: 자동 튜닝 결과, GPU가 없는 노드는 CPU
+        if CYCLES_AUTO_TUNE:
+            tuning_path = default_tuning_path(output_base) if CYCLES_TUNING_PATH == "auto" else CYCLES_TUNING_PATH
+            apply_cycles_settings(scene, auto_tune(tuning_path, CYCLES_RETUNE))
+        elif not available_gpu_backends():
+            apply_cycles_settings(scene, CPU_SETTINGS)
+            print(f"No Cycles GPU device found: {format_settings(CPU_SETTINGS)}")
+        if LIT_PROFILE not in LIT_PROFILES:
+            raise ValueError(f"알 수 없는 lit 프로파일: {LIT_PROFILE} ({', '.join(LIT_PROFILES)})")
+        if LIT_PROFILES[LIT_PROFILE]:
+            print(f"Lit profile: {LIT_PROFILE} ({', '.join(f'{k}={v}' for k, v in LIT_PROFILES[LIT_PROFILE].items())})")
+
+        # === 카메라 포즈 정의 (toothrendering_rigs.py의 rig 정의) ===
+        self.camera_rig = get_rig(CAMERA_RIG) if CAMERA_RIG else sequence_rig(Sequence)
+        target = self.camera_rig.target_vector()
+        camera_positions = self.camera_rig.camera_positions()
+        print(f"Camera rig: {self.camera_rig.name} - {self.camera_rig.description}")
+
+        # === 카메라 파라미터 추출 ===
+        camera_views = self._extract_camera_parameters(scene, camera_positions, target, output_base)
+
+        # 뷰별 카메라 월드 행렬 (REUSE_CAMERA_RIG에서 카메라 rig 위치 지정에 사용)
+        self.view_poses = {view['view_name']: mathutils.Matrix(view['extrinsic']['T_cw']) for view in camera_views}
+        self.camera_rig_ready = False  # 이번 실행에서 카메라 rig 키프레임을 정리/기록했는지 (_ensure_camera_rig)
+        self.animation_frames = []
 
         # === 머티리얼 생성 ===
         materials = self._create_materials()
 
-        # === 하위 폴더(케이스) 자동 순회 ===
-        parent_folder = os.path.basename(os.path.normpath(self.folder_path))
-        all_case_folders = [
-            f
-            for f in sorted(os.listdir(self.folder_path), reverse=Reverses)
-            if os.path.isdir(os.path.join(self.folder_path, f))
-        ]
-        
-        # 시작 케이스부터 최대 케이스까지 선택
-        start_idx = START_CASE - 1  # 0-based 인덱스로 변환
-        end_idx = min(MAX_CASES, len(all_case_folders))
-        case_folders = all_case_folders[start_idx:end_idx]
+        # Cycles 렌더링 상태 메시지로 뷰마다 첫 샘플 시작 시각 기록 (씬 동기화 + BVH 시간 측정)
+        self.first_sample_time = None
+
+        def on_render_stats(stats):
+            if self.first_sample_time is None and "Sample" in stats:
+                self.first_sample_time = time.time()
 
-        total = len(case_folders)
-        total_all = len(all_case_folders)
+        bpy.app.handlers.render_stats.append(on_render_stats)
+        prefetcher = None
+        self.work_queue = None
+        try:
+            # === 셰이더 워밍업 (타이밍 루프 밖에서 한 번) ===
+            self.warmup_times = {}
+            if WARMUP_SHADERS and not EXPORT_LIT:
+                self.warmup_times = self._warm_up_passes(scene, materials, camera_positions, target, output_base)
+
+            # === 하위 폴더(케이스) 자동 순회 ===
+            parent_folder = os.path.basename(os.path.normpath(self.folder_path))
+            self.parent_folder = parent_folder
+            self.case_index = self._load_case_index()
+            all_case_folders, case_folders, broken_cases = self._select_cases()
+
+            total = len(case_folders)
+            total_all = len(all_case_folders)
         
-        # 활성화된 렌더링 타입 수 계산
-        active_render_types = sum([
-            RENDER_LIT, RENDER_UNLIT, RENDER_MATT,
-            RENDER_DEPTH, RENDER_NORMAL, RENDER_CURVATURE, RENDER_POSITION
-        ])
-
-        start_time = time.time()
-        print(f"=== OPTIMIZED RENDERING MODE ===")
-        print(f"Total cases in folder: {total_all}")
-        print(f"Processing cases: {START_CASE} to {MAX_CASES} ({total} cases)")
-        print(f"Active render types: {active_render_types}")
-
-        # 전체 렌더링 통계 계산
-        if Sequence == 1:
-            camera_count = 40
-        elif Sequence == 2:
-            camera_count = 6
-        elif Sequence == 3:
-            camera_count = 44
-        elif Sequence == 4:
-            camera_count = 54
-        else:  # Sequence == 0
-            camera_count = 10
-        total_renders_all_models = total * active_render_types * camera_count
-        completed_renders_all = 0
-
-        # 에러 로그 파일 생성
-        error_log_path = os.path.join(output_base, "error_log.txt")
-        error_count = 0
-
-        for idx, selected_folder in enumerate(case_folders, START_CASE):
-            case_start_time = time.time()
-            print(f"\n[{idx}/{MAX_CASES}] Processing: {selected_folder}")
-            case_path = os.path.join(self.folder_path, selected_folder)
-            if not os.path.isdir(case_path):
-                continue
+            # 활성화된 렌더링 타입 수 계산
+            active_render_types = sum([
+                RENDER_LIT, RENDER_UNLIT, RENDER_MATT,
+                RENDER_DEPTH, RENDER_NORMAL, RENDER_CURVATURE, RENDER_POSITION
+            ])
+
+            start_time = time.time()
+            print(f"=== OPTIMIZED RENDERING MODE ===")
+            print(f"Total cases in folder: {total_all}")
+            print(f"Processing cases: {START_CASE} to {MAX_CASES} ({total} cases)")
+            print(f"Active render types: {active_render_types}")
+
+            # 전체 렌더링 통계 계산
+            camera_count = len(camera_positions)
+            total_renders_all_models = total * active_render_types * camera_count
+            completed_renders_all = 0
+
+            # 비용 모델로 케이스/렌더링 타입별 예상 시간 계산 (ETA, 작업 큐 순서)
+            cost_model_path = self._cost_model_path(output_base)
+            self.cost_model = CostModel(cost_model_path) if cost_model_path else None
+            plan = self._plan_cases(self.cost_model or CostModel(), output_base, materials, case_folders, camera_count)
+            print(f"Predicted: {self._format_time(plan['seconds'])}, {format_bytes(plan['bytes'])}"
+                  f"{f' (cost model: {cost_model_path})' if cost_model_path else ''}")
+
+            # 마감 모드 (케이스를 시작할 때마다 _plan_deadline으로 다시 계획)
+            self.deadline = None
+            self.deadline_samples = None  # lit 패스 샘플 수 (None: 씬 설정 그대로)
+            self.deadline_dropped = set()  # 건너뛸 렌더링 타입
+            self.render_seconds = 0.0  # 실제 렌더링 시간 합 (경과 시간 대비 비율로 예측 보정)
+            self.base_cycles_samples = scene.cycles.samples
+            if DEADLINE is not None:
+                self.deadline = parse_deadline(DEADLINE, start_time)
+                if self.cost_model is None:
+                    self.cost_model = CostModel()  # 파일에 저장하지 않고 이번 실행의 관측만 사용
+                print(f"Deadline: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.deadline))} "
+                      f"({self._format_time(self.deadline - start_time)} from start)")
+
+            # 에러 로그 파일 생성
+            error_log_path = ERROR_LOG_PATH or os.path.join(output_base, "error_log.txt")
+            error_count = 0
+            self.failed_cases = []
+
+            for case_name in broken_cases:
+                error_msg = "케이스 인덱스 검사 실패: " + "; ".join(self.case_index[case_name]["issues"])
+                print(f"  [SKIP] {case_name}: {error_msg}")
+                self._log_error(error_log_path, all_case_folders.index(case_name) + 1, case_name, error_msg, None)
+                error_count += 1
 
-            try:
-                # OBJ/JSON 파일 찾기
-                obj_file, json_file = self._find_obj_json_files(case_path)
-                if not obj_file or not json_file:
-                    error_msg = f"OBJ 또는 JSON 파일을 찾을 수 없습니다."
-                    print(f"  [ERROR] {selected_folder}: {error_msg}")
-                    self._log_error(error_log_path, idx, selected_folder, error_msg, None)
-                    error_count += 1
+            # 작업 큐: 다른 노드와 케이스를 lease로 나눠 가져감
+            self.queue_deferred = set()  # 엔진 우선 블록에 올라가 블록 렌더링 후에 완료 처리할 케이스
+            if WORK_QUEUE_DIR:
+                queue_dir = default_queue_dir(output_base) if WORK_QUEUE_DIR == "auto" else WORK_QUEUE_DIR
+                # 오래 걸릴 것으로 예상되는 케이스부터 (마지막에 큰 케이스 하나만 남아 다른 노드가 노는 시간을 줄임)
+                queue_order = sorted(case_folders, key=lambda f: -plan['case_seconds'][f])
+                self.work_queue = WorkQueue(queue_dir, queue_order)
+                print(f"Work queue: {queue_dir} (owner {self.work_queue.owner}, "
+                      f"{self.work_queue.remaining()}/{total} cases remaining)")
+
+            # 백그라운드 프리페치 (현재 케이스 렌더링 중 다음 케이스 파일 읽기/파싱)
+            if PREFETCH_CASES > 0 and self.work_queue is None:
+                prefetcher = CasePrefetcher(case_folders, self._prefetch_case, PREFETCH_CASES)
+                prefetched_cases = iter(prefetcher)
+                prefetch_load_time = 0.0
+                prefetch_wait_time = 0.0
+
+            # 엔진 우선 스케줄 블록 ([(idx, 케이스 폴더명, file_prefix, mesh, obj, lod_mesh, 마감 모드 계획)])
+            engine_major = ENGINE_MAJOR_BLOCK > 1 and not EXPORT_LIT
+            block = []
+            if engine_major:
+                print(f"Engine-major schedule: blocks of up to {ENGINE_MAJOR_BLOCK} cases / {ENGINE_MAJOR_MAX_FACES} faces")
+
+            if self.work_queue:
+                case_iter = self._queue_cases({f: i for i, f in enumerate(case_folders, START_CASE)})
+            else:
+                case_iter = enumerate(case_folders, START_CASE)
+            for idx, selected_folder in case_iter:
+                case_start_time = time.time()
+                print(f"\n[{idx}/{MAX_CASES}] Processing: {selected_folder}")
+                case_path = os.path.join(self.folder_path, selected_folder)
+                prefetched = next(prefetched_cases) if prefetcher else None
+                if not os.path.isdir(case_path):
                     continue
 
-                # 메시 로드 및 설정
-                mesh, obj = self._load_and_setup_mesh(obj_file, json_file, materials)
+                # 이어서 렌더링: 모든 렌더링 타입/뷰가 저널에 완료로 기록된 케이스는 메시도 읽지 않고 건너뜀
                 file_prefix = f"{parent_folder}_{selected_folder}"
+                if RESUME and not EXPORT_LIT:
+                    case_configs = self._render_configs(output_base, materials)
+                    if all(not self._pending_views(file_prefix, config) for config in case_configs):
+                        completed_renders_all += camera_count * sum(self._config_outputs(c) for c in case_configs)
+                        self._drop_case_plan(file_prefix)
+                        print(f"  Already complete in journal, skipping")
+                        continue
+
+                if self.deadline is not None:
+                    self._plan_deadline(selected_folder, case_folders, output_base, materials, camera_count, start_time)
+
+                try:
+                    # OBJ/JSON 파일 찾기 (프리페치 사용 시 백그라운드에서 읽은 메시 배열 사용)
+                    arrays = None
+                    if prefetched:
+                        prefetch_load_time += prefetched.load_seconds
+                        prefetch_wait_time += prefetched.wait_seconds
+                        print(f"  Prefetch: load {prefetched.load_seconds:.2f}s, waited {prefetched.wait_seconds:.2f}s "
+                              f"(hidden {prefetched.hidden_seconds:.2f}s)")
+                        if prefetched.error is not None:
+                            raise prefetched.error
+                        obj_file, json_file, arrays = prefetched.result
+                    else:
+                        obj_file, json_file = self._find_obj_json_files(case_path)
+                    if not obj_file or not json_file:
+                        error_msg = f"OBJ 또는 JSON 파일을 찾을 수 없습니다."
+                        print(f"  [ERROR] {selected_folder}: {error_msg}")
+                        self._log_error(error_log_path, idx, selected_folder, error_msg, None)
+                        error_count += 1
+                        continue
+
+                    # 메시 로드 및 설정
+                    if engine_major:
+                        mesh, obj = self._load_block_mesh(obj_file, json_file, materials, arrays)
+                    elif REUSE_MESH_OBJECT:
+                        mesh, obj = self._swap_persistent_mesh(obj_file, json_file, materials, arrays)
+                    else:
+                        mesh, obj = self._load_and_setup_mesh(obj_file, json_file, materials, arrays)
+                    if self.cost_model:
+                        self.cost_model.observe_faces(len(mesh.polygons))
+
+                    # 단순화 메시 (PASS_GEOMETRY에서 "lod"를 고른 렌더링 타입에 사용)
+                    lod_mesh = self._load_lod_mesh(obj_file, json_file, obj) if self.lod_cache else None
+
+                    # 엔진 우선 스케줄: 블록에 추가만 하고 렌더링은 블록 단위로
+                    if engine_major:
+                        # 마감 모드 계획은 케이스를 불러올 때 세운 것을 블록 렌더링에서 다시 적용 (case_meta 기록과 일치)
+                        block.append((idx, selected_folder, file_prefix, mesh, obj, lod_mesh,
+                                      (self.deadline_samples, set(self.deadline_dropped))))
+                        self.queue_deferred.add(selected_folder)
+                        print(f"  Loaded into block ({len(block)}/{ENGINE_MAJOR_BLOCK}) in {time.time() - case_start_time:.1f}s")
+
+                    # === 렌더링 타입 우선 방식 ===
+                    else:
+                        case_completed_renders = self._render_by_type_priority(scene, mesh, obj, materials, camera_positions,
+                                                    file_prefix, output_base, target, idx, total,
+                                                    active_render_types, start_time, completed_renders_all, total_renders_all_models,
+                                                    lod_mesh)
 
-                # === 렌더링 타입 우선 방식 ===
-                case_completed_renders = self._render_by_type_priority(scene, mesh, obj, materials, camera_positions,
-                                            file_prefix, output_base, target, idx, total,
-                                            active_render_types, start_time, completed_renders_all, total_renders_all_models)
+                        completed_renders_all += case_completed_renders
 
-                completed_renders_all += case_completed_renders
+                        # 케이스 완료 시간 출력
+                        case_time = time.time() - case_start_time
+                        print(f"  Case completed in {case_time:.1f}s")
 
-                # 케이스 완료 시간 출력
-                case_time = time.time() - case_start_time
-                print(f"  Case completed in {case_time:.1f}s")
+                except Exception as e:
+                    # 에러 발생 시 로그에 기록하고 다음 케이스로 진행
+                    import traceback
+                    error_msg = str(e)
+                    traceback_str = traceback.format_exc()
 
-            except Exception as e:
-                # 에러 발생 시 로그에 기록하고 다음 케이스로 진행
-                import traceback
-                error_msg = str(e)
-                traceback_str = traceback.format_exc()
+                    print(f"  [ERROR] {selected_folder}: {error_msg}")
+                    print(f"  Skipping to next case...")
 
-                print(f"  [ERROR] {selected_folder}: {error_msg}")
-                print(f"  Skipping to next case...")
+                    self._log_error(error_log_path, idx, selected_folder, error_msg, traceback_str)
+                    error_count += 1
+                    continue
 
-                self._log_error(error_log_path, idx, selected_folder, error_msg, traceback_str)
-                error_count += 1
-                continue
+                # 블록이 가득 차면 (케이스 수 또는 면 수) 블록 렌더링
+                if engine_major and (len(block) >= ENGINE_MAJOR_BLOCK or
+                                     sum(len(entry[3].polygons) for entry in block) >= ENGINE_MAJOR_MAX_FACES):
+                    block_completed, block_errors = self._render_block(
+                        scene, block, materials, camera_positions, output_base, target, total, active_render_types,
+                        start_time, completed_renders_all, total_renders_all_models, error_log_path)
+                    completed_renders_all += block_completed
+                    error_count += block_errors
+                    self._finish_queue_cases([entry[1] for entry in block])
+                    block = []
+
+            # 남은 블록 렌더링
+            if block:
+                block_completed, block_errors = self._render_block(
+                    scene, block, materials, camera_positions, output_base, target, total, active_render_types,
+                    start_time, completed_renders_all, total_renders_all_models, error_log_path)
+                completed_renders_all += block_completed
+                error_count += block_errors
+                self._finish_queue_cases([entry[1] for entry in block])
+        finally:
+            # 예외(KeyboardInterrupt 포함)로 끝나도 프리페치 스레드, lease heartbeat, 저널 파일, 렌더링 핸들러 정리
+            # (UI 세션에서 실행할 때마다 핸들러가 쌓이지 않도록)
+            if prefetcher:
+                prefetcher.close()
+            if self.work_queue:
+                self.work_queue.close()
+            if self.journal:
+                self.journal.close()
+            bpy.app.handlers.render_stats.remove(on_render_stats)
 
         total_time = time.time() - start_time
         print(f"\n렌더링 완료! 총 소요시간: {self._format_time(total_time)}")
+        if self.deadline is not None:
+            margin = self.deadline - time.time()
+            print(f"Deadline: {'met' if margin >= 0 else 'missed'} by {self._format_time(abs(margin))}")
+
+        # 프리페치로 숨겨진 로드 시간 통계
+        if prefetcher:
+            print(f"Prefetch: load {prefetch_load_time:.1f}s, waited {prefetch_wait_time:.1f}s "
+                  f"(hidden {max(0.0, prefetch_load_time - prefetch_wait_time):.1f}s)")
+
+        # 케이스 전환(지오메트리 교체) 비용 통계
+        if self.mesh_switch_times:
+            switch_times = self.mesh_switch_times
+            print(f"Mesh switch: {len(switch_times)} cases, avg {sum(switch_times) / len(switch_times):.2f}s, "
+                  f"max {max(switch_times):.2f}s")
+
+        # 셰이더 워밍업 통계 (위의 렌더링 시간/뷰당 시간에는 포함되지 않음)
+        if self.warmup_times:
+            print(f"Shader warm-up: {sum(self.warmup_times.values()):.1f}s "
+                  f"({', '.join(f'{t} {sec:.1f}s' for t, sec in self.warmup_times.items())})")
+
+        # 렌더 엔진 전환 통계
+        print(f"Engine switches: {self.engine_switch_count} "
+              f"(estimated overhead {self.engine_switch_seconds:.1f}s: first view after switch + GPU cleanup)")
+
+        # LOD 비교 결과
+        if self.lod_report:
+            self._write_lod_report(output_base)
 
         # 에러 통계 출력
         if error_count > 0:
@@ -480,9 +635,30 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         else:
             print(f"\n✓ 모든 케이스가 성공적으로 처리되었습니다!")
 
-        # 완료 메시지 및 파일 탐색기 열기
-        self._show_completion_message(output_base)
-        return {"FINISHED"}
+        # 실행 요약 (렌더 팜 코디네이터가 워커 결과를 합칠 때 사용)
+        if RUN_SUMMARY_PATH:
+            summary = {
+                'input_root': os.path.abspath(self.folder_path),
+                'cases': total,
+                'completed_renders': completed_renders_all,
+                'total_renders': total_renders_all_models,
+                'error_count': error_count,
+                'failed_cases': self.failed_cases,
+                'total_seconds': round(total_time, 1),
+                'engine_switches': self.engine_switch_count,
+                'warmup_seconds': round(sum(self.warmup_times.values()), 2),
+            }
+            if self.deadline is not None:
+                summary['deadline'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.deadline))
+                summary['deadline_met'] = time.time() <= self.deadline
+            os.makedirs(os.path.dirname(os.path.abspath(RUN_SUMMARY_PATH)), exist_ok=True)
+            with open(RUN_SUMMARY_PATH, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        # 완료 메시지 및 파일 탐색기 열기 (백그라운드 실행에서는 생략)
+        if not bpy.app.background:
+            self._show_completion_message(output_base)
+        return error_count
 
     def _create_materials(self):
         """모든 머티리얼을 미리 생성"""
@@ -812,32 +988,231 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         
         return materials
 
+    def _load_case_index(self):
+        """케이스 인덱스 로드 → {케이스 폴더명: 인덱스 행}, 사용하지 않으면 None"""
+        if not CASE_INDEX_PATH:
+            return None
+        index_path = default_case_index_path(self.folder_path) if CASE_INDEX_PATH == "auto" else CASE_INDEX_PATH
+        if not os.path.exists(index_path):
+            print(f"[WARNING] Case index not found, listing folders instead: {index_path}")
+            return None
+
+        index = load_case_index(index_path)
+        if os.path.normcase(index["input_root"]) != os.path.normcase(os.path.abspath(self.folder_path)):
+            print(f"[WARNING] Case index was built for {index['input_root']}, listing folders instead")
+            return None
+
+        print(f"Case index: {index_path} ({len(index['cases'])} cases, scanned {index['created']})")
+        return {row["case"]: row for row in index["cases"]}
+
+    def _select_cases(self):
+        """렌더링할 케이스 선택 → (전체 케이스 폴더명, 렌더링할 케이스 폴더명, 케이스 인덱스에서 error인 케이스)"""
+        if CASE_LIST_FILE:
+            # 렌더 팜 워커: 배정받은 케이스만
+            with open(CASE_LIST_FILE, encoding='utf-8') as f:
+                all_case_folders = [line.strip() for line in f if line.strip()]
+            if self.case_index is not None:
+                all_case_folders = [f for f in all_case_folders if f in self.case_index]
+        elif self.case_index is not None:
+            all_case_folders = sorted(self.case_index, reverse=Reverses)
+        else:
+            all_case_folders = list_case_folders(self.folder_path, Reverses)
+
+        # 시작 케이스부터 최대 케이스까지 선택
+        start_idx = START_CASE - 1  # 0-based 인덱스로 변환
+        end_idx = min(MAX_CASES, len(all_case_folders))
+        case_folders = all_case_folders[start_idx:end_idx]
+
+        # 케이스 인덱스에서 렌더링 불가(error)로 표시된 케이스는 미리 제외
+        broken_cases = [
+            f for f in case_folders
+            if self.case_index is not None and self.case_index[f]["status"] == STATUS_ERROR
+        ]
+        case_folders = [f for f in case_folders if f not in broken_cases]
+        return all_case_folders, case_folders, broken_cases
+
+    def _cost_model_path(self, output_base):
+        if not COST_MODEL_PATH:
+            return None
+        return default_cost_model_path(output_base) if COST_MODEL_PATH == "auto" else COST_MODEL_PATH
+
+    def _plan_cases(self, model, output_base, materials, case_folders, views):
+        """비용 모델로 배치 예측 (plan_batch 결과), ETA용 케이스/렌더링 타입별 뷰당 예상 시간도 준비
+
+        면 수는 케이스 인덱스에서 읽고 없으면 비용 모델의 평균 면 수 사용.
+        """
+        file_format = "optimized" if USE_OPTIMIZED_FORMATS else "png"
+        passes = [(config[0], config[2], file_format) for config in self._render_configs(output_base, materials)]
+        case_faces = {
+            f: self.case_index[f]["face_count"] if self.case_index is not None and f in self.case_index else None
+            for f in case_folders
+        }
+        plan = plan_batch(model, case_faces, passes, views)
+        self.case_faces = case_faces
+
+        # ETA: 남은 예상 시간 × (지금까지 실제 시간 / 지금까지 끝낸 예상 시간)
+        self.planned_view_seconds = {}
+        self.planned_case_seconds = {}
+        for f, faces in case_faces.items():
+            file_prefix = f"{self.parent_folder}_{f}"
+            self.planned_view_seconds[file_prefix] = {
+                render_type: model.predict_seconds(render_type, engine, faces or model.mean_faces())
+                for render_type, engine, _ in passes
+            }
+            self.planned_case_seconds[file_prefix] = plan['case_seconds'][f]
+        self.planned_remaining = plan['seconds']
+        self.planned_done = 0.0
+        return plan
+
+    def _plan_progress(self, file_prefix, render_type, views, rendered=True):
+        """예상 시간 진행 기록 (rendered=False: 이어서 렌더링으로 건너뛴 뷰, 실제 시간 대비 비율에는 넣지 않음)"""
+        seconds = self.planned_view_seconds.get(file_prefix, {}).get(render_type, 0.0) * views
+        seconds = min(seconds, self.planned_case_seconds.get(file_prefix, 0.0))
+        if file_prefix in self.planned_case_seconds:
+            self.planned_case_seconds[file_prefix] -= seconds
+        self.planned_remaining -= seconds
+        if rendered:
+            self.planned_done += seconds
+
+    def _drop_case_plan(self, file_prefix):
+        """케이스의 남은 예상 시간 제거 (에러, 이어서 렌더링으로 건너뜀, 다른 노드가 처리)"""
+        self.planned_remaining -= self.planned_case_seconds.pop(file_prefix, 0.0)
+
+    def _estimate_remaining(self, start_time):
+        """남은 예상 시간 (비용 모델 예측을 지금까지의 실제/예측 비율로 보정)"""
+        remaining = max(self.planned_remaining, 0.0)
+        if self.planned_done <= 0:
+            return remaining
+        return remaining * (time.time() - start_time) / self.planned_done
+
+    def _plan_deadline(self, case_name, case_folders, output_base, materials, views, start_time):
+        """마감 모드: 남은 케이스가 마감 전에 끝나도록 lit 샘플 수와 건너뛸 렌더링 타입 선택 (케이스를 시작할 때마다)
+
+        비용 모델 예측을 실제 경과 시간 / 렌더링 시간 비율(메시 로드, 저장 등)로 보정해서 남은 시간과 비교.
+        작업 큐에서는 다른 노드가 가져간 케이스를 빼고, 남은 케이스를 lease를 가진 노드 수로 나눔.
+        """
+        nodes = 1
+        if self.work_queue:
+            status = queue_status(self.work_queue.queue_dir, self.work_queue.lease_seconds)
+            others = [row for row in status['active'] if row['owner'] != self.work_queue.owner]
+            taken = self.work_queue.done_cases() | {row['case'] for row in others}
+            remaining = [f for f in case_folders if f in self.work_queue.held or f not in taken]
+            nodes += len({row['owner'] for row in others})
+        else:
+            remaining = case_folders[case_folders.index(case_name):]
+
+        model = self.cost_model
+        configs = self._render_configs(output_base, materials)
+        active = [config[0] for config in configs]
+        steps = deadline_steps(DEADLINE_SAMPLE_LEVELS if 'lit' in active else [None],
+                               [render_type for render_type in DEADLINE_OPTIONAL_PASSES if render_type in active])
+        faces = [self.case_faces.get(f) or model.mean_faces() for f in remaining]
+        overhead = (time.time() - start_time) / self.render_seconds if self.render_seconds > 0 else 1.0
+        profile_samples = LIT_PROFILES[LIT_PROFILE].get('samples', self.base_cycles_samples)
+
+        def predict(samples, dropped):
+            seconds = 0.0
+            for render_type, _, engine, *_ in configs:
+                if render_type in dropped:
+                    continue
+                for case_faces in faces:
+                    if render_type == 'lit':
+                        seconds += model.predict_samples_seconds(render_type, engine, case_faces,
+                                                                 min(samples, profile_samples),
+                                                                 self.base_cycles_samples)
+                    else:
+                        seconds += model.predict_seconds(render_type, engine, case_faces)
+            return seconds * views * overhead / nodes
+
+        time_left = self.deadline - time.time()
+        (samples, dropped), predicted, on_time = choose_deadline_step(
+            steps, predict, time_left * (1.0 - DEADLINE_MARGIN))
+        self.deadline_samples = samples
+        self.deadline_dropped = set(dropped)
+        print(f"  Deadline: {self._format_time(max(time_left, 0.0))} left, {len(remaining)} cases"
+              f"{f' / {nodes} nodes' if nodes > 1 else ''} ≈ {self._format_time(predicted)}"
+              f"{'' if on_time else ' (⚠️  cannot meet deadline)'} → lit {samples or '-'} samples"
+              f"{', skipping ' + ', '.join(dropped) if dropped else ''}")
+        self._update_case_metadata(output_base, f"{self.parent_folder}_{case_name}", 'deadline', {
+            'deadline': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.deadline)),
+            'seconds_left': round(time_left, 1),
+            'remaining_cases': len(remaining),
+            'nodes': nodes,
+            'predicted_seconds': round(predicted, 1),
+            'overhead_ratio': round(overhead, 3),
+            'on_schedule': on_time,
+            'lit_samples': samples,
+            'skipped_passes': list(dropped),
+        })
+
+    def plan(self):
+        """렌더링하지 않고 케이스 선택, 활성 렌더링 타입, 비용 모델로 전체 시간과 디스크 사용량 예측 (--plan)"""
+        output_base = default_output_dir(self.folder_path)
+        self.parent_folder = os.path.basename(os.path.normpath(self.folder_path))
+        self.case_index = self._load_case_index()
+        _, case_folders, broken_cases = self._select_cases()
+        camera_rig = get_rig(CAMERA_RIG) if CAMERA_RIG else sequence_rig(Sequence)
+        views = len(camera_rig.camera_positions())
+        cost_model_path = self._cost_model_path(output_base)
+        model = CostModel(cost_model_path)
+        plan = self._plan_cases(model, output_base, defaultdict(lambda: None), case_folders, views)
+
+        print(f"=== RENDER PLAN ===")
+        print(f"Cases: {len(case_folders)} (excluded as error in case index: {len(broken_cases)})")
+        print(f"Camera rig: {camera_rig.name} ({views} views)")
+        known_faces = sum(self.case_index is not None and f in self.case_index for f in case_folders)
+        print(f"Face counts: {known_faces}/{len(case_folders)} from case index, others {model.mean_faces():.0f} (mean)")
+        if cost_model_path is None or not os.path.exists(cost_model_path):
+            print(f"[WARNING] No cost model yet, using default per-view times")
+        for render_type, row in plan['passes'].items():
+            print(f"  {render_type}: {self._format_time(row['seconds'])}, {format_bytes(row['bytes'])}")
+        print(f"Total: {self._format_time(plan['seconds'])}, {format_bytes(plan['bytes'])}")
+        disk_root = output_base if os.path.exists(output_base) else os.path.dirname(output_base)
+        free = shutil.disk_usage(disk_root).free
+        print(f"Free disk: {format_bytes(free)}{'' if free > plan['bytes'] else '  ⚠️  not enough space'}")
+        return plan
+
     def _find_obj_json_files(self, case_path):
-        """OBJ와 JSON 파일을 찾아서 반환"""
-        obj_file = None
-        json_file = None
-        for f in os.listdir(case_path):
-            if f.endswith(".obj"):
-                obj_file = os.path.join(case_path, f)
-            elif f.endswith(".json"):
-                json_file = os.path.join(case_path, f)
-        return obj_file, json_file
-
-    def _load_and_setup_mesh(self, obj_file, json_file, materials):
-        """메시 로드 및 설정"""
-        # 씬 정리 (머티리얼 삭제 X)
+        """OBJ와 JSON 파일을 찾아서 반환 (케이스 인덱스가 있으면 인덱스의 경로 사용)"""
+        row = self.case_index.get(os.path.basename(case_path)) if self.case_index else None
+        if row and row["status"] != STATUS_ERROR:
+            if not is_row_stale(row):
+                return row["obj_file"], row["json_file"]
+            print(f"  [WARNING] Case files changed since the index scan, listing folder instead")
+        return find_obj_json_files(case_path)
+
+    def _load_and_setup_mesh(self, obj_file, json_file, materials, arrays=None):
+        """메시 로드 및 설정 (arrays: 프리페치된 메시 배열)"""
+        # 씬 정리 (머티리얼, 카메라 rig 삭제 X)
+        rig_objects = self._camera_rig_objects()
+        rig_data = [rig_obj.data for rig_obj in rig_objects]
         bpy.ops.object.select_all(action="SELECT")
+        for rig_obj in rig_objects:
+            rig_obj.select_set(False)
         bpy.ops.object.delete(use_global=False)
         for block in bpy.data.meshes:
             bpy.data.meshes.remove(block, do_unlink=True)
-        for block in bpy.data.lights:
-            bpy.data.lights.remove(block, do_unlink=True)
-        for block in bpy.data.cameras:
-            bpy.data.cameras.remove(block, do_unlink=True)
+        for block in list(bpy.data.lights):
+            if block not in rig_data:
+                bpy.data.lights.remove(block, do_unlink=True)
+        for block in list(bpy.data.cameras):
+            if block not in rig_data:
+                bpy.data.cameras.remove(block, do_unlink=True)
+
+        # 메시 캐시(또는 프리페치 결과)에서 로드 (OBJ 임포트, 변환, 라벨 처리 생략)
+        mesh_cache = getattr(self, "mesh_cache", None)
+        cached = arrays
+        if cached is None and mesh_cache:
+            cached = mesh_cache.load(obj_file, json_file)
+        if cached is not None:
+            obj = create_mesh_object(os.path.splitext(os.path.basename(obj_file))[0], cached)
+            mesh = obj.data
+            mesh.materials.append(materials['gum_unlit'])
+            mesh.materials.append(materials['tooth_unlit'])
+            return mesh, obj
 
         # OBJ 임포트
-        bpy.ops.wm.obj_import(filepath=obj_file)
-        obj = bpy.context.selected_objects[0]
+        obj = import_obj(obj_file, OBJ_LOADER)
         mesh = obj.data
 
         # 머티리얼 슬롯 항상 2개로 초기화
@@ -845,47 +1220,105 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         mesh.materials.append(materials['gum_unlit'])
         mesh.materials.append(materials['tooth_unlit'])
 
-        # 메시 변환: X축 -45도 회전 후 Z축 +70 이동
-        # 1. 먼저 X축 회전 (월드 기준)
-        obj.rotation_euler.x += math.radians(-45)
-        
-        # 2. 회전된 상태에서 Z축 위로 +70 이동
-        # 회전된 좌표계의 Z축 방향으로 이동
-        up_vector = mathutils.Vector((0, 29.29, 70))
-        obj.location += up_vector
-        
+        # 메시 변환: X축 -45도 회전 후 (0, 29.29, 70) 이동
+        apply_case_placement(obj)
+
         # material_index 할당 (잇몸: 0, 치아: 1)
-        with open(json_file) as f:
-            meta = json.load(f)
-        labels = meta["labels"]
-
-        # 버텍스 개수와 라벨 개수 불일치 처리
-        if len(labels) != len(mesh.vertices):
-            print(f"  [WARNING] Label/Vertex mismatch: labels={len(labels)} vs vertices={len(mesh.vertices)}")
-
-            if len(labels) < len(mesh.vertices):
-                # 라벨이 부족한 경우: 0으로 패딩
-                labels = labels + [0] * (len(mesh.vertices) - len(labels))
-                print(f"  [WARNING] Padded {len(mesh.vertices) - len(labels)} labels with 0")
-            else:
-                # 라벨이 너무 많은 경우: 초과분 자르기
-                excess = len(labels) - len(mesh.vertices)
-                labels = labels[:len(mesh.vertices)]
-                print(f"  [WARNING] Truncated {excess} excess labels")
-
-        for poly in mesh.polygons:
-            face_labels = [labels[v] for v in poly.vertices]
-            if all(l == 0 for l in face_labels):
-                poly.material_index = 0
-            elif all(l > 0 for l in face_labels):
-                poly.material_index = 1
-                
+        labels = load_labels(json_file, LABEL_CACHE_DIR, USE_LABEL_CACHE)
+
+        # 버텍스 개수와 라벨 개수 불일치 처리 (부족하면 0으로 패딩, 많으면 자르기)
+        labels = fit_labels_to_vertices(labels, len(mesh.vertices))
+
+        # 면별 라벨 판정 및 material_index 일괄 설정 (foreach_get/foreach_set)
+        assign_material_indices(mesh, labels)
+
+        # 다음 실행부터는 캐시에서 바로 로드
+        if mesh_cache:
+            bpy.context.view_layer.update()
+            self._store_mesh_cache(mesh_cache, obj_file, json_file,
+                                   extract_mesh_arrays(obj, labels, mesh_cache.bake_transform))
+
+        return mesh, obj
+
+    def _load_mesh_arrays(self, obj_file, json_file):
+        """메시 캐시 또는 NumPy 파서로 메시 배열 준비 (bpy를 사용하지 않음)"""
+        mesh_cache = getattr(self, "mesh_cache", None)
+        arrays = mesh_cache.load(obj_file, json_file) if mesh_cache else None
+        if arrays is None:
+            labels = load_labels(json_file, LABEL_CACHE_DIR, USE_LABEL_CACHE)
+            bake_transform = mesh_cache.bake_transform if mesh_cache else False
+            arrays = mesh_arrays_from_obj(obj_file, labels, bake_transform)
+            if mesh_cache:
+                self._store_mesh_cache(mesh_cache, obj_file, json_file, arrays)
+        return arrays
+
+    def _store_mesh_cache(self, cache, obj_file, json_file, arrays, variant=None):
+        """메시 캐시 기록 (캐시는 최적화일 뿐이므로 디스크 부족/읽기 전용 폴더 등으로 실패해도 경고만 하고 계속 렌더링)"""
+        try:
+            cache.store(obj_file, json_file, arrays, variant)
+        except OSError as e:
+            print(f"  [WARNING] Mesh cache write failed, continuing without cache: {e}")
+
+    def _prefetch_case(self, case_folder):
+        """프리페치 스레드에서 실행: 케이스 파일 찾기 + 메시 배열 준비 (bpy 사용 금지)"""
+        obj_file, json_file = self._find_obj_json_files(os.path.join(self.folder_path, case_folder))
+        if not obj_file or not json_file:
+            return obj_file, json_file, None
+        return obj_file, json_file, self._load_mesh_arrays(obj_file, json_file)
+
+    def _swap_persistent_mesh(self, obj_file, json_file, materials, arrays=None):
+        """유지 중인 jaw 오브젝트의 지오메트리만 교체 (오브젝트, 머티리얼 슬롯, 모디파이어 유지)"""
+        switch_start = time.time()
+        obj = bpy.data.objects.get(PERSISTENT_OBJECT_NAME)
+
+        # jaw와 카메라 rig 이외의 오브젝트와 데이터 정리
+        rig_objects = self._camera_rig_objects()
+        rig_data = [rig_obj.data for rig_obj in rig_objects]
+        for block in list(bpy.data.objects):
+            if block != obj and block not in rig_objects:
+                bpy.data.objects.remove(block, do_unlink=True)
+        for block in list(bpy.data.meshes):
+            if obj is None or block != obj.data:
+                bpy.data.meshes.remove(block, do_unlink=True)
+        for block in list(bpy.data.lights):
+            if block not in rig_data:
+                bpy.data.lights.remove(block, do_unlink=True)
+        for block in list(bpy.data.cameras):
+            if block not in rig_data:
+                bpy.data.cameras.remove(block, do_unlink=True)
+
+        if arrays is None:
+            arrays = self._load_mesh_arrays(obj_file, json_file)
+        load_time = time.time() - switch_start
+
+        if obj is None:
+            mesh = bpy.data.meshes.new(PERSISTENT_OBJECT_NAME)
+            obj = bpy.data.objects.new(PERSISTENT_OBJECT_NAME, mesh)
+            bpy.context.collection.objects.link(obj)
+            mesh.materials.append(materials['gum_unlit'])
+            mesh.materials.append(materials['tooth_unlit'])
+        else:
+            mesh = obj.data
+            mesh.clear_geometry()
+            mesh.materials[0] = materials['gum_unlit']
+            mesh.materials[1] = materials['tooth_unlit']
+
+        # 지오메트리 일괄 채우기
+        fill_mesh(mesh, arrays["vertices"], arrays["loop_start"], arrays["loop_vertices"])
+        apply_mesh_attributes(mesh, arrays)
+        obj.matrix_world = mathutils.Matrix(arrays["matrix_world"].tolist())
+
+        switch_time = time.time() - switch_start
+        self.mesh_switch_times.append(switch_time)
+        print(f"  Mesh switch: {switch_time:.2f}s (load {load_time:.2f}s, rebuild {switch_time - load_time:.2f}s, "
+              f"{len(mesh.polygons)} faces)")
         return mesh, obj
 
     def _render_by_type_priority(self, scene, mesh, obj, materials, camera_positions, 
                                file_prefix, output_base, target, idx, total, 
-                               active_render_types, start_time, completed_renders_all, total_renders_all_models):
-        """렌더링 타입 우선 방식으로 렌더링"""
+                               active_render_types, start_time, completed_renders_all, total_renders_all_models,
+                               lod_mesh=None, only_engine=None):
+        """렌더링 타입 우선 방식으로 렌더링 (lod_mesh: PASS_GEOMETRY가 "lod"인 타입에 사용할 단순화 메시)"""
         
         # 카메라 위치들 생성 (Sequence 모드 처리 포함)
         camera_data = self._generate_camera_positions(camera_positions, target)
@@ -921,31 +1354,25 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
             print(f"[{idx}/{MAX_CASES}] Completed: {file_prefix} (EXPORT_LIT mode)")
             return 0  # 렌더링 건너뛰고 함수 종료 (렌더링 카운트 0 반환)
 
-        # 렌더링 타입별 디렉토리 매핑
-        render_configs = []
-        if RENDER_UNLIT:
-            render_configs.append(('unlit', os.path.join(output_base, "unlit"), 'BLENDER_EEVEE_NEXT', 
-                                 materials['gum_unlit'], materials['tooth_unlit'], False, None))
-        if RENDER_MATT:
-            render_configs.append(('matt', os.path.join(output_base, "matt"), 'BLENDER_EEVEE_NEXT', 
-                                 materials['gum_matt'], materials['tooth_matt'], False, None))
-        if RENDER_LIT:
-            render_configs.append(('lit', os.path.join(output_base, "lit"), 'CYCLES', 
-                                 materials['gum'], materials['tooth'], True, None))
-        if RENDER_DEPTH:
-            render_configs.append(('depth', os.path.join(output_base, "depth"), 'BLENDER_EEVEE_NEXT', 
-                                 None, None, False, 'depth'))
-        if RENDER_NORMAL:
-            render_configs.append(('normal', os.path.join(output_base, "normal"), 'BLENDER_EEVEE_NEXT', 
-                                 None, None, False, 'normal'))
-        if RENDER_CURVATURE:
-            render_configs.append(('curvature', os.path.join(output_base, "curvature"), 'CYCLES',
-                                 materials['curvature'], materials['curvature'], False, None))
-        if RENDER_POSITION:
-            render_configs.append(('position', os.path.join(output_base, "position"), 'BLENDER_EEVEE_NEXT',
-                                 None, None, False, 'position'))
-
-        total_renders = len(camera_data) * len(render_configs)
+        # 렌더링 타입별 설정 (only_engine: 엔진 우선 스케줄에서 해당 엔진의 패스만)
+        render_configs = [config for config in self._render_configs(output_base, materials)
+                          if only_engine is None or config[2] == only_engine]
+
+        # 마감 모드에서 건너뛰는 렌더링 타입 (ETA에서 제외, 진행률은 완료로 계산)
+        skipped_configs = [config for config in render_configs if config[0] in self.deadline_dropped]
+        skipped_renders = len(camera_data) * sum(self._config_outputs(config) for config in skipped_configs)
+        for config in skipped_configs:
+            self._plan_progress(file_prefix, config[0], len(camera_data), rendered=False)
+            print(f"  Deadline: skipping {config[0].upper()}")
+        render_configs = [config for config in render_configs if config not in skipped_configs]
+        case_settings = {}  # 렌더링 타입별 실제 렌더링 설정 (output/case_meta에 기록)
+        persistent_cycles = CYCLES_PERSISTENT_DATA and REUSE_CAMERA_RIG
+        if persistent_cycles:
+            # Cycles 패스를 이어서 렌더링 (엔진이 바뀌면 persistent data가 사라짐)
+            render_configs.sort(key=lambda config: config[2] == 'CYCLES')
+        cycles_rendered = False
+
+        total_renders = len(camera_data) * sum(self._config_outputs(config) for config in render_configs)
         completed_renders = 0
         
         print(f"  Rendering {len(camera_data)} views × {len(render_configs)} types = {total_renders} images")
@@ -953,7 +1380,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         # Position 렌더링을 위한 BBox 미리 계산
         position_bbox = None
         if RENDER_POSITION:
-            mesh_objects = [o for o in bpy.context.scene.objects if o.type == 'MESH']
+            mesh_objects = [o for o in bpy.context.scene.objects if o.type == 'MESH' and not o.hide_render]
             if mesh_objects:
                 first_corner_world = mesh_objects[0].matrix_world @ mathutils.Vector(mesh_objects[0].bound_box[0])
                 bbox_min = mathutils.Vector(first_corner_world)
@@ -977,110 +1404,819 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         for render_type_idx, render_config in enumerate(render_configs):
             render_type, output_dir, engine, mat_gum, mat_tooth, use_shadow, pass_type = render_config
 
+            view_outputs = self._config_outputs(render_config)
+
+            # 이어서 렌더링: 저널에 완료로 기록된 뷰는 건너뜀 (모든 뷰가 완료면 엔진 전환 없이 타입 전체를 건너뜀)
+            pending_views = self._pending_views(file_prefix, render_config)
+            if not pending_views:
+                completed_renders += len(camera_data) * view_outputs
+                self._plan_progress(file_prefix, render_type, len(camera_data), rendered=False)
+                print(f"  [{idx}/{MAX_CASES}] [{render_type_idx+1}/{len(render_configs)}] {render_type.upper()}: "
+                      f"all {len(camera_data)} views complete in journal, skipping")
+                continue
+            if len(pending_views) < len(camera_data):
+                print(f"  [{idx}/{MAX_CASES}] [{render_type_idx+1}/{len(render_configs)}] {render_type.upper()}: "
+                      f"resuming {len(pending_views)}/{len(camera_data)} views")
+            self._plan_progress(file_prefix, render_type, len(camera_data) - len(pending_views), rendered=False)
+
+            self.output_pass = (file_prefix, render_type)
+            self.pending_views = set(pending_views)
+            self.pass_output_bytes = 0
+
             print(f"  [{idx}/{MAX_CASES}] [{render_type_idx+1}/{len(render_configs)}] Starting {render_type.upper()} rendering ({engine})")
 
             # 엔진 설정 (한 번만)
-            scene.render.engine = engine
+            engine_switched = self._set_engine(scene, engine)
             scene.use_nodes = False
-
-            # 머티리얼 설정 (한 번만)
+            scene.render.use_persistent_data = persistent_cycles and engine == 'CYCLES'
+            cycles_rendered = cycles_rendered or engine == 'CYCLES'
+            view_sync_times = []  # Cycles: 렌더링 시작부터 첫 샘플까지 (씬 동기화 + BVH)
+
+            # 카메라 rig 라이트 설정 (패스마다 한 번, normal/position 패스가 끈 라이트도 여기서 복구)
+            if REUSE_CAMERA_RIG or RENDER_AS_ANIMATION:
+                cam_obj, light_obj = self._ensure_camera_rig()
+                light_obj.data.energy = 5
+                light_obj.data.use_shadow = use_shadow
+            view_setup_time = 0.0
+            view_render_time = 0.0
+            rendered_views = 0
+
+            lit_prev = None
+            try:
+                # 지오메트리 선택 (원본 / 단순화 메시, 패스가 끝나거나 실패하면 원본으로 복구)
+                use_lod = lod_mesh is not None and PASS_GEOMETRY.get(render_type) == "lod"
+                obj.data = lod_mesh if use_lod else mesh
+
+                # 머티리얼 설정 (한 번만, LOD 비교 렌더링을 위해 두 메시 모두)
+                self._apply_pass_materials([mesh, lod_mesh] if use_lod else [mesh], render_type, mat_gum, mat_tooth,
+                                           materials)
+
+                # lit 프로파일 → 마감 모드 샘플 수 → 품질 목표 모드 순서로 이 케이스의 lit 설정 결정 (패스가 끝나면 복구)
+                if render_type == 'lit':
+                    profile = LIT_PROFILES[LIT_PROFILE]
+                    lit_prev = {name: getattr(scene.cycles, name)
+                                for name in ('samples', 'adaptive_threshold', 'adaptive_min_samples', *profile)}
+                    for name, value in profile.items():
+                        setattr(scene.cycles, name, value)
+                    if self.deadline_samples is not None and self.deadline_samples < scene.cycles.samples:
+                        scene.cycles.samples = self.deadline_samples
+                        scene.cycles.adaptive_min_samples = min(scene.cycles.adaptive_min_samples, self.deadline_samples)
+                    if LIT_QUALITY_TARGET is not None:
+                        self._calibrate_lit_quality(scene, output_base, file_prefix, use_shadow, camera_data)
+
+                # 결합 지오메트리 패스: 뷰 레이어 패스와 File Output 노드 준비 (패스마다 한 번)
+                if pass_type == 'geometry':
+                    rig_cam = cam_obj if REUSE_CAMERA_RIG or RENDER_AS_ANIMATION else None
+                    geometry_state = self._setup_geometry_pass(scene, rig_cam, output_base, file_prefix, position_bbox)
+
+                # 애니메이션 모드: 키프레임된 카메라 rig로 패스 전체를 한 번에 렌더링
+                if RENDER_AS_ANIMATION:
+                    scene.camera = cam_obj
+                    render_start = time.time()
+                    self._render_view(scene, cam_obj, obj, render_type, pass_type, output_dir, file_prefix, None,
+                                      position_bbox)
+                    view_render_time = time.time() - render_start
+                    rendered_views = len(pending_views)
+                    completed_renders += len(camera_data) * view_outputs
+                    self._plan_progress(file_prefix, render_type, rendered_views)
+
+                    current_total_renders = completed_renders_all + completed_renders
+                    estimated_remaining_time = self._estimate_remaining(start_time)
+                    print(f"    [{idx}/{MAX_CASES}] {render_type.upper()}: {len(camera_data)} views (animation) | "
+                          f"Model: {completed_renders}/{total_renders} ({completed_renders/total_renders*100:.1f}%) | "
+                          f"Overall: {current_total_renders}/{total_renders_all_models} ({current_total_renders/total_renders_all_models*100:.1f}%) | "
+                          f"ETA: {self._format_time(estimated_remaining_time)}")
+
+                # 카메라별 루프 (내부)
+                for view_idx, (view_name, cam_pos) in enumerate([] if RENDER_AS_ANIMATION else camera_data):
+                    if view_name not in self.pending_views:
+                        completed_renders += view_outputs
+                        continue
+
+                    # 카메라/라이트 배치
+                    setup_start = time.time()
+                    if REUSE_CAMERA_RIG:
+                        cam_obj.matrix_world = self.view_poses[view_name]
+                    else:
+                        cam_obj, light_obj = self._create_view_camera(view_name, cam_pos, target, use_shadow)
+                    scene.camera = cam_obj
+                    view_setup_time += time.time() - setup_start
+
+                    # 렌더링 실행
+                    render_start = time.time()
+                    self.first_sample_time = None
+                    self._render_view(scene, cam_obj, obj, render_type, pass_type, output_dir, file_prefix, view_name,
+                                      position_bbox)
+                    render_time = time.time() - render_start
+                    if engine == 'CYCLES' and self.first_sample_time is not None:
+                        view_sync_times.append(self.first_sample_time - render_start)
+                    view_render_time += render_time
+                    if rendered_views == 0:
+                        first_view_time = render_time
+                    rendered_views += 1
+
+                    # LOD 비교: 같은 뷰를 원본 메시로도 렌더링해서 시간/픽셀 차이 기록
+                    if use_lod and view_idx < LOD_REPORT_VIEWS:
+                        self._compare_lod_view(scene, cam_obj, obj, mesh, lod_mesh, render_type, pass_type, output_dir,
+                                               output_base, file_prefix, view_name, position_bbox, render_time)
+
+                    # 카메라와 라이트 정리 (뷰마다 새로 만든 경우)
+                    if not REUSE_CAMERA_RIG:
+                        bpy.data.objects.remove(cam_obj, do_unlink=True)
+                        bpy.data.objects.remove(light_obj, do_unlink=True)
+
+                    completed_renders += view_outputs
+                    self._plan_progress(file_prefix, render_type, 1)
+
+                    # 진행률 출력 (각 카메라 뷰마다) - 전체 모델 기준, ETA는 비용 모델 예측
+                    current_total_renders = completed_renders_all + completed_renders
+                    estimated_remaining_time = self._estimate_remaining(start_time)
+
+                    print(f"    [{idx}/{MAX_CASES}] {render_type.upper()}: {view_idx+1}/{len(camera_data)} views | "
+                          f"Model: {completed_renders}/{total_renders} ({completed_renders/total_renders*100:.1f}%) | "
+                          f"Overall: {current_total_renders}/{total_renders_all_models} ({current_total_renders/total_renders_all_models*100:.1f}%) | "
+                          f"ETA: {self._format_time(estimated_remaining_time)}")
+            
+                print(f"  [{idx}/{MAX_CASES}] [{render_type_idx+1}/{len(render_configs)}] Completed {render_type.upper()} rendering "
+                      f"(per view: setup {view_setup_time / rendered_views * 1000:.1f} ms, "
+                      f"render {view_render_time / rendered_views:.2f}s)")
+                self.render_seconds += view_render_time
+                pass_settings = self._pass_settings(scene, engine, rendered_views)
+                case_settings[render_type] = pass_settings
+                if view_sync_times:
+                    later = view_sync_times[1:]
+                    print(f"    Cycles sync/BVH: first view {view_sync_times[0]:.2f}s, "
+                          f"later views {sum(later) / len(later) if later else 0.0:.2f}s avg "
+                          f"(persistent data {'on' if scene.render.use_persistent_data else 'off'})")
+                self.output_pass = None
+                self.pending_views = None
+
+                # 비용 모델 학습 (렌더링한 지오메트리의 면 수 기준 뷰당 시간, 뷰당 출력 용량)
+                # (Cycles 패스는 샘플 수별로도 학습, 기본 키는 기본 샘플 수로 렌더링했을 때만)
+                if self.cost_model:
+                    file_format = "optimized" if USE_OPTIMIZED_FORMATS else "png"
+                    faces = len(obj.data.polygons)
+                    if engine != 'CYCLES' or pass_settings['samples'] == self.base_cycles_samples:
+                        self.cost_model.observe(render_type, engine, faces, view_render_time / rendered_views)
+                    if engine == 'CYCLES':
+                        self.cost_model.observe(f"{render_type}@{pass_settings['samples']}", engine, faces,
+                                                view_render_time / rendered_views)
+                    self.cost_model.observe_bytes(render_type, file_format, self.pass_output_bytes / rendered_views)
+
+                if pass_type == 'geometry':
+                    self._finish_geometry_pass(scene, geometry_state)
+
+                # 엔진 전환 비용 추정: 전환 직후 첫 뷰가 나머지 뷰 평균보다 오래 걸린 시간
+                if engine_switched and not RENDER_AS_ANIMATION and rendered_views > 1:
+                    rest_average = (view_render_time - first_view_time) / (rendered_views - 1)
+                    self.engine_switch_seconds += max(0.0, first_view_time - rest_average)
+            finally:
+                # 패스가 실패해도 원본 메시와 lit 설정 복구 (REUSE_MESH_OBJECT의 다음 케이스 교체, 다음 패스의 샘플 수)
+                obj.data = mesh
+                if lit_prev is not None:
+                    for name, value in lit_prev.items():
+                        setattr(scene.cycles, name, value)
+
+        # GPU 메모리 정리 (케이스의 Cycles 렌더링이 끝난 뒤 한 번, 엔진 우선 스케줄에서는 블록의 Cycles 패스가 끝난 뒤)
+        if cycles_rendered and only_engine is None:
+            self._cleanup_gpu_memory()
+
+        if case_settings:
+            self._update_case_metadata(output_base, file_prefix, 'render_settings', case_settings, merge=True)
+        if self.cost_model:
+            self.cost_model.save()
+        return completed_renders + skipped_renders
+
+    def _pass_settings(self, scene, engine, views):
+        """렌더링 타입 하나를 실제로 렌더링한 설정 (케이스 메타데이터 render_settings 기록용)"""
+        settings = {
+            'engine': engine,
+            'views': views,
+            'resolution': [scene.render.resolution_x, scene.render.resolution_y],
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        if engine == 'CYCLES':
+            cycles = scene.cycles
+            settings.update({
+                'device': cycles.device,
+                'samples': cycles.samples,
+                'use_adaptive_sampling': cycles.use_adaptive_sampling,
+                'adaptive_threshold': cycles.adaptive_threshold,
+                'adaptive_min_samples': cycles.adaptive_min_samples,
+                'use_denoising': cycles.use_denoising,
+                'denoiser': cycles.denoiser,
+                'denoising_input_passes': cycles.denoising_input_passes,
+                'denoising_prefilter': cycles.denoising_prefilter,
+                'max_bounces': cycles.max_bounces,
+            })
+        return settings
+
+    def _queue_cases(self, case_numbers):
+        """작업 큐에서 케이스를 하나씩 가져옴 → (케이스 번호, 케이스 폴더명), 다음 케이스를 요청할 때 이전 케이스 완료 처리"""
+        for case_name in self.work_queue:
+            # 다른 노드가 끝낸 케이스는 ETA의 남은 예상 시간에서 제외
+            for done_case in self.work_queue.done_cases():
+                self._drop_case_plan(f"{self.parent_folder}_{done_case}")
+            yield case_numbers[case_name], case_name
+            if case_name not in self.queue_deferred:
+                self._finish_queue_cases([case_name])
+
+    def _finish_queue_cases(self, case_names):
+        """작업 큐에 케이스 완료 기록 (에러가 기록된 케이스는 error 상태, 다시 시도하지 않음)"""
+        if self.work_queue is None:
+            return
+        for case_name in case_names:
+            self.queue_deferred.discard(case_name)
+            self.work_queue.complete(case_name, "error" if case_name in self.failed_cases else "ok")
+
+    def _pending_views(self, file_prefix, render_config):
+        """렌더링 타입 하나에서 아직 렌더링할 뷰 이름 (RESUME이 아니면 모든 뷰, 저널의 완료 기록과 파일 상태로 판별)"""
+        if not RESUME:
+            return list(self.view_poses)
+        view_outputs = self._config_outputs(render_config)
+        return [view_name for view_name in self.view_poses
+                if not self.journal.is_complete(file_prefix, render_config[0], view_name, view_outputs)]
+
+    def _outputs_written(self, view_name, paths):
+        """현재 렌더링 타입의 뷰 하나 저장 완료: 출력 용량 합산, 저널에 기록 (LOD 비교 렌더링이면 무시)"""
+        if self.output_pass is None:
+            return
+        self.pass_output_bytes += sum(os.path.getsize(path) for path in paths)
+        if self.journal is not None:
+            file_prefix, render_type = self.output_pass
+            self.journal.record(file_prefix, render_type, view_name, paths)
+
+    def _apply_pass_materials(self, pass_meshes, render_type, mat_gum, mat_tooth, materials):
+        """렌더링 타입의 잇몸/치아 머티리얼 적용 (depth/normal/position은 렌더링 중에 따로 처리)"""
+        for pass_mesh in pass_meshes:
             if mat_gum and mat_tooth:
-                mesh.materials[0] = mat_gum
-                mesh.materials[1] = mat_tooth
+                pass_mesh.materials[0] = mat_gum
+                pass_mesh.materials[1] = mat_tooth
             elif render_type == 'curvature':
-                mesh.materials[0] = materials['curvature']
-                if len(mesh.materials) > 1:
-                    mesh.materials[1] = materials['curvature']
-
-            # 카메라별 루프 (내부)
-            for view_idx, (view_name, cam_pos) in enumerate(camera_data):
-                # 카메라 생성
-                cam_data = bpy.data.cameras.new(view_name + "_cam")
-                cam_obj = bpy.data.objects.new(view_name + "_cam", cam_data)
-                bpy.context.collection.objects.link(cam_obj)
-                cam_obj.location = cam_pos
-                direction = target - cam_pos
-                rot_quat = direction.to_track_quat("-Z", "Y")
-                cam_obj.rotation_euler = rot_quat.to_euler()
-                bpy.context.scene.camera = cam_obj
-                cam_data.angle = math.radians(60)
-                
-                # Depth 렌더링을 위한 카메라 clip 범위 설정
-                if render_type in ['depth', 'normal', 'position']:
-
-                    min_depth = 50
-                    max_depth = 150
-                    
-                
-                # 라이트 생성
-                light_data = bpy.data.lights.new(view_name + "_sun", type="SUN")
-                light_data.energy = 5
-                light_data.use_shadow = use_shadow
-                light_obj = bpy.data.objects.new(view_name + "_sun", light_data)
-                bpy.context.collection.objects.link(light_obj)
-                light_obj.parent = cam_obj
-                
-                # 렌더링 실행
-                if render_type in ['depth', 'normal', 'position']:
-                    self._render_pass(scene, cam_obj, obj, pass_type, output_dir, file_prefix, view_name, position_bbox)
+                pass_mesh.materials[0] = materials['curvature']
+                if len(pass_mesh.materials) > 1:
+                    pass_mesh.materials[1] = materials['curvature']
+
+    def _warm_up_passes(self, scene, materials, camera_positions, target, output_base):
+        """활성화된 렌더링 타입마다 임시 메시를 작은 해상도로 한 번 렌더링 → {렌더링 타입: 초}
+
+        셰이더 컴파일(EEVEE)과 커널 로드(Cycles)를 케이스 렌더링 전에 끝내서 뷰당 시간에 섞이지 않게 함.
+        임시 출력은 output/warmup에 저장했다가 지움.
+        """
+        warmup_dir = os.path.join(output_base, "warmup")
+        render = scene.render
+        prev_settings = (render.resolution_x, render.resolution_y, scene.cycles.samples, render.engine)
+        render.resolution_x = render.resolution_y = WARMUP_RESOLUTION
+        scene.cycles.samples = 1
+
+        # 카메라 중심(target)에 놓인 치아 크기의 정육면체 (면마다 잇몸/치아 머티리얼 번갈아)
+        half = 15.0
+        corners = [target + mathutils.Vector((x, y, z))
+                   for x in (-half, half) for y in (-half, half) for z in (-half, half)]
+        faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+        mesh = bpy.data.meshes.new("warmup_mesh")
+        mesh.from_pydata([tuple(c) for c in corners], [], faces)
+        mesh.materials.append(materials['gum_unlit'])
+        mesh.materials.append(materials['tooth_unlit'])
+        mesh.polygons.foreach_set("material_index", [i % 2 for i in range(len(faces))])
+        obj = bpy.data.objects.new("warmup_mesh", mesh)
+        bpy.context.collection.objects.link(obj)
+        bbox_min, bbox_max = corners[0], corners[-1]
+        position_bbox = (bbox_min, bbox_max, bbox_max - bbox_min)
+
+        view_name, cam_pos = camera_positions[0]
+        warmup_times = {}
+        try:
+            for render_config in self._render_configs(output_base, materials):
+                render_type, output_dir, engine, mat_gum, mat_tooth, use_shadow, pass_type = render_config
+                pass_start = time.time()
+                render.engine = engine
+                scene.use_nodes = False
+                if REUSE_CAMERA_RIG or RENDER_AS_ANIMATION:
+                    cam_obj, light_obj = self._ensure_camera_rig()
+                    cam_obj.matrix_world = self.view_poses[view_name]
+                    light_obj.data.energy = 5
+                    light_obj.data.use_shadow = use_shadow
                 else:
-                    # 일반 렌더링
-                    # 파일 형식 설정
-                    img_settings = scene.render.image_settings
-                    prev_format = img_settings.file_format
-                    prev_color_mode = img_settings.color_mode
-                    prev_color_depth = img_settings.color_depth
-
-                    if USE_OPTIMIZED_FORMATS:
-                        # 최적 형식 사용 (WebP)
-                        if render_type in ['lit', 'normal', 'unlit', 'matt', 'curvature']:
-                            img_settings.file_format = "WEBP"
-                            file_ext = ".webp"
-                        else:
-                            img_settings.file_format = "PNG"
-                            file_ext = ".png"
-                    else:
-                        # 모두 PNG로 저장
-                        img_settings.file_format = "PNG"
-                        file_ext = ".png"
-
-                    output_path = os.path.join(output_dir, f"{file_prefix}_{view_name}{file_ext}")
-                    scene.render.filepath = output_path
-                    bpy.ops.render.render(write_still=True)
-
-                    # 복구
-                    img_settings.file_format = prev_format
-                    img_settings.color_mode = prev_color_mode
-                    img_settings.color_depth = prev_color_depth
-                
-                # 카메라와 라이트 정리
-                bpy.data.objects.remove(cam_obj, do_unlink=True)
-                bpy.data.objects.remove(light_obj, do_unlink=True)
-                
-                completed_renders += 1
-                
-                # 진행률 출력 (각 카메라 뷰마다) - 전체 모델 기준
-                current_total_renders = completed_renders_all + completed_renders
-                elapsed_time = time.time() - start_time
-                avg_time_per_render = elapsed_time / current_total_renders if current_total_renders > 0 else 0
-                remaining_renders_all = total_renders_all_models - current_total_renders
-                estimated_remaining_time = remaining_renders_all * avg_time_per_render
-                
-                print(f"    [{idx}/{MAX_CASES}] {render_type.upper()}: {view_idx+1}/{len(camera_data)} views | "
-                      f"Model: {completed_renders}/{total_renders} ({completed_renders/total_renders*100:.1f}%) | "
-                      f"Overall: {current_total_renders}/{total_renders_all_models} ({current_total_renders/total_renders_all_models*100:.1f}%) | "
-                      f"ETA: {self._format_time(estimated_remaining_time)}")
-            
-            print(f"  [{idx}/{MAX_CASES}] [{render_type_idx+1}/{len(render_configs)}] Completed {render_type.upper()} rendering")
-            
-            # GPU 메모리 정리 (Cycles 렌더링 후)
+                    cam_obj, light_obj = self._create_view_camera(view_name, cam_pos, target, use_shadow)
+                scene.camera = cam_obj
+                self._apply_pass_materials([mesh], render_type, mat_gum, mat_tooth, materials)
+
+                if pass_type == 'geometry':
+                    geometry_state = self._setup_geometry_pass(scene, cam_obj, warmup_dir, "warmup", position_bbox)
+                self._render_view(scene, cam_obj, obj, render_type, pass_type, os.path.join(warmup_dir, render_type),
+                                  "warmup", "view", position_bbox)
+                if pass_type == 'geometry':
+                    self._finish_geometry_pass(scene, geometry_state)
+
+                if not (REUSE_CAMERA_RIG or RENDER_AS_ANIMATION):
+                    bpy.data.objects.remove(cam_obj, do_unlink=True)
+                    bpy.data.objects.remove(light_obj, do_unlink=True)
+                warmup_times[render_type] = time.time() - pass_start
+                print(f"Warm-up {render_type.upper()} ({engine}): {warmup_times[render_type]:.2f}s")
+        finally:
+            bpy.data.objects.remove(obj, do_unlink=True)
+            bpy.data.meshes.remove(mesh, do_unlink=True)
+            render.resolution_x, render.resolution_y, scene.cycles.samples, render.engine = prev_settings
+            shutil.rmtree(warmup_dir, ignore_errors=True)
+        return warmup_times
+
+    def _render_configs(self, output_base, materials):
+        """활성화된 렌더링 타입별 (타입, 출력 폴더, 엔진, 잇몸/치아 머티리얼, 그림자, 패스 타입) 목록"""
+        render_configs = []
+        if COMBINED_GEOMETRY_PASS and RENDER_UNLIT:
+            # unlit 렌더링 한 번으로 depth/normal/position까지 저장 (아래 개별 타입 대신)
+            render_configs.append(('geometry', os.path.join(output_base, "unlit"), 'BLENDER_EEVEE_NEXT',
+                                 materials['gum_unlit'], materials['tooth_unlit'], False, 'geometry'))
+        elif RENDER_UNLIT:
+            render_configs.append(('unlit', os.path.join(output_base, "unlit"), 'BLENDER_EEVEE_NEXT', 
+                                 materials['gum_unlit'], materials['tooth_unlit'], False, None))
+        if RENDER_MATT:
+            render_configs.append(('matt', os.path.join(output_base, "matt"), 'BLENDER_EEVEE_NEXT', 
+                                 materials['gum_matt'], materials['tooth_matt'], False, None))
+        if RENDER_LIT:
+            render_configs.append(('lit', os.path.join(output_base, LIT_OUTPUT_DIRNAME), 'CYCLES', 
+                                 materials['gum'], materials['tooth'], True, None))
+        if RENDER_DEPTH and not (COMBINED_GEOMETRY_PASS and RENDER_UNLIT):
+            render_configs.append(('depth', os.path.join(output_base, "depth"), 'BLENDER_EEVEE_NEXT', 
+                                 None, None, False, 'depth'))
+        if RENDER_NORMAL and not (COMBINED_GEOMETRY_PASS and RENDER_UNLIT):
+            render_configs.append(('normal', os.path.join(output_base, "normal"), 'BLENDER_EEVEE_NEXT', 
+                                 None, None, False, 'normal'))
+        if RENDER_CURVATURE:
+            render_configs.append(('curvature', os.path.join(output_base, "curvature"), 'CYCLES',
+                                 materials['curvature'], materials['curvature'], False, None))
+        if RENDER_POSITION and not (COMBINED_GEOMETRY_PASS and RENDER_UNLIT):
+            render_configs.append(('position', os.path.join(output_base, "position"), 'BLENDER_EEVEE_NEXT',
+                                 None, None, False, 'position'))
+        return render_configs
+
+    def _config_outputs(self, render_config):
+        """렌더링 설정 하나가 뷰마다 저장하는 이미지 수 (결합 지오메트리 패스는 unlit + 켜진 지오메트리 패스)"""
+        if render_config[6] != 'geometry':
+            return 1
+        return 1 + sum([RENDER_DEPTH, RENDER_NORMAL, RENDER_POSITION])
+
+    def _setup_geometry_pass(self, scene, cam_obj, output_base, file_prefix, position_bbox):
+        """결합 지오메트리 패스 준비: Z/Normal/Position 뷰 레이어 패스 + 패스별 File Output 슬롯, 복구용 이전 설정 반환"""
+        view_layer = bpy.context.view_layer
+        state = (scene.use_nodes, view_layer.use_pass_z, view_layer.use_pass_normal, view_layer.use_pass_position)
+        view_layer.use_pass_z = RENDER_DEPTH or RENDER_POSITION  # position: 배경 마스크에 Z 사용
+        view_layer.use_pass_normal = RENDER_NORMAL
+        view_layer.use_pass_position = RENDER_POSITION
+
+        scene.use_nodes = True
+        ntree = scene.node_tree
+        nodes = ntree.nodes
+        links = ntree.links
+        nodes.clear()
+
+        # Render Layers → Composite (unlit 이미지는 일반 렌더링처럼 scene.render.filepath로 저장)
+        rl = nodes.new(type="CompositorNodeRLayers")
+        rl.location = (-800, 0)
+        comp = nodes.new(type="CompositorNodeComposite")
+        comp.location = (400, 300)
+        links.new(rl.outputs["Image"], comp.inputs["Image"])
+
+        # File Output: 패스별 하위 폴더/형식 (Blender가 #### 자리에 프레임 번호를 넣어 저장, 렌더링 후 뷰 이름으로 이동)
+        file_output = nodes.new(type="CompositorNodeOutputFile")
+        file_output.location = (400, -100)
+        file_output.base_path = output_base
+        file_output.file_slots.clear()
+        self.file_outputs = []
+
+        def add_slot(render_type, socket, file_format, color_mode, color_depth, file_ext):
+            file_output.file_slots.new(f"{render_type}/{file_prefix}_geometry_####")
+            slot = file_output.file_slots[-1]
+            slot.use_node_format = False
+            slot.format.file_format = file_format
+            slot.format.color_mode = color_mode
+            slot.format.color_depth = color_depth
+            # 8/16비트 이미지는 개별 패스 렌더링과 같이 Standard 뷰 변환 (unlit은 씬 설정 유지)
+            if file_format != "OPEN_EXR" and hasattr(slot.format, "color_management"):
+                slot.format.color_management = "OVERRIDE"
+                slot.format.view_settings.view_transform = "Standard"
+            links.new(socket, file_output.inputs[-1])
+            self.file_outputs.append((os.path.join(output_base, render_type), file_prefix, file_ext))
+
+        def remap_xyz(socket, scales, offsets, y):
+            # 채널별 value * scale + offset (컴포지터에는 벡터 연산 노드가 없어 XYZ로 분리)
+            separate_xyz = nodes.new(type="CompositorNodeSeparateXYZ")
+            separate_xyz.location = (-500, y)
+            combine_xyz = nodes.new(type="CompositorNodeCombineXYZ")
+            combine_xyz.location = (0, y)
+            links.new(socket, separate_xyz.inputs[0])
+            for axis_idx, axis in enumerate("XYZ"):
+                math_node = nodes.new(type="CompositorNodeMath")
+                math_node.operation = "MULTIPLY_ADD"
+                math_node.inputs[1].default_value = scales[axis_idx]
+                math_node.inputs[2].default_value = offsets[axis_idx]
+                math_node.location = (-250, y + 100 - axis_idx * 100)
+                links.new(separate_xyz.outputs[axis], math_node.inputs[0])
+                links.new(math_node.outputs[0], combine_xyz.inputs[axis])
+            return combine_xyz.outputs[0]
+
+        clip_properties = bpy.types.Camera.bl_rna.properties
+        clip_start = cam_obj.data.clip_start if cam_obj else clip_properties["clip_start"].default
+        clip_end = cam_obj.data.clip_end if cam_obj else clip_properties["clip_end"].default
+
+        if RENDER_DEPTH:
+            # [clip_start, clip_end] → [0, 1] (개별 depth 패스와 동일)
+            map_range = nodes.new(type="CompositorNodeMapRange")
+            map_range.location = (-250, -100)
+            map_range.use_clamp = True
+            map_range.inputs["From Min"].default_value = clip_start
+            map_range.inputs["From Max"].default_value = clip_end
+            map_range.inputs["To Min"].default_value = 0.0
+            map_range.inputs["To Max"].default_value = 1.0
+            links.new(rl.outputs["Depth"], map_range.inputs["Value"])
+            if USE_OPTIMIZED_FORMATS:
+                add_slot("depth", map_range.outputs["Value"], "OPEN_EXR", "BW", "32", ".exr")
+            else:
+                add_slot("depth", map_range.outputs["Value"], "PNG", "BW", "8", ".png")
+
+        if RENDER_NORMAL:
+            # [-1, 1] → [0, 1]
+            normal_socket = remap_xyz(rl.outputs["Normal"], (0.5, 0.5, 0.5), (0.5, 0.5, 0.5), -400)
+            if USE_OPTIMIZED_FORMATS:
+                add_slot("normal", normal_socket, "WEBP", "RGB", "8", ".webp")
+            else:
+                add_slot("normal", normal_socket, "PNG", "RGB", "8", ".png")
+
+        if RENDER_POSITION:
+            # (월드 좌표 - bbox_min) / bbox_range (개별 position 패스의 셰이더와 동일한 정규화)
+            if position_bbox is None:
+                raise ValueError("Position bbox must be pre-calculated before rendering!")
+            bbox_min, bbox_max, bbox_range = position_bbox
+            ranges = [max(bbox_range.x, 0.001), max(bbox_range.y, 0.001), max(bbox_range.z, 0.001)]
+            scales = [1.0 / r for r in ranges]
+            offsets = [-bbox_min.x / ranges[0], -bbox_min.y / ranges[1], -bbox_min.z / ranges[2]]
+            position_socket = remap_xyz(rl.outputs["Position"], scales, offsets, -800)
+
+            # 배경 픽셀은 Position이 (0,0,0)이라 정규화하면 범위 안의 값이 되므로, 개별 패스처럼 월드 배경색으로 채움
+            # (불투명 필름에서는 Alpha가 전부 1이라 Z < clip_end인 픽셀만 표면으로 봄)
+            surface = nodes.new(type="CompositorNodeMath")
+            surface.operation = "LESS_THAN"
+            surface.inputs[1].default_value = clip_end
+            surface.location = (-250, -1100)
+            links.new(rl.outputs["Depth"], surface.inputs[0])
+            coverage = nodes.new(type="CompositorNodeMath")
+            coverage.operation = "MULTIPLY"
+            coverage.location = (0, -1100)
+            links.new(surface.outputs[0], coverage.inputs[0])
+            links.new(rl.outputs["Alpha"], coverage.inputs[1])
+            background = nodes.new(type="CompositorNodeMixRGB")
+            background.location = (200, -900)
+            background.inputs[1].default_value = (*self._world_background_color(scene), 1.0)
+            links.new(coverage.outputs[0], background.inputs[0])
+            links.new(position_socket, background.inputs[2])
+            position_socket = background.outputs[0]
+            if USE_OPTIMIZED_FORMATS:
+                add_slot("position", position_socket, "OPEN_EXR", "RGB", "32", ".exr")
+            else:
+                add_slot("position", position_socket, "PNG", "RGB", "16", ".png")
+
+        return state
+
+    def _world_background_color(self, scene):
+        """월드 배경색 (선형 RGB, Background 노드가 있으면 색 × 세기)"""
+        world = scene.world
+        if world is None:
+            return (0.0, 0.0, 0.0)
+        if world.use_nodes:
+            for node in world.node_tree.nodes:
+                if node.type == 'BACKGROUND':
+                    strength = node.inputs["Strength"].default_value
+                    return tuple(channel * strength for channel in node.inputs["Color"].default_value[:3])
+        return tuple(world.color)
+
+    def _finish_geometry_pass(self, scene, state):
+        """결합 지오메트리 패스 설정 복구"""
+        view_layer = bpy.context.view_layer
+        scene.use_nodes, view_layer.use_pass_z, view_layer.use_pass_normal, view_layer.use_pass_position = state
+        self.file_outputs = []
+
+    def _move_file_outputs(self, frame, view_name):
+        """File Output 노드가 프레임 번호로 저장한 패스 이미지를 {file_prefix}_{view_name} 이름으로 이동, 이동한 경로 반환"""
+        moved = []
+        for output_dir, file_prefix, file_ext in self.file_outputs:
+            source = os.path.join(output_dir, f"{file_prefix}_geometry_{frame:04d}{file_ext}")
+            target = os.path.join(output_dir, f"{file_prefix}_{view_name}{file_ext}")
+            os.replace(source, target)
+            moved.append(target)
+        return moved
+
+    def _render_block(self, scene, block, materials, camera_positions, output_base, target, total,
+                      active_render_types, start_time, completed_renders_all, total_renders_all_models,
+                      error_log_path):
+        """엔진 우선 순서로 블록 렌더링: 블록의 모든 케이스에 EEVEE 패스 → 모든 케이스에 Cycles 패스"""
+        block_start = time.time()
+        switches_before = self.engine_switch_count
+        switch_seconds_before = self.engine_switch_seconds
+        engines = []
+        for config in self._render_configs(output_base, materials):
+            if config[2] not in engines:
+                engines.append(config[2])
+        block_faces = sum(len(entry[3].polygons) for entry in block)
+        print(f"\n=== Engine-major block: {len(block)} cases, {block_faces} faces, engines: {' -> '.join(engines)} ===")
+
+        completed_renders = 0
+        failed_cases = set()
+        for engine in engines:
+            for idx, case_name, file_prefix, mesh, obj, lod_mesh, deadline_plan in block:
+                if case_name in failed_cases:
+                    continue
+                self.deadline_samples, self.deadline_dropped = deadline_plan
+                # 현재 케이스만 렌더링되도록 나머지 메시 숨기기
+                for entry in block:
+                    entry[4].hide_render = entry[4] is not obj
+                print(f"\n[{idx}/{MAX_CASES}] {engine}: {case_name}")
+                try:
+                    completed_renders += self._render_by_type_priority(
+                        scene, mesh, obj, materials, camera_positions, file_prefix, output_base, target, idx, total,
+                        active_render_types, start_time, completed_renders_all + completed_renders,
+                        total_renders_all_models, lod_mesh, only_engine=engine)
+                except Exception as e:
+                    import traceback
+                    print(f"  [ERROR] {case_name}: {e}")
+                    self._log_error(error_log_path, idx, case_name, str(e), traceback.format_exc())
+                    failed_cases.add(case_name)
+
+            # GPU 메모리 정리 (블록의 Cycles 패스가 모두 끝난 뒤 한 번)
             if engine == 'CYCLES':
                 self._cleanup_gpu_memory()
-        
-        return completed_renders
+
+        # 블록 메시 정리
+        for idx, case_name, file_prefix, mesh, obj, lod_mesh, _ in block:
+            bpy.data.objects.remove(obj, do_unlink=True)
+            bpy.data.meshes.remove(mesh, do_unlink=True)
+            if lod_mesh is not None:
+                bpy.data.meshes.remove(lod_mesh, do_unlink=True)
+
+        print(f"  Block completed in {time.time() - block_start:.1f}s "
+              f"({self.engine_switch_count - switches_before} engine switches, "
+              f"{self.engine_switch_seconds - switch_seconds_before:.1f}s switch overhead)")
+        return completed_renders, len(failed_cases)
+
+    def _load_block_mesh(self, obj_file, json_file, materials, arrays=None):
+        """엔진 우선 스케줄용 메시 로드 (씬을 지우지 않고 블록의 다른 케이스와 함께 유지, 렌더링 전까지 숨김)"""
+        if arrays is None:
+            arrays = self._load_mesh_arrays(obj_file, json_file)
+        obj = create_mesh_object(os.path.splitext(os.path.basename(obj_file))[0], arrays)
+        obj.hide_render = True
+        mesh = obj.data
+        mesh.materials.append(materials['gum_unlit'])
+        mesh.materials.append(materials['tooth_unlit'])
+        return mesh, obj
+
+    def _set_engine(self, scene, engine):
+        """렌더 엔진 설정 (실제로 바뀌면 전환 횟수를 세고 True 반환)"""
+        if scene.render.engine == engine:
+            return False
+        scene.render.engine = engine
+        self.engine_switch_count += 1
+        return True
+
+    def _camera_rig_objects(self):
+        """씬 정리 시 남겨둘 카메라 rig 오브젝트 (카메라, sun 라이트)"""
+        rig_objects = [bpy.data.objects.get(RIG_CAMERA_NAME), bpy.data.objects.get(RIG_LIGHT_NAME)]
+        return [rig_obj for rig_obj in rig_objects if rig_obj is not None]
+
+    def _ensure_camera_rig(self):
+        """렌더링용 카메라와 카메라에 부모 연결된 sun 라이트 반환 (없으면 생성, 실행 중 한 쌍만 유지)"""
+        cam_obj = bpy.data.objects.get(RIG_CAMERA_NAME)
+        if cam_obj is None:
+            cam_data = bpy.data.cameras.new(RIG_CAMERA_NAME)
+            cam_obj = bpy.data.objects.new(RIG_CAMERA_NAME, cam_data)
+            bpy.context.scene.collection.objects.link(cam_obj)
+        cam_obj.data.angle = math.radians(self.camera_rig.fov_deg)
+        if not self.camera_rig_ready:
+            # rig는 씬 정리와 오퍼레이터 재실행에도 남으므로 이전 실행의 키프레임(다른 rig 포즈)을 지우고,
+            # 애니메이션 모드일 때만 이번 실행의 뷰 포즈로 다시 기록 (꺼져 있으면 키프레임이 matrix_world를 덮어씀)
+            cam_obj.animation_data_clear()
+            if RENDER_AS_ANIMATION:
+                self._keyframe_camera_rig(cam_obj)
+            self.camera_rig_ready = True
+
+        light_obj = bpy.data.objects.get(RIG_LIGHT_NAME)
+        if light_obj is None:
+            light_data = bpy.data.lights.new(RIG_LIGHT_NAME, type="SUN")
+            light_obj = bpy.data.objects.new(RIG_LIGHT_NAME, light_data)
+            bpy.context.scene.collection.objects.link(light_obj)
+            light_obj.parent = cam_obj
+        return cam_obj, light_obj
+
+    def _keyframe_camera_rig(self, cam_obj):
+        """뷰 포즈를 카메라 키프레임으로 기록 (ANIMATION_FIRST_FRAME부터 1프레임 = 1뷰, 보간 없음)"""
+        self.animation_frames = []
+        for view_idx, (view_name, pose) in enumerate(self.view_poses.items()):
+            frame = ANIMATION_FIRST_FRAME + view_idx
+            cam_obj.matrix_world = pose
+            cam_obj.keyframe_insert("location", frame=frame)
+            cam_obj.keyframe_insert("rotation_euler", frame=frame)
+            self.animation_frames.append((frame, view_name))
+        for fcurve in cam_obj.animation_data.action.fcurves:
+            for keyframe in fcurve.keyframe_points:
+                keyframe.interpolation = 'CONSTANT'
+        print(f"Camera rig keyframed: {len(self.animation_frames)} views "
+              f"(frames {ANIMATION_FIRST_FRAME}-{ANIMATION_FIRST_FRAME + len(self.animation_frames) - 1})")
+
+    def _write_render(self, scene, output_dir, file_prefix, view_name, file_ext):
+        """현재 설정으로 렌더링해서 {file_prefix}_{view_name}{file_ext}로 저장 (view_name이 None이면 모든 뷰를 애니메이션으로)"""
+        if view_name is not None:
+            scene.render.filepath = os.path.join(output_dir, f"{file_prefix}_{view_name}{file_ext}")
+            bpy.ops.render.render(write_still=True, use_viewport=False)
+            moved = self._move_file_outputs(scene.frame_current, view_name)
+            self._outputs_written(view_name, [scene.render.filepath] + moved)
+            return
+
+        view_names = dict(self.animation_frames)
+        targets = {frame: os.path.join(output_dir, f"{file_prefix}_{name}{file_ext}")
+                   for frame, name in self.animation_frames}
+        frames = [frame for frame, _ in self.animation_frames]
+        if RESUME or ANIMATION_RESUME_FROM == "auto":
+            if RESUME:
+                missing = [frame for frame in frames
+                           if self.pending_views is None or view_names[frame] in self.pending_views]
+            else:
+                missing = [frame for frame in frames if not os.path.exists(targets[frame])]
+            if not missing:
+                print(f"    All {len(frames)} views already rendered, skipping")
+                return
+            first_frame = missing[0]
+        else:
+            first_frame = frames[(ANIMATION_RESUME_FROM or 0)]
+        if first_frame != frames[0]:
+            print(f"    Resuming animation from frame {first_frame} (view {first_frame - frames[0]})")
+
+        # 프레임 번호 파일 → 뷰 이름 파일 (프레임이 저장될 때마다 바로 바꿔서 중단되어도 이어서 렌더링 가능)
+        def rename_frame(render_scene, *args):
+            frame = render_scene.frame_current
+            if frame in targets:
+                os.replace(render_scene.render.frame_path(frame=frame), targets[frame])
+                moved = self._move_file_outputs(frame, view_names[frame])
+                self._outputs_written(view_names[frame], [targets[frame]] + moved)
+
+        prev_range = (scene.frame_start, scene.frame_end, scene.frame_current)
+        scene.frame_start = first_frame
+        scene.frame_end = frames[-1]
+        scene.render.filepath = os.path.join(output_dir, f"{file_prefix}_frame_####")
+        bpy.app.handlers.render_write.append(rename_frame)
+        try:
+            bpy.ops.render.render(animation=True, use_viewport=False)
+        finally:
+            bpy.app.handlers.render_write.remove(rename_frame)
+            scene.frame_start, scene.frame_end = prev_range[:2]
+            scene.frame_set(prev_range[2])
+
+    def _create_view_camera(self, view_name, cam_pos, target, use_shadow):
+        """뷰 하나용 카메라와 sun 라이트 생성 (REUSE_CAMERA_RIG = False)"""
+        cam_data = bpy.data.cameras.new(view_name + "_cam")
+        cam_obj = bpy.data.objects.new(view_name + "_cam", cam_data)
+        bpy.context.collection.objects.link(cam_obj)
+        cam_obj.location = cam_pos
+        direction = target - cam_pos
+        rot_quat = direction.to_track_quat("-Z", "Y")
+        cam_obj.rotation_euler = rot_quat.to_euler()
+        cam_data.angle = math.radians(self.camera_rig.fov_deg)
+
+        light_data = bpy.data.lights.new(view_name + "_sun", type="SUN")
+        light_data.energy = 5
+        light_data.use_shadow = use_shadow
+        light_obj = bpy.data.objects.new(view_name + "_sun", light_data)
+        bpy.context.collection.objects.link(light_obj)
+        light_obj.parent = cam_obj
+        return cam_obj, light_obj
+
+    def _render_view(self, scene, cam_obj, obj, render_type, pass_type, output_dir, file_prefix, view_name,
+                     position_bbox=None):
+        """현재 카메라로 한 장 렌더링해서 output_dir에 저장"""
+        if render_type in ['depth', 'normal', 'position']:
+            self._render_pass(scene, cam_obj, obj, pass_type, output_dir, file_prefix, view_name, position_bbox)
+            return
+
+        # 일반 렌더링
+        # 파일 형식 설정
+        img_settings = scene.render.image_settings
+        prev_format = img_settings.file_format
+        prev_color_mode = img_settings.color_mode
+        prev_color_depth = img_settings.color_depth
+
+        if USE_OPTIMIZED_FORMATS:
+            # 최적 형식 사용 (WebP)
+            if render_type in ['lit', 'normal', 'unlit', 'matt', 'curvature', 'geometry']:
+                img_settings.file_format = "WEBP"
+                file_ext = ".webp"
+            else:
+                img_settings.file_format = "PNG"
+                file_ext = ".png"
+        else:
+            # 모두 PNG로 저장
+            img_settings.file_format = "PNG"
+            file_ext = ".png"
+
+        self._write_render(scene, output_dir, file_prefix, view_name, file_ext)
+
+        # 복구
+        img_settings.file_format = prev_format
+        img_settings.color_mode = prev_color_mode
+        img_settings.color_depth = prev_color_depth
+
+    def _load_lod_mesh(self, obj_file, json_file, obj):
+        """단순화 메시 생성 (캐시에 없으면 원본 메시 배열을 클러스터링해서 캐시에 기록)"""
+        lod_start = time.time()
+        variant = f"lod{LOD_CELL_SIZE:g}"
+        arrays = self.lod_cache.load(obj_file, json_file, variant)
+        if arrays is None:
+            arrays = decimate_mesh_arrays(self._load_mesh_arrays(obj_file, json_file), LOD_CELL_SIZE)
+            self._store_mesh_cache(self.lod_cache, obj_file, json_file, arrays, variant)
+
+        # LOD 배열의 변환과 오브젝트 변환이 다르면 (메시 캐시의 bake 설정 차이) 꼭짓점에 차이를 적용
+        bpy.context.view_layer.update()
+        relative = np.linalg.inv(np.array(obj.matrix_world)) @ np.asarray(arrays["matrix_world"])
+        vertices = arrays["vertices"]
+        if not np.allclose(relative, np.identity(4), atol=1e-5):
+            vertices = (vertices @ relative[:3, :3].T + relative[:3, 3]).astype(np.float32)
+
+        lod_mesh = bpy.data.meshes.new(obj.data.name + "_lod")
+        fill_mesh(lod_mesh, vertices, arrays["loop_start"], arrays["loop_vertices"])
+        apply_mesh_attributes(lod_mesh, arrays)
+        for material in obj.data.materials:
+            lod_mesh.materials.append(material)
+
+        full_faces = len(obj.data.polygons)
+        print(f"  LOD: {full_faces} -> {len(lod_mesh.polygons)} faces "
+              f"({len(lod_mesh.polygons) / max(full_faces, 1) * 100:.1f}%, {time.time() - lod_start:.2f}s)")
+        return lod_mesh
+
+    def _compare_lod_view(self, scene, cam_obj, obj, mesh, lod_mesh, render_type, pass_type, output_dir,
+                          output_base, file_prefix, view_name, position_bbox, lod_time):
+        """LOD로 렌더링한 뷰를 원본 메시로 다시 렌더링해서 렌더 시간과 픽셀 차이 기록"""
+        report_dir = os.path.join(output_base, "lod_report", render_type)
+        os.makedirs(report_dir, exist_ok=True)
+
+        obj.data = mesh
+        output_pass, self.output_pass = self.output_pass, None  # 비교용 이미지는 저널/출력 용량에 넣지 않음
+        try:
+            full_start = time.time()
+            self._render_view(scene, cam_obj, obj, render_type, pass_type, report_dir, file_prefix, view_name,
+                              position_bbox)
+            full_time = time.time() - full_start
+        finally:
+            # 실패해도 LOD 패스 상태로 복구 (패스가 끝나면 _render_by_type_priority가 원본 메시로 되돌림)
+            self.output_pass = output_pass
+            obj.data = lod_mesh
+
+        row = {
+            'case': file_prefix,
+            'render_type': render_type,
+            'view_name': view_name,
+            'lod_faces': len(lod_mesh.polygons),
+            'full_faces': len(mesh.polygons),
+            'lod_seconds': round(lod_time, 3),
+            'full_seconds': round(full_time, 3),
+        }
+        pattern = glob.escape(f"{file_prefix}_{view_name}") + ".*"
+        lod_files = glob.glob(os.path.join(glob.escape(output_dir), pattern))
+        full_files = glob.glob(os.path.join(glob.escape(report_dir), pattern))
+        try:
+            if not lod_files or not full_files:
+                raise FileNotFoundError(f"렌더링 결과 없음: {file_prefix}_{view_name}")
+            row.update(compare_images(lod_files[0], full_files[0]))
+            print(f"    LOD check {view_name}: lod {lod_time:.2f}s vs full {full_time:.2f}s, "
+                  f"mean diff {row['mean_abs_diff']:.4f}, changed {row['changed_fraction'] * 100:.1f}%")
+        except Exception as e:
+            row['error'] = str(e)
+            print(f"    [WARNING] LOD check failed for {view_name}: {e}")
+        self.lod_report.append(row)
+
+    def _write_lod_report(self, output_base):
+        """LOD 비교 결과를 output/lod_report/lod_report.json에 저장하고 타입별 요약 출력"""
+        summary = {}
+        for render_type in sorted({row['render_type'] for row in self.lod_report}):
+            rows = [row for row in self.lod_report if row['render_type'] == render_type]
+            lod_seconds = sum(row['lod_seconds'] for row in rows)
+            full_seconds = sum(row['full_seconds'] for row in rows)
+            summary[render_type] = summarize_diffs([row for row in rows if 'error' not in row])
+            summary[render_type].update({
+                'views': len(rows),
+                'lod_seconds': round(lod_seconds, 3),
+                'full_seconds': round(full_seconds, 3),
+                'speedup': round(full_seconds / lod_seconds, 2) if lod_seconds > 0 else None,
+            })
+            print(f"LOD {render_type}: {len(rows)} views, lod {lod_seconds:.1f}s vs full {full_seconds:.1f}s "
+                  f"(x{summary[render_type]['speedup']}), "
+                  f"mean diff {summary[render_type].get('mean_abs_diff', float('nan')):.4f}")
+
+        report_path = os.path.join(output_base, "lod_report", "lod_report.json")
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'cell_size': LOD_CELL_SIZE, 'summary': summary, 'views': self.lod_report}, f, indent=2)
+        print(f"LOD report: {report_path}")
 
     def _cleanup_gpu_memory(self):
-        """GPU 메모리 정리 및 안정성 향상"""
+        """GPU 메모리 정리 및 안정성 향상 (소요 시간은 엔진 전환 비용에 포함)"""
+        cleanup_start = time.time()
         try:
             # GPU 메모리 정리
             bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=1)
@@ -1097,6 +2233,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
             
         except Exception as e:
             print(f"GPU 메모리 정리 중 오류: {e}")
+        self.engine_switch_seconds += time.time() - cleanup_start
 
     def _generate_camera_positions(self, camera_positions, target):
         """카메라 위치들을 생성 (Sequence 모드 처리 포함)"""
@@ -1197,11 +2334,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
                     img_settings.color_mode = "RGB"
                 file_ext = ".png"
 
-            depth_path = os.path.join(output_dir, f"{file_prefix}_{view_name}{file_ext}")
-            scene.render.filepath = depth_path
-            
-            # 렌더링 실행
-            bpy.ops.render.render(write_still=True, use_viewport=False)
+            self._write_render(scene, output_dir, file_prefix, view_name, file_ext)
             
             # 복구
             img_settings.file_format = prev_format
@@ -1302,9 +2435,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
 
             scene.view_settings.view_transform = "Standard"
 
-            normal_path = os.path.join(output_dir, f"{file_prefix}_{view_name}{file_ext}")
-            scene.render.filepath = normal_path
-            bpy.ops.render.render(write_still=True, use_viewport=False)
+            self._write_render(scene, output_dir, file_prefix, view_name, file_ext)
 
             # 설정 복구
             img_settings.file_format = prev_format
@@ -1382,61 +2513,19 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
 
             bbox_min, bbox_max, bbox_range = position_bbox
 
-            # 모든 메시 오브젝트에 Position Shader 적용
-            mesh_objects = [o for o in bpy.context.scene.objects if o.type == 'MESH']
+            # 렌더링되는 모든 메시 오브젝트에 Position Shader 적용 (머티리얼은 실행 중 하나만 만들고 bbox 값만 변경)
+            mat = self._position_material(bbox_min, bbox_range)
+            mesh_objects = [o for o in bpy.context.scene.objects if o.type == 'MESH' and not o.hide_render]
             prev_materials = {}
             for mesh_obj in mesh_objects:
                 # 기존 재질 저장
                 prev_materials[mesh_obj.name] = mesh_obj.data.materials[:] if mesh_obj.data.materials else []
 
-                # 새 재질 생성 (Position을 RGB로 출력, 정규화)
-                mat = bpy.data.materials.new(name="PositionMaterial_Temp")
-                mat.use_nodes = True
-                nodes = mat.node_tree.nodes
-                links = mat.node_tree.links
-                nodes.clear()
-
-                # Geometry 노드 (Position 정보)
-                geom = nodes.new(type="ShaderNodeNewGeometry")
-                geom.location = (0, 0)
-
-                # Vector Math: Position - bbox_min
-                subtract = nodes.new(type="ShaderNodeVectorMath")
-                subtract.operation = "SUBTRACT"
-                subtract.location = (200, 0)
-                subtract.inputs[1].default_value = (bbox_min.x, bbox_min.y, bbox_min.z)
-
-                # Vector Math: (Position - bbox_min) / bbox_range
-                divide = nodes.new(type="ShaderNodeVectorMath")
-                divide.operation = "DIVIDE"
-                divide.location = (400, 0)
-                divide.inputs[1].default_value = (
-                    max(bbox_range.x, 0.001),  # 0으로 나누기 방지
-                    max(bbox_range.y, 0.001),
-                    max(bbox_range.z, 0.001)
-                )
-
-                # Emission 노드 (Position을 색상으로)
-                emission = nodes.new(type="ShaderNodeEmission")
-                emission.location = (600, 0)
-
-                # Material Output
-                output = nodes.new(type="ShaderNodeOutputMaterial")
-                output.location = (800, 0)
-
-                # 연결: Position -> Subtract -> Divide -> Emission -> Output
-                links.new(geom.outputs["Position"], subtract.inputs[0])
-                links.new(subtract.outputs[0], divide.inputs[0])
-                links.new(divide.outputs[0], emission.inputs["Color"])
-                links.new(emission.outputs["Emission"], output.inputs["Surface"])
-
                 # 메시에 재질 적용 (모든 슬롯에 동일한 재질 적용)
                 mesh_obj.data.materials.clear()
                 mesh_obj.data.materials.append(mat)
 
-            position_path = os.path.join(output_dir, f"{file_prefix}_{view_name}{file_ext}")
-            scene.render.filepath = position_path
-            bpy.ops.render.render(write_still=True, use_viewport=False)
+            self._write_render(scene, output_dir, file_prefix, view_name, file_ext)
 
             # 재질 복구
             for obj_name, mats in prev_materials.items():
@@ -1446,11 +2535,6 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
                     for mat in mats:
                         obj.data.materials.append(mat)
 
-            # 임시 재질 삭제
-            for mat in bpy.data.materials:
-                if mat.name.startswith("PositionMaterial_Temp"):
-                    bpy.data.materials.remove(mat)
-
             # 설정 복구
             img_settings.file_format = prev_format
             img_settings.color_mode = prev_color_mode
@@ -1458,6 +2542,174 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
             scene.view_settings.view_transform = prev_view_transform
             scene.use_nodes = prev_use_nodes
 
+    def _calibrate_lit_quality(self, scene, output_base, file_prefix, use_shadow, camera_data):
+        """보정 뷰를 기준 샘플 수와 후보 설정으로 렌더링해서 LIT_QUALITY_TARGET을 만족하는 가장 싼 후보를 씬에 적용
+
+        오차는 기준 이미지 대비 RMSE (디노이즈 포함, 실제 lit 패스와 같은 설정). 만족하는 후보가 없으면 마지막 후보 사용.
+        """
+        calibration_start = time.time()
+        view_name = LIT_QUALITY_VIEW or camera_data[0][0]
+        calibration_dir = os.path.join(output_base, "lit_quality", file_prefix)
+        os.makedirs(calibration_dir, exist_ok=True)
+
+        cam_obj, light_obj = self._ensure_camera_rig()
+        cam_obj.matrix_world = self.view_poses[view_name]
+        light_obj.data.energy = 5
+        light_obj.data.use_shadow = use_shadow
+        prev_camera = scene.camera
+        scene.camera = cam_obj
+        # 애니메이션 모드: rig 카메라가 키프레임되어 있어 matrix_world 대신 보정 뷰의 프레임으로 이동 (끝나면 복구)
+        prev_frame = scene.frame_current
+        if RENDER_AS_ANIMATION:
+            scene.frame_set({name: frame for frame, name in self.animation_frames}[view_name])
+
+        render = scene.render
+        img_settings = render.image_settings
+        prev_settings = (render.resolution_x, render.resolution_y, render.filepath, img_settings.file_format,
+                         img_settings.color_mode, img_settings.color_depth)
+        # 보정 렌더링 후 복구 (실패해도 기준 샘플 수가 남지 않도록, 선택한 후보는 복구 뒤에 적용)
+        prev_cycles = (scene.cycles.samples, scene.cycles.adaptive_threshold, scene.cycles.adaptive_min_samples)
+        render.resolution_x = render.resolution_y = LIT_QUALITY_RESOLUTION
+        img_settings.file_format = "OPEN_EXR"
+        img_settings.color_mode = "RGB"
+        img_settings.color_depth = "32"
+        min_samples = scene.cycles.adaptive_min_samples  # lit 프로파일의 최소 샘플 수 (fast: 0) 유지
+
+        def render_calibration(name, samples, threshold):
+            scene.cycles.samples = samples
+            scene.cycles.adaptive_threshold = threshold
+            scene.cycles.adaptive_min_samples = min(samples, min_samples)
+            render.filepath = os.path.join(calibration_dir, f"{name}.exr")
+            start = time.time()
+            bpy.ops.render.render(write_still=True, use_viewport=False)
+            return render.filepath, time.time() - start
+
+        try:
+            reference_path, reference_time = render_calibration(
+                "reference", LIT_QUALITY_REFERENCE_SAMPLES, 0.001)
+            reference = load_image_array(reference_path)
+            calibration = []
+            # 마감 모드: 마감 계획의 샘플 수를 넘는 후보는 쓰지 않음
+            candidates = [candidate for candidate in LIT_QUALITY_CANDIDATES
+                          if self.deadline_samples is None or candidate[0] <= self.deadline_samples]
+            candidates = candidates or LIT_QUALITY_CANDIDATES[:1]
+            chosen = candidates[-1]
+            for samples, threshold in candidates:
+                path, seconds = render_calibration(f"s{samples}", samples, threshold)
+                rmse = image_diff(load_image_array(path), reference)['rmse']
+                calibration.append({'samples': samples, 'adaptive_threshold': threshold,
+                                    'rmse': round(rmse, 6), 'seconds': round(seconds, 3)})
+                if rmse <= LIT_QUALITY_TARGET:
+                    chosen = (samples, threshold)
+                    break
+        finally:
+            (render.resolution_x, render.resolution_y, render.filepath, img_settings.file_format,
+             img_settings.color_mode, img_settings.color_depth) = prev_settings
+            (scene.cycles.samples, scene.cycles.adaptive_threshold,
+             scene.cycles.adaptive_min_samples) = prev_cycles
+            scene.camera = prev_camera
+            if RENDER_AS_ANIMATION:
+                scene.frame_set(prev_frame)
+            shutil.rmtree(calibration_dir, ignore_errors=True)
+            if not (REUSE_CAMERA_RIG or RENDER_AS_ANIMATION):
+                # 뷰마다 카메라/라이트를 만드는 모드: 보정용 rig 라이트가 lit 렌더링에 더해지지 않도록 삭제
+                bpy.data.objects.remove(light_obj, do_unlink=True)
+                bpy.data.objects.remove(cam_obj, do_unlink=True)
+
+        samples, threshold = chosen
+        scene.cycles.samples = samples
+        scene.cycles.adaptive_threshold = threshold
+        scene.cycles.adaptive_min_samples = min(min_samples, samples)
+        met = calibration[-1]['rmse'] <= LIT_QUALITY_TARGET
+        print(f"    Lit quality: {samples} samples, threshold {threshold} "
+              f"(rmse {calibration[-1]['rmse']:.4f} {'<=' if met else '>'} target {LIT_QUALITY_TARGET}, "
+              f"calibration {time.time() - calibration_start:.1f}s on {view_name})")
+        self._update_case_metadata(output_base, file_prefix, 'lit_quality', {
+            'target_rmse': LIT_QUALITY_TARGET,
+            'target_met': met,
+            'samples': samples,
+            'adaptive_threshold': threshold,
+            'adaptive_min_samples': scene.cycles.adaptive_min_samples,
+            'calibration_view': view_name,
+            'calibration_resolution': LIT_QUALITY_RESOLUTION,
+            'reference_samples': LIT_QUALITY_REFERENCE_SAMPLES,
+            'reference_seconds': round(reference_time, 3),
+            'candidates': calibration,
+        })
+
+    def _update_case_metadata(self, output_base, file_prefix, section, values, merge=False):
+        """케이스별 메타데이터 output/case_meta/{file_prefix}.json의 섹션 하나를 기록 (다른 섹션은 유지)
+
+        merge=True: 섹션을 통째로 바꾸지 않고 키 단위로 갱신 (엔진 우선 스케줄처럼 한 케이스를 여러 번에 나눠 렌더링)
+        """
+        meta_dir = os.path.join(output_base, "case_meta")
+        os.makedirs(meta_dir, exist_ok=True)
+        meta_path = os.path.join(meta_dir, f"{file_prefix}.json")
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        if merge and isinstance(meta.get(section), dict):
+            meta[section].update(values)
+        else:
+            meta[section] = values
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def _position_material(self, bbox_min, bbox_range):
+        """Position 패스 머티리얼 (Position을 bbox로 정규화해서 RGB로 출력)
+
+        뷰/케이스마다 새로 만들면 EEVEE가 셰이더를 매번 다시 컴파일하므로 하나만 만들고 bbox 입력값만 바꿈.
+        """
+        mat = bpy.data.materials.get("PositionMaterial")
+        if mat is None:
+            mat = bpy.data.materials.new(name="PositionMaterial")
+            mat.use_nodes = True
+            nodes = mat.node_tree.nodes
+            links = mat.node_tree.links
+            nodes.clear()
+
+            # Geometry 노드 (Position 정보)
+            geom = nodes.new(type="ShaderNodeNewGeometry")
+            geom.location = (0, 0)
+
+            # Vector Math: Position - bbox_min
+            subtract = nodes.new(type="ShaderNodeVectorMath")
+            subtract.name = "bbox_min"
+            subtract.operation = "SUBTRACT"
+            subtract.location = (200, 0)
+
+            # Vector Math: (Position - bbox_min) / bbox_range
+            divide = nodes.new(type="ShaderNodeVectorMath")
+            divide.name = "bbox_range"
+            divide.operation = "DIVIDE"
+            divide.location = (400, 0)
+
+            # Emission 노드 (Position을 색상으로)
+            emission = nodes.new(type="ShaderNodeEmission")
+            emission.location = (600, 0)
+
+            # Material Output
+            output = nodes.new(type="ShaderNodeOutputMaterial")
+            output.location = (800, 0)
+
+            # 연결: Position -> Subtract -> Divide -> Emission -> Output
+            links.new(geom.outputs["Position"], subtract.inputs[0])
+            links.new(subtract.outputs[0], divide.inputs[0])
+            links.new(divide.outputs[0], emission.inputs["Color"])
+            links.new(emission.outputs["Emission"], output.inputs["Surface"])
+
+        nodes = mat.node_tree.nodes
+        nodes["bbox_min"].inputs[1].default_value = (bbox_min.x, bbox_min.y, bbox_min.z)
+        nodes["bbox_range"].inputs[1].default_value = (
+            max(bbox_range.x, 0.001),  # 0으로 나누기 방지
+            max(bbox_range.y, 0.001),
+            max(bbox_range.z, 0.001)
+        )
+        return mat
+
     def _extract_camera_parameters(self, scene, camera_positions, target, output_base):
         """카메라 파라미터 추출 및 JSON 저장"""
 
@@ -1476,47 +2728,13 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         pixel_aspect_x = scene.render.pixel_aspect_x
         pixel_aspect_y = scene.render.pixel_aspect_y
 
-        # Sequence 모드에 따른 설명
-        if Sequence == 1:
-            sequence_mode_desc = "40 views (8x5 grid)"
-        elif Sequence == 2:
-            sequence_mode_desc = "6 views (front, sides, back, top, bottom)"
-        elif Sequence == 3:
-            sequence_mode_desc = "44 views (11x4 grid, azimuth 15deg intervals, 4 elevations)"
-        elif Sequence == 4:
-            sequence_mode_desc = "54 views (5 rings: top-ish, mid, bottom-ish, elevation sweep, poles)"
-        else:
-            sequence_mode_desc = "10 views (default)"
+        # 모든 뷰의 카메라 파라미터를 한 번에 계산 (임시 bpy 카메라 생성 없음)
+        views = camera_parameters(
+            [cam_pos for _, cam_pos in camera_data], target, self.camera_rig.fov_deg,
+            (resolution_x, resolution_y), (pixel_aspect_x, pixel_aspect_y),
+            view_names=[view_name for view_name, _ in camera_data],
+        )
 
-        # 카메라 데이터 배열
-        views = []
-        
-        for view_idx, (view_name, cam_pos) in enumerate(camera_data):
-            # 임시 카메라 생성
-            cam_data = bpy.data.cameras.new(view_name + "_temp")
-            cam_obj = bpy.data.objects.new(view_name + "_temp", cam_data)
-            bpy.context.collection.objects.link(cam_obj)
-            
-            # 카메라 위치 및 회전 설정
-            cam_obj.location = cam_pos
-            direction = target - cam_pos
-            rot_quat = direction.to_track_quat("-Z", "Y")
-            cam_obj.rotation_euler = rot_quat.to_euler()
-            cam_data.angle = math.radians(60)
-            
-            # 카메라 변환 행렬 업데이트 강제
-            bpy.context.view_layer.update()
-            cam_obj.update_tag()
-            
-            # 카메라 파라미터 계산
-            params = self._calculate_camera_params(scene, cam_obj, cam_data, resolution_x, resolution_y, pixel_aspect_x, pixel_aspect_y)
-            params['view_name'] = view_name
-            views.append(params)
-            
-            # 임시 카메라 정리
-            bpy.data.objects.remove(cam_obj, do_unlink=True)
-            bpy.data.cameras.remove(cam_data, do_unlink=True)
-        
         # JSON 파일로 저장
         camera_params = {
             'metadata': {
@@ -1525,7 +2743,8 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
                 'pixel_aspect': [pixel_aspect_x, pixel_aspect_y],
                 'convention': 'Blender (-Z forward, +Y up)',
                 'sequence_mode': Sequence,
-                'description': sequence_mode_desc
+                'rig': self.camera_rig.name,
+                'description': self.camera_rig.description
             },
             'views': views
         }
@@ -1538,89 +2757,7 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         
         print(f"카메라 파라미터 저장 완료: {json_path}")
         print(f"총 {len(views)}개 뷰의 파라미터 추출됨")
-
-    def _calculate_camera_params(self, scene, cam_obj, cam_data, res_x, res_y, pixel_aspect_x, pixel_aspect_y):
-        """개별 카메라의 파라미터 계산"""
-        
-        # === Intrinsic Parameters (K) ===
-        # FOV에서 focal length 계산
-        fov_rad = cam_data.angle
-        focal_length_px = (res_y / 2.0) / math.tan(fov_rad / 2.0)
-        
-        # 픽셀 종횡비 반영
-        fx = focal_length_px / pixel_aspect_x
-        fy = focal_length_px / pixel_aspect_y
-        
-        # 주점 (이미지 중심 + shift)
-        cx = res_x / 2.0 + cam_data.shift_x * res_x
-        cy = res_y / 2.0 + cam_data.shift_y * res_y
-        
-        # 카메라 내참조 행렬 K
-        K = [
-            [fx, 0, cx],
-            [0, fy, cy],
-            [0, 0, 1]
-        ]
-        
-        # === Extrinsic Parameters ===
-        # 카메라 월드 행렬 (Camera to World)
-        T_cw = [list(row) for row in cam_obj.matrix_world]
-        
-        # 회전 행렬 R (3x3)와 평행이동 벡터 t (3,)
-        R = [list(row) for row in T_cw[:3][:3]]
-        t = [T_cw[0][3], T_cw[1][3], T_cw[2][3]]
-        
-        # World to Camera 변환 (World to Camera)
-        T_wc = [list(row) for row in cam_obj.matrix_world.inverted()]
-        
-        # === View Matrix (World to Camera) ===
-        view_matrix = [list(row) for row in cam_obj.matrix_world.inverted()]
-        
-        # === Projection Matrix ===
-        # OpenGL 스타일 투영 행렬 (perspective)
-        near = cam_data.clip_start
-        far = cam_data.clip_end
-        
-        # FOV 기반 투영 행렬 계산
-        f = 1.0 / math.tan(fov_rad / 2.0)
-        aspect = res_x / res_y
-        
-        projection_matrix = [
-            [f/aspect, 0, 0, 0],
-            [0, f, 0, 0],
-            [0, 0, (far + near) / (near - far), (2 * far * near) / (near - far)],
-            [0, 0, -1, 0]
-        ]
-        
-        return {
-            'intrinsic': {
-                'K': K,
-                'fx': fx,
-                'fy': fy,
-                'cx': cx,
-                'cy': cy,
-                'fov_degrees': math.degrees(fov_rad)
-            },
-            'extrinsic': {
-                'T_cw': T_cw,  # Camera to World
-                'T_wc': T_wc,  # World to Camera
-                'R': R,
-                't': t
-            },
-            'matrices': {
-                'view_matrix': view_matrix,
-                'projection_matrix': projection_matrix
-            },
-            'camera_info': {
-                'location': list(cam_obj.location),
-                'rotation_euler': list(cam_obj.rotation_euler),
-                'lens_angle_degrees': math.degrees(cam_data.angle),
-                'clip_start': near,
-                'clip_end': far,
-                'shift_x': cam_data.shift_x,
-                'shift_y': cam_data.shift_y
-            }
-        }
+        return views
 
     def _format_time(self, seconds):
         """시간을 시:분:초 형식으로 변환"""
@@ -1634,25 +2771,16 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
 
     def _log_error(self, log_path, case_idx, case_name, error_msg, traceback_str):
         """에러를 로그 파일에 기록"""
-        import datetime
-
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"[{timestamp}] Case #{case_idx}: {case_name}\n")
-            f.write(f"Error: {error_msg}\n")
-            if traceback_str:
-                f.write("\nFull Traceback:\n")
-                f.write(traceback_str)
-            f.write("=" * 80 + "\n\n")
+        self.failed_cases.append(case_name)
+        self._drop_case_plan(f"{self.parent_folder}_{case_name}")
+        write_error_log_entry(log_path, case_idx, case_name, error_msg, traceback_str)
 
     def _show_completion_message(self, output_base):
         """완료 메시지 및 파일 탐색기 열기"""
         # 활성화된 렌더링 타입에 따른 완료 메시지 생성
         completed_dirs = []
         if RENDER_LIT:
-            completed_dirs.append("lit")
+            completed_dirs.append(LIT_OUTPUT_DIRNAME)
         if RENDER_UNLIT:
             completed_dirs.append("unlit")
         if RENDER_MATT:
@@ -1666,15 +2794,16 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
         if RENDER_POSITION:
             completed_dirs.append("position")
 
-        self.report(
-            {"INFO"},
-            f"모든 케이스 이미지 저장 완료: {', '.join(completed_dirs)}",
-        )
+        message = f"모든 케이스 이미지 저장 완료: {', '.join(completed_dirs)}"
+        if self._report:
+            self._report({"INFO"}, message)
+        else:
+            print(message)
 
         # 파일 탐색기 열기 (첫 번째 활성화된 폴더 기준)
         first_active_dir = None
         if RENDER_LIT:
-            first_active_dir = os.path.join(output_base, "lit")
+            first_active_dir = os.path.join(output_base, LIT_OUTPUT_DIRNAME)
         elif RENDER_UNLIT:
             first_active_dir = os.path.join(output_base, "unlit")
         elif RENDER_MATT:
@@ -1698,6 +2827,18 @@ class OT_SelectFolderAndColorize(bpy.types.Operator):
             else:
                 subprocess.Popen(["xdg-open", first_active_dir])
 
+
+class OT_SelectFolderAndColorize(bpy.types.Operator):
+    bl_idname = "object.select_folder_and_colorize"
+    bl_label = "Select Folder and Apply Gingiva/Tooth Materials (Optimized)"
+    bl_options = {"REGISTER", "UNDO"}
+
+    folder_path: bpy.props.StringProperty(name="folder", subtype="DIR_PATH")
+
+    def execute(self, context):
+        RenderPipeline(self.folder_path, self.report).run()
+        return {"FINISHED"}
+
     def invoke(self, context, event):
         wm = context.window_manager
         return wm.invoke_props_dialog(self)
@@ -1708,6 +2849,7 @@ def menu_func(self, context):
 
 
 def register():
+    _open_progress_console()
     bpy.utils.register_class(OT_SelectFolderAndColorize)
     bpy.types.TOPBAR_MT_file.append(menu_func)
 
@@ -1717,8 +2859,119 @@ def unregister():
     bpy.types.TOPBAR_MT_file.remove(menu_func)
 
 
+RENDER_PASS_NAMES = ('lit', 'unlit', 'matt', 'depth', 'normal', 'curvature', 'position')
+
+
+def _parse_case_range(text):
+    """"100:200" → (100, 200), "100:" → (100, None), "5" → (5, 5) (1부터, 끝 포함 = START_CASE/MAX_CASES)"""
+    start, sep, end = text.partition(":")
+    start = int(start) if start else 1
+    if not sep:
+        return start, start
+    return start, int(end) if end else None
+
+
+def _parse_setting(text):
+    """"NAME=VALUE" → (NAME, 값) (값은 Python 리터럴, 아니면 문자열)"""
+    import ast
+
+    name, sep, value = text.partition("=")
+    if not sep or name not in globals() or not name[0].isupper() or callable(globals()[name]):
+        raise ValueError(f"알 수 없는 설정: {text} (모듈 상단의 설정 변수 이름=값)")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+
+def main(argv):
+    """커맨드라인 실행: 인자로 모듈 설정을 바꾼 뒤 UI 오퍼레이터와 같은 RenderPipeline 실행
+
+    blender -b -P toothrendering_optimized.py -- --input <케이스 루트 폴더> --passes unlit,depth --rig seq4 --cases 100:200
+
+    반환값: 에러가 기록된 케이스 수 (Blender exit code는 0이 아니면 EXIT_CASE_ERRORS)
+    """
+    import argparse
+    global START_CASE, MAX_CASES, CAMERA_RIG, USE_OPTIMIZED_FORMATS, Reverses
+    global CASE_LIST_FILE, ERROR_LOG_PATH, RUN_SUMMARY_PATH, RENDER_JOURNAL_PATH, RESUME, WORK_QUEUE_DIR, DEADLINE
+
+    parser = argparse.ArgumentParser(prog="toothrendering_optimized.py", description="Tooth rendering (headless)")
+    parser.add_argument("--input", required=True, help="케이스 루트 폴더")
+    parser.add_argument("--passes", default=None,
+                        help=f"렌더링 타입 (쉼표 구분: {','.join(RENDER_PASS_NAMES)}), 기본값: 파일의 RENDER_* 설정")
+    parser.add_argument("--rig", default=None, help="카메라 rig 이름 (toothrendering_rigs.py list)")
+    parser.add_argument("--cases", default=None, help="케이스 범위 START:END (1부터, 끝 포함), 예: 100:200, 100:")
+    parser.add_argument("--case-list", default=None, help="케이스 폴더 이름 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--reverse", action="store_true", help="폴더 순서 역순")
+    parser.add_argument("--formats", choices=("png", "optimized"), default=None,
+                        help="png: 모두 PNG, optimized: WebP/EXR")
+    parser.add_argument("--error-log", default=None, help="기본값: output/error_log.txt")
+    parser.add_argument("--summary", default=None, help="실행 요약 JSON 저장 경로")
+    parser.add_argument("--journal", default=None,
+                        help="렌더링 완료 저널 경로 (기본값 \"auto\": output/render_journal.jsonl, \"none\": 기록 안 함)")
+    parser.add_argument("--resume", action="store_true", help="저널에 완료로 기록된 (케이스, 렌더링 타입, 뷰) 건너뛰기")
+    parser.add_argument("--queue", default=None,
+                        help="공유 작업 큐 폴더 (\"auto\": output/queue): 여러 노드가 같은 케이스 범위를 나눠 렌더링")
+    parser.add_argument("--deadline", default=None,
+                        help="마감 모드 목표 시각 (\"YYYY-MM-DD HH:MM\" 또는 시작부터의 초): lit 샘플 수/선택 렌더링 타입 자동 조절")
+    parser.add_argument("--plan", action="store_true",
+                        help="렌더링하지 않고 비용 모델로 전체 예상 시간과 디스크 사용량만 출력")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="그 밖의 모듈 설정 변경 (여러 번 사용 가능), 예: --set ENGINE_MAJOR_BLOCK=4")
+    args = parser.parse_args(argv)
+
+    # 진행 상황을 파이프(렌더 팜 코디네이터 등)에서도 바로 읽을 수 있도록 줄 단위 출력
+    sys.stdout.reconfigure(line_buffering=True)
+
+    for text in args.set:
+        name, value = _parse_setting(text)
+        globals()[name] = value
+    if args.passes is not None:
+        passes = [p.strip() for p in args.passes.split(",") if p.strip()]
+        unknown = sorted(set(passes) - set(RENDER_PASS_NAMES))
+        if unknown:
+            parser.error(f"알 수 없는 렌더링 타입: {', '.join(unknown)}")
+        for name in RENDER_PASS_NAMES:
+            globals()[f"RENDER_{name.upper()}"] = name in passes
+    if args.rig:
+        CAMERA_RIG = args.rig
+    if args.formats:
+        USE_OPTIMIZED_FORMATS = args.formats == "optimized"
+    if args.reverse:
+        Reverses = True
+    if args.case_list:
+        CASE_LIST_FILE = args.case_list
+        with open(args.case_list, encoding='utf-8') as f:
+            START_CASE, MAX_CASES = 1, sum(1 for line in f if line.strip())
+    if args.cases:
+        START_CASE, end_case = _parse_case_range(args.cases)
+        MAX_CASES = end_case if end_case is not None else len(list_case_folders(args.input))
+    if args.error_log:
+        ERROR_LOG_PATH = args.error_log
+    if args.summary:
+        RUN_SUMMARY_PATH = args.summary
+    if args.journal:
+        RENDER_JOURNAL_PATH = None if args.journal.lower() == "none" else args.journal
+    if args.resume:
+        RESUME = True
+    if args.queue:
+        WORK_QUEUE_DIR = args.queue
+    if args.deadline:
+        DEADLINE = args.deadline
+
+    pipeline = RenderPipeline(os.path.abspath(args.input))
+    if args.plan:
+        pipeline.plan()
+        return 0
+    return pipeline.run()
+
+
 if __name__ == "__main__":
-    register()
+    if "--" in sys.argv:
+        # 케이스 에러가 있으면 EXIT_CASE_ERRORS로 종료 (렌더 팜과 스케줄러가 실패를 알 수 있도록)
+        sys.exit(EXIT_CASE_ERRORS if main(sys.argv[sys.argv.index("--") + 1:]) else 0)
+    else:
+        register()
 
 # 512x512
 # depth map
@@ -0,0 +1,333 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+'''
+공유 파일시스템 작업 큐 모듈
+- 여러 렌더링 노드가 중앙 서버 없이 같은 입력 폴더의 케이스를 나눠 처리
+- 케이스마다 lease 파일(queue/leases/<케이스>.lease)을 O_EXCL로 만들어 원자적으로 가져감
+- lease를 가진 동안 백그라운드 스레드가 lease 파일 mtime을 heartbeat로 갱신
+- heartbeat가 LEASE_SECONDS 넘게 멈춘 lease(죽은 노드)는 rename으로 하나의 노드만 회수해서 다시 큐에 넣음
+- 처리가 끝난 케이스는 queue/done/<케이스>.done에 결과 기록 (에러 케이스도 done으로 기록, 다시 시도하지 않음)
+- bpy 없이 동작 (일반 Python으로 실행)
+
+실행 예시:
+  python toothrendering_queue.py status <큐 폴더>
+  python toothrendering_queue.py simulate --workers 4 --cases 40   (임시 폴더에서 워커 프로세스 여러 개로 동작 확인)
+'''
+
+QUEUE_DIRNAME = "queue"
+LEASE_SECONDS = 600.0  # heartbeat가 이 시간 넘게 갱신되지 않으면 lease 만료 (노드 간 시계 차이보다 충분히 크게)
+HEARTBEAT_SECONDS = 60.0  # lease 파일 mtime 갱신 간격
+WAIT_SECONDS = 30.0  # 남은 케이스가 모두 다른 노드에 lease된 상태일 때 만료 확인 간격
+
+
+def default_queue_dir(output_base):
+    """기본 큐 위치: output/queue"""
+    return os.path.join(output_base, QUEUE_DIRNAME)
+
+
+def default_owner():
+    """lease 소유자 이름: 호스트명-pid"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _write_json_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class WorkQueue:
+    """케이스 목록을 여러 프로세스/노드가 lease로 나눠 가져가는 큐
+
+    모든 워커가 같은 케이스 목록을 사용하고, 목록 순서대로 done도 lease도 없는 케이스를 가져감.
+    for case in queue: ... 는 남은 케이스가 모두 다른 워커에 lease되어 있으면 만료될 때까지 기다렸다가
+    회수하고, 모든 케이스가 done이 되면 끝남.
+    """
+
+    def __init__(self, queue_dir, cases, owner=None, lease_seconds=LEASE_SECONDS,
+                 heartbeat_seconds=HEARTBEAT_SECONDS, wait_seconds=WAIT_SECONDS):
+        self.queue_dir = queue_dir
+        self.cases = list(cases)
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.wait_seconds = wait_seconds
+        self.lease_dir = os.path.join(queue_dir, "leases")
+        self.done_dir = os.path.join(queue_dir, "done")
+        os.makedirs(self.lease_dir, exist_ok=True)
+        os.makedirs(self.done_dir, exist_ok=True)
+
+        self.held = set()
+        self.reclaimed = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._heartbeat.start()
+
+    def _lease_path(self, case):
+        return os.path.join(self.lease_dir, f"{case}.lease")
+
+    def _done_path(self, case):
+        return os.path.join(self.done_dir, f"{case}.done")
+
+    def _try_acquire(self, case):
+        """lease 파일을 O_EXCL로 생성 (이미 있으면 False)"""
+        try:
+            fd = os.open(self._lease_path(case), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"owner": self.owner, "acquired": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+        # 다른 워커가 lease 생성과 done 확인 사이에 끝낸 케이스면 바로 반납
+        if os.path.exists(self._done_path(case)):
+            os.remove(self._lease_path(case))
+            return False
+        with self._lock:
+            self.held.add(case)
+        return True
+
+    def _reclaim_expired(self, case):
+        """heartbeat가 멈춘 lease를 rename으로 치움 (여러 워커가 동시에 시도해도 한 워커만 성공)"""
+        lease_path = self._lease_path(case)
+        try:
+            age = time.time() - os.path.getmtime(lease_path)
+        except OSError:
+            return True  # 그 사이 반납됨
+        if age < self.lease_seconds:
+            return False
+        stale_path = f"{lease_path}.{self.owner}.stale"
+        try:
+            os.rename(lease_path, stale_path)
+        except OSError:
+            return False  # 다른 워커가 먼저 회수
+        # 확인과 rename 사이에 다른 워커가 회수 후 새로 만든 lease를 치웠으면 되돌림
+        if time.time() - os.path.getmtime(stale_path) < self.lease_seconds:
+            try:
+                os.link(stale_path, lease_path)
+            except OSError:
+                pass
+            os.remove(stale_path)
+            return False
+        previous = _read_json(stale_path) or {}
+        os.remove(stale_path)
+        self.reclaimed += 1
+        print(f"  [QUEUE] Reclaimed expired lease: {case} (owner {previous.get('owner', '?')}, "
+              f"heartbeat {age:.0f}s ago)")
+        return True
+
+    def claim(self):
+        """다음 케이스 lease → 케이스 이름, 지금 가져갈 케이스가 없으면 None"""
+        done = set(os.listdir(self.done_dir))
+        leased = set(os.listdir(self.lease_dir))
+        for case in self.cases:
+            if f"{case}.done" in done or case in self.held:
+                continue
+            if f"{case}.lease" in leased and not self._reclaim_expired(case):
+                continue
+            if self._try_acquire(case):
+                return case
+        return None
+
+    def remaining(self):
+        """아직 done이 아닌 케이스 수"""
+        done = set(os.listdir(self.done_dir))
+        return sum(f"{case}.done" not in done for case in self.cases)
+
+    def done_cases(self):
+        """done으로 기록된 케이스 이름 (모든 워커)"""
+        return {name[:-len(".done")] for name in os.listdir(self.done_dir) if name.endswith(".done")}
+
+    def __iter__(self):
+        while True:
+            case = self.claim()
+            if case is not None:
+                yield case
+            elif self.remaining() - len(self.held) > 0:
+                # 남은 케이스는 다른 워커가 처리 중: lease가 만료되면 회수
+                time.sleep(self.wait_seconds)
+            else:
+                return
+
+    def complete(self, case, status="ok", info=None):
+        """케이스 처리 결과를 done에 기록하고 lease 반납"""
+        result = {"case": case, "status": status, "owner": self.owner,
+                  "finished": time.strftime("%Y-%m-%d %H:%M:%S")}
+        result.update(info or {})
+        _write_json_atomic(self._done_path(case), result)
+        self.release(case)
+
+    def release(self, case):
+        """lease 반납 (done 기록 없이, 다른 워커가 다시 가져갈 수 있음)"""
+        with self._lock:
+            self.held.discard(case)
+        lease = _read_json(self._lease_path(case))
+        # 만료로 회수된 뒤 다른 워커가 다시 가져간 lease는 건드리지 않음
+        if lease is not None and lease.get("owner") == self.owner:
+            try:
+                os.remove(self._lease_path(case))
+            except FileNotFoundError:
+                pass
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            with self._lock:
+                held = list(self.held)
+            for case in held:
+                try:
+                    os.utime(self._lease_path(case))
+                except OSError:
+                    pass
+
+    def close(self):
+        """heartbeat 중지, 끝내지 못한 케이스 lease 반납"""
+        self._stop.set()
+        self._heartbeat.join()
+        for case in list(self.held):
+            self.release(case)
+
+
+def queue_status(queue_dir, lease_seconds=LEASE_SECONDS):
+    """큐 상태 dict: done(상태별), 진행 중/만료 lease"""
+    lease_dir = os.path.join(queue_dir, "leases")
+    done_dir = os.path.join(queue_dir, "done")
+    by_status = {}
+    for name in os.listdir(done_dir) if os.path.isdir(done_dir) else []:
+        result = _read_json(os.path.join(done_dir, name)) or {}
+        status = result.get("status", "?")
+        by_status[status] = by_status.get(status, 0) + 1
+    active, expired = [], []
+    now = time.time()
+    for name in os.listdir(lease_dir) if os.path.isdir(lease_dir) else []:
+        if not name.endswith(".lease"):
+            continue
+        path = os.path.join(lease_dir, name)
+        try:
+            age = now - os.path.getmtime(path)
+        except OSError:
+            continue
+        lease = _read_json(path) or {}
+        row = {"case": name[:-len(".lease")], "owner": lease.get("owner"), "heartbeat_age": round(age, 1)}
+        (expired if age >= lease_seconds else active).append(row)
+    return {"done": by_status, "active": active, "expired": expired}
+
+
+def _drain(queue_dir, cases_file, work_seconds, crash_after, lease_seconds, heartbeat_seconds, record_path):
+    """simulate용 워커: 케이스를 가져갈 때마다 work_seconds 동안 작업한 것처럼 기다리고 완료 기록"""
+    with open(cases_file, encoding="utf-8") as f:
+        cases = [line.strip() for line in f if line.strip()]
+    queue = WorkQueue(queue_dir, cases, lease_seconds=lease_seconds, heartbeat_seconds=heartbeat_seconds,
+                      wait_seconds=heartbeat_seconds)
+    count = 0
+    with open(record_path, "a", encoding="utf-8") as record:
+        for case in queue:
+            if crash_after is not None and count >= crash_after:
+                os._exit(3)  # lease를 반납하지 않고 죽은 노드 흉내
+            time.sleep(work_seconds)
+            record.write(case + "\n")
+            record.flush()
+            queue.complete(case)
+            count += 1
+    queue.close()
+
+
+def simulate(workers=4, case_count=40, work_seconds=0.05, crash_workers=1, lease_seconds=2.0):
+    """임시 폴더 하나에서 워커 프로세스 여러 개로 큐를 비우고 모든 케이스가 처리됐는지 확인 (문제가 있으면 False)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_dir = os.path.join(tmp, QUEUE_DIRNAME)
+        cases_file = os.path.join(tmp, "cases.txt")
+        cases = [f"case_{i:04d}" for i in range(case_count)]
+        with open(cases_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(cases) + "\n")
+
+        start_time = time.time()
+        processes = []
+        for i in range(workers):
+            crash_after = 2 if i < crash_workers else None
+            cmd = [sys.executable, os.path.abspath(__file__), "_drain", queue_dir, cases_file,
+                   "--work-seconds", str(work_seconds), "--lease-seconds", str(lease_seconds),
+                   "--heartbeat-seconds", str(lease_seconds / 4),
+                   "--record", os.path.join(tmp, f"worker_{i:02d}.txt")]
+            if crash_after is not None:
+                cmd += ["--crash-after", str(crash_after)]
+            processes.append(subprocess.Popen(cmd))
+        exit_codes = [p.wait() for p in processes]
+
+        processed = {}
+        for i in range(workers):
+            path = os.path.join(tmp, f"worker_{i:02d}.txt")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        processed[line.strip()] = processed.get(line.strip(), 0) + 1
+        missing = [case for case in cases if case not in processed]
+        duplicates = [case for case, count in processed.items() if count > 1]
+        status = queue_status(queue_dir, lease_seconds)
+
+        print(f"Workers: {workers} (crashed {crash_workers}), exit codes {exit_codes}")
+        print(f"Cases: {len(cases)}, processed {len(processed)}, missing {len(missing)}, "
+              f"duplicates {len(duplicates)}, done {status['done']}, "
+              f"leases left {len(status['active']) + len(status['expired'])}")
+        print(f"Elapsed: {time.time() - start_time:.1f}s")
+        return not missing and not duplicates and not status["active"] and not status["expired"]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering shared work queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    status = sub.add_parser("status", help="큐 상태 출력 (done, 진행 중/만료 lease)")
+    status.add_argument("queue_dir")
+    status.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+
+    sim = sub.add_parser("simulate", help="임시 폴더에서 워커 프로세스 여러 개로 큐 동작 확인")
+    sim.add_argument("--workers", type=int, default=4)
+    sim.add_argument("--cases", type=int, default=40)
+    sim.add_argument("--work-seconds", type=float, default=0.05)
+    sim.add_argument("--crash-workers", type=int, default=1, help="케이스 2개 처리 후 lease를 쥔 채 죽는 워커 수")
+    sim.add_argument("--lease-seconds", type=float, default=2.0)
+
+    drain = sub.add_parser("_drain")
+    drain.add_argument("queue_dir")
+    drain.add_argument("cases_file")
+    drain.add_argument("--work-seconds", type=float, default=0.05)
+    drain.add_argument("--crash-after", type=int, default=None)
+    drain.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    drain.add_argument("--heartbeat-seconds", type=float, default=HEARTBEAT_SECONDS)
+    drain.add_argument("--record", required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        result = queue_status(args.queue_dir, args.lease_seconds)
+        print(f"Done: {result['done']}")
+        print(f"Active leases: {len(result['active'])}, expired: {len(result['expired'])}")
+        for row in result["active"] + result["expired"]:
+            print(f"  {row['case']}: {row['owner']} (heartbeat {row['heartbeat_age']:.0f}s ago)")
+    elif args.command == "simulate":
+        ok = simulate(args.workers, args.cases, args.work_seconds, args.crash_workers, args.lease_seconds)
+        sys.exit(0 if ok else 1)
+    elif args.command == "_drain":
+        _drain(args.queue_dir, args.cases_file, args.work_seconds, args.crash_after, args.lease_seconds,
+               args.heartbeat_seconds, args.record)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+try:
+    import mathutils
+except ImportError:  # Blender 밖(일반 Python)에서 import 하는 경우
+    mathutils = None
+
+'''
+카메라 rig 정의 모듈
+- rig는 데이터(dict)로 정의: 타깃, 거리, FOV + 뷰 그룹 목록
+- 뷰 그룹 종류
+    directions: 이름과 방향 벡터를 직접 지정
+    grid: elevation(X축 회전) × azimuth(Z축 회전) 격자, 기준 방향 (0, -1, 0) (elevation 바깥 루프)
+    path: 키포인트 위치 사이를 선형 보간 (구간마다 frames_per_segment장, 양 끝 포함)
+- 뷰 이름은 str.format 템플릿: {index} (그룹 내 1부터), {frame} (rig 전체 0부터),
+  {elevation}, {azimuth}, {elevation_idx}, {azimuth_idx}, {start}, {end} (path 구간의 키포인트 이름)
+- 모든 그룹의 위치를 NumPy로 한 번에 계산하고 이름별로 캐시
+
+실행 예시:
+  python toothrendering_rigs.py list
+  python toothrendering_rigs.py show seq4
+  python toothrendering_rigs.py verify sequence_40.json --rig seq1  (해석적 카메라 파라미터 검증)
+'''
+
+BASE_DIRECTION = (0.0, -1.0, 0.0)  # 정면
+
+DEFAULT_TARGET = (0.0, 100.0, 0.0)
+DEFAULT_DISTANCE = 100.0
+DEFAULT_FOV_DEG = 60.0
+
+_TEN_VIEW_DIRECTIONS = [
+    ("front", (0, -1, 0)),
+    ("top", (0, -1, 1)),
+    ("bottom", (0, -1, -1)),
+    ("right", (1, -1, 0)),
+    ("left", (-1, -1, 0)),
+    ("front_top_right", (1, -1, 1)),
+    ("front_top_left", (-1, -1, 1)),
+    ("front_bottom_right", (1, -1, -1)),
+    ("front_bottom_left", (-1, -1, -1)),
+    ("front_slightly_up", (0, -1, 0.5)),
+]
+
+# 내장 rig (Sequence 0~4, toothrendering.py의 30장 orbit)
+BUILTIN_RIGS = [
+    {
+        "name": "seq0",
+        "description": "10 views (default)",
+        "groups": [{"type": "directions", "views": _TEN_VIEW_DIRECTIONS}],
+    },
+    {
+        "name": "seq1",
+        "description": "40 views (8x5 grid)",
+        "groups": [{
+            "type": "grid",
+            "elevations": [-20, -10, 0, 10, 20],
+            "azimuths": [0, 45, 90, 135, 180, 225, 270, 315],
+            "name": "z_{azimuth_idx:02d}_x{elevation:+03d}",
+        }],
+    },
+    {
+        "name": "seq2",
+        "description": "6 views (front, sides, back, top, bottom)",
+        "groups": [{
+            "type": "directions",
+            "views": [
+                ("view_0", (-1, 0, 0)),  # 왼쪽
+                ("view_1", (0, -1, 0)),  # 정면
+                ("view_2", (1, 0, 0)),  # 오른쪽
+                ("view_3", (0, 1, 0)),  # 뒤
+                ("view_4", (0, 0, 1)),  # 위
+                ("view_5", (0, 0, -1)),  # 아래
+            ],
+        }],
+    },
+    {
+        "name": "seq3",
+        "description": "44 views (11x4 grid, azimuth 15deg intervals, 4 elevations)",
+        "groups": [{
+            "type": "grid",
+            "elevations": [-15, 0, 15, 30],
+            "azimuths": [-75, -60, -45, -30, -15, 0, 15, 30, 45, 60, 75],
+            "name": "elev{elevation:+03d}_azim{azimuth:+03d}",
+        }],
+    },
+    {
+        "name": "seq4",
+        "description": "54 views (5 rings: top-ish, mid, bottom-ish, elevation sweep, poles)",
+        "groups": [
+            {"type": "grid", "elevations": [30], "azimuths": [i * 30 for i in range(12)], "name": "ring1_{index:05d}"},
+            {"type": "grid", "elevations": [0], "azimuths": [i * 20 for i in range(18)], "name": "ring2_{index:05d}"},
+            {"type": "grid", "elevations": [-30], "azimuths": [i * 30 for i in range(12)], "name": "ring3_{index:05d}"},
+            {"type": "grid", "elevations": [60 - i * 12 for i in range(10)], "azimuths": [0], "name": "ring4_{index:05d}"},
+            {"type": "grid", "elevations": [90, -90], "azimuths": [90], "name": "ring5_{index:05d}"},
+        ],
+    },
+    {
+        "name": "orbit30",
+        "description": "30 frames (top -> left -> bottom orbit)",
+        "groups": [{
+            "type": "path",
+            "keypoints": [("top", (0, -1, 1)), ("left", (-1, -1, 0)), ("bottom", (0, -1, -1))],
+            "frames_per_segment": 15,
+            "name": "seq_{frame:02d}_{start}_to_{end}",
+        }],
+    },
+]
+
+# Sequence 설정값 → 내장 rig 이름
+SEQUENCE_RIGS = {0: "seq0", 1: "seq1", 2: "seq2", 3: "seq3", 4: "seq4"}
+
+_RIG_DEFINITIONS = {}
+_RIG_CACHE = {}
+
+
+class CameraRig:
+    """생성된 rig: 뷰 이름 목록과 카메라 위치 배열 (N, 3)"""
+
+    def __init__(self, name, description, target, distance, fov_deg, view_names, positions):
+        self.name = name
+        self.description = description
+        self.target = target
+        self.distance = distance
+        self.fov_deg = fov_deg
+        self.view_names = view_names
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.view_names)
+
+    def camera_positions(self):
+        """[(뷰 이름, mathutils.Vector 위치)] - 기존 camera_positions 리스트와 같은 형식"""
+        return [(name, mathutils.Vector(pos.tolist())) for name, pos in zip(self.view_names, self.positions)]
+
+    def target_vector(self):
+        return mathutils.Vector(self.target.tolist())
+
+
+def _rotation_matrices(axis, angles_deg):
+    """축 회전 행렬 (N, 3, 3) - mathutils.Matrix.Rotation과 같은 방향"""
+    angles = np.radians(np.asarray(angles_deg, dtype=np.float64))
+    c, s = np.cos(angles), np.sin(angles)
+    one, zero = np.ones_like(angles), np.zeros_like(angles)
+    if axis == "X":
+        rows = [[one, zero, zero], [zero, c, -s], [zero, s, c]]
+    elif axis == "Z":
+        rows = [[c, -s, zero], [s, c, zero], [zero, zero, one]]
+    else:
+        raise ValueError(f"지원하지 않는 회전 축: {axis}")
+    return np.moveaxis(np.array(rows), -1, 0)
+
+
+def _normalized(vectors):
+    vectors = np.asarray(vectors, dtype=np.float64)
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _directions_group(group, frame_offset):
+    names = [name for name, _ in group["views"]]
+    directions = _normalized([direction for _, direction in group["views"]])
+    template = group.get("name")
+    if template:
+        names = [template.format(index=i + 1, frame=frame_offset + i, view=name) for i, name in enumerate(names)]
+    return names, directions, None
+
+
+def _grid_group(group, frame_offset):
+    elevations = np.asarray(group["elevations"])
+    azimuths = np.asarray(group["azimuths"])
+    elevation_grid, azimuth_grid = np.meshgrid(elevations, azimuths, indexing="ij")  # elevation 바깥 루프
+    rotation = _rotation_matrices("Z", azimuth_grid.ravel()) @ _rotation_matrices("X", elevation_grid.ravel())
+    directions = _normalized(rotation @ np.asarray(BASE_DIRECTION))
+
+    names = []
+    for i, (elevation_idx, azimuth_idx) in enumerate(np.ndindex(len(elevations), len(azimuths))):
+        names.append(group["name"].format(
+            index=i + 1,
+            frame=frame_offset + i,
+            elevation=group["elevations"][elevation_idx],
+            azimuth=group["azimuths"][azimuth_idx],
+            elevation_idx=elevation_idx,
+            azimuth_idx=azimuth_idx,
+        ))
+    return names, directions, None
+
+
+def _path_group(group, frame_offset, target, distance):
+    keypoint_names = [name for name, _ in group["keypoints"]]
+    keypoints = target + _normalized([direction for _, direction in group["keypoints"]]) * distance
+    frames = group["frames_per_segment"]
+    t = np.arange(frames) / (frames - 1)
+
+    names, positions = [], []
+    for segment in range(len(keypoints) - 1):
+        start, end = keypoints[segment], keypoints[segment + 1]
+        positions.append(start + (end - start) * t[:, None])
+        for i in range(frames):
+            names.append(group["name"].format(
+                index=segment * frames + i + 1,
+                frame=frame_offset + segment * frames + i,
+                start=keypoint_names[segment],
+                end=keypoint_names[segment + 1],
+            ))
+    return names, None, np.concatenate(positions)
+
+
+def build_rig(definition):
+    """rig 정의(dict) → CameraRig (모든 뷰 위치를 NumPy로 계산)"""
+    target = np.asarray(definition.get("target", DEFAULT_TARGET), dtype=np.float64)
+    distance = float(definition.get("distance", DEFAULT_DISTANCE))
+
+    view_names, positions = [], []
+    for group in definition["groups"]:
+        kind = group["type"]
+        if kind == "directions":
+            names, directions, group_positions = _directions_group(group, len(view_names))
+        elif kind == "grid":
+            names, directions, group_positions = _grid_group(group, len(view_names))
+        elif kind == "path":
+            names, directions, group_positions = _path_group(group, len(view_names), target, distance)
+        else:
+            raise ValueError(f"알 수 없는 뷰 그룹 종류: {kind} (rig {definition['name']})")
+        if group_positions is None:
+            group_positions = target + directions * group.get("distance", distance)
+        view_names.extend(names)
+        positions.append(group_positions)
+
+    if len(set(view_names)) != len(view_names):
+        raise ValueError(f"rig {definition['name']}에 중복된 뷰 이름이 있습니다")
+
+    return CameraRig(
+        name=definition["name"],
+        description=definition.get("description", f"{len(view_names)} views"),
+        target=target,
+        distance=distance,
+        fov_deg=float(definition.get("fov_deg", DEFAULT_FOV_DEG)),
+        view_names=view_names,
+        positions=np.concatenate(positions) if positions else np.empty((0, 3)),
+    )
+
+
+def register_rig(definition, replace=False):
+    """rig 정의 등록 (같은 이름이 있으면 replace=True일 때만 덮어씀)"""
+    name = definition["name"]
+    if name in _RIG_DEFINITIONS and not replace:
+        raise ValueError(f"이미 등록된 rig 이름: {name}")
+    _RIG_DEFINITIONS[name] = definition
+    _RIG_CACHE.pop(name, None)
+
+
+def register_rig_file(path, replace=False):
+    """JSON 파일의 rig 정의 등록 (rig 하나의 dict 또는 dict 리스트), 등록된 이름 목록 반환"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    definitions = data if isinstance(data, list) else [data]
+    for definition in definitions:
+        register_rig(definition, replace)
+    return [definition["name"] for definition in definitions]
+
+
+def rig_names():
+    return list(_RIG_DEFINITIONS)
+
+
+def get_rig(name):
+    """등록된 rig 반환 (한 번 생성한 rig는 캐시)"""
+    if name not in _RIG_CACHE:
+        if name not in _RIG_DEFINITIONS:
+            raise KeyError(f"등록되지 않은 rig: {name} (사용 가능: {', '.join(_RIG_DEFINITIONS)})")
+        _RIG_CACHE[name] = build_rig(_RIG_DEFINITIONS[name])
+    return _RIG_CACHE[name]
+
+
+def sequence_rig(sequence):
+    """Sequence 설정값(0~4)에 해당하는 내장 rig"""
+    if sequence not in SEQUENCE_RIGS:
+        raise KeyError(f"알 수 없는 Sequence 값: {sequence}")
+    return get_rig(SEQUENCE_RIGS[sequence])
+
+
+for _definition in BUILTIN_RIGS:
+    register_rig(_definition)
+
+
+# === 카메라 파라미터 (bpy 카메라 없이 해석적으로 계산) ===
+# Blender의 vec_to_quat / quat_to_eul / eul_to_mat3를 그대로 옮긴 것.
+# Blender는 위치, 회전, 화각, clip 값을 float32로 저장하므로 입력을 float32로 반올림한 뒤 계산.
+
+_FLT_EPSILON = float(np.finfo(np.float32).eps)
+
+
+def _f32(values):
+    return np.asarray(values, dtype=np.float32).astype(np.float64)
+
+
+def _quat_multiply(a, b):
+    """쿼터니언 곱 a * b (w, x, y, z), (N, 4)"""
+    a0, a1, a2, a3 = np.moveaxis(a, -1, 0)
+    b0, b1, b2, b3 = np.moveaxis(b, -1, 0)
+    return np.stack([
+        a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3,
+        a0 * b1 + a1 * b0 + a2 * b3 - a3 * b2,
+        a0 * b2 + a2 * b0 + a3 * b1 - a1 * b3,
+        a0 * b3 + a3 * b0 + a1 * b2 - a2 * b1,
+    ], axis=-1)
+
+
+def _quat_to_matrix(q):
+    """단위 쿼터니언 → 회전 행렬 (N, 3, 3), 행 우선"""
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=-1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=-1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=-1),
+    ], axis=-2)
+
+
+def track_quaternions(directions):
+    """방향 벡터들의 Vector.to_track_quat("-Z", "Y") (N, 4) - Blender vec_to_quat(axis=-Z, up=Y)"""
+    # to_track_quat은 벡터를 뒤집어서 vec_to_quat에 넘기고, 음의 축(-Z)은 그대로 사용하므로 tvec = -방향 벡터
+    tvec = -np.asarray(directions, dtype=np.float64)
+    length = np.linalg.norm(tvec, axis=-1)
+    safe_length = np.where(length == 0.0, 1.0, length)
+
+    # Z축을 방향 벡터로 돌리는 최소 회전
+    nor = np.stack([-tvec[:, 1], tvec[:, 0], np.zeros(len(tvec))], axis=-1)
+    degenerate = np.abs(tvec[:, 0]) + np.abs(tvec[:, 1]) < 1e-4
+    nor[degenerate, 0] = 1.0
+    nor /= np.linalg.norm(nor, axis=-1, keepdims=True)
+    half_angle = 0.5 * np.arccos(np.clip(tvec[:, 2] / safe_length, -1.0, 1.0))
+    q = np.concatenate([np.cos(half_angle)[:, None], nor * np.sin(half_angle)[:, None]], axis=-1)
+
+    # 방향 벡터 축 회전으로 Y축을 위쪽에 맞춤
+    z_axis = _quat_to_matrix(q)[:, :, 2]
+    angle = -0.5 * np.arctan2(-z_axis[:, 0], -z_axis[:, 1])
+    q2 = np.concatenate([np.cos(angle)[:, None], tvec * (np.sin(angle) / safe_length)[:, None]], axis=-1)
+    q = _quat_multiply(q2, q)
+
+    # 길이 0인 벡터는 단위 쿼터니언
+    q[length == 0.0] = (1.0, 0.0, 0.0, 0.0)
+    return q
+
+
+def quaternions_to_euler(q):
+    """Quaternion.to_euler() (XYZ 순서, 두 해 중 절댓값 합이 작은 쪽) (N, 3)"""
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    m = _quat_to_matrix(q)
+    cy = np.hypot(m[:, 0, 0], m[:, 1, 0])
+
+    eul1 = np.stack([np.arctan2(m[:, 2, 1], m[:, 2, 2]), np.arctan2(-m[:, 2, 0], cy),
+                     np.arctan2(m[:, 1, 0], m[:, 0, 0])], axis=-1)
+    eul2 = np.stack([np.arctan2(-m[:, 2, 1], -m[:, 2, 2]), np.arctan2(-m[:, 2, 0], -cy),
+                     np.arctan2(-m[:, 1, 0], -m[:, 0, 0])], axis=-1)
+    gimbal = np.stack([np.arctan2(-m[:, 1, 2], m[:, 1, 1]), np.arctan2(-m[:, 2, 0], cy),
+                       np.zeros(len(q))], axis=-1)
+
+    regular = (cy > 16.0 * _FLT_EPSILON)[:, None]
+    eul1 = np.where(regular, eul1, gimbal)
+    eul2 = np.where(regular, eul2, gimbal)
+    use_second = np.abs(eul1).sum(axis=-1) > np.abs(eul2).sum(axis=-1)
+    return np.where(use_second[:, None], eul2, eul1)
+
+
+def euler_to_matrices(eul):
+    """XYZ 오일러 → 회전 행렬 (N, 3, 3), 행 우선 (Rz @ Ry @ Rx)"""
+    ci, cj, ch = np.cos(eul).T
+    si, sj, sh = np.sin(eul).T
+    cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+    return np.stack([
+        np.stack([cj * ch, sj * sc - cs, sj * cc + ss], axis=-1),
+        np.stack([cj * sh, sj * ss + cc, sj * cs - sc], axis=-1),
+        np.stack([-sj, cj * si, cj * ci], axis=-1),
+    ], axis=-2)
+
+
+def camera_parameters(positions, target, fov_deg=DEFAULT_FOV_DEG, resolution=(512, 512), pixel_aspect=(1.0, 1.0),
+                      clip_start=0.1, clip_end=1000.0, shift=(0.0, 0.0), view_names=None):
+    """카메라 위치들의 K, T_cw, T_wc, R, t, view/projection 행렬을 한 번에 계산
+
+    반환 형식은 toothrendering_optimized.py의 카메라 파라미터 JSON과 같음 (views 리스트).
+    R은 기존 출력과 같이 T_cw의 위 3행 (3x4).
+    """
+    res_x, res_y = resolution
+    pixel_aspect_x, pixel_aspect_y = pixel_aspect
+    shift_x, shift_y = (float(v) for v in _f32(shift))
+    near, far = (float(v) for v in _f32([clip_start, clip_end]))
+    fov_rad = float(_f32(math.radians(fov_deg)))
+
+    locations = _f32(positions).reshape(-1, 3)
+    directions = _f32(_f32(target)[None, :] - locations)
+    rotation_euler = _f32(quaternions_to_euler(track_quaternions(directions)))
+
+    T_cw = np.zeros((len(locations), 4, 4))
+    T_cw[:, :3, :3] = _f32(euler_to_matrices(rotation_euler))
+    T_cw[:, :3, 3] = locations
+    T_cw[:, 3, 3] = 1.0
+    T_wc = np.zeros_like(T_cw)
+    T_wc[:, :3, :3] = np.transpose(T_cw[:, :3, :3], (0, 2, 1))
+    T_wc[:, :3, 3] = -np.einsum("nij,nj->ni", T_wc[:, :3, :3], locations)
+    T_wc[:, 3, 3] = 1.0
+    T_cw = _f32(T_cw)
+    T_wc = _f32(T_wc)
+
+    # Intrinsic (FOV → 픽셀 단위 초점 거리)
+    focal_length_px = (res_y / 2.0) / math.tan(fov_rad / 2.0)
+    fx = focal_length_px / pixel_aspect_x
+    fy = focal_length_px / pixel_aspect_y
+    cx = res_x / 2.0 + shift_x * res_x
+    cy = res_y / 2.0 + shift_y * res_y
+    K = [[fx, 0, cx], [0, fy, cy], [0, 0, 1]]
+
+    # OpenGL 스타일 투영 행렬
+    f = 1.0 / math.tan(fov_rad / 2.0)
+    aspect = res_x / res_y
+    projection_matrix = [
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), (2 * far * near) / (near - far)],
+        [0, 0, -1, 0],
+    ]
+
+    views = []
+    for i in range(len(locations)):
+        T_cw_i = T_cw[i].tolist()
+        T_wc_i = T_wc[i].tolist()
+        view = {
+            'intrinsic': {'K': K, 'fx': fx, 'fy': fy, 'cx': cx, 'cy': cy, 'fov_degrees': math.degrees(fov_rad)},
+            'extrinsic': {
+                'T_cw': T_cw_i,  # Camera to World
+                'T_wc': T_wc_i,  # World to Camera
+                'R': T_cw_i[:3],
+                't': [T_cw_i[0][3], T_cw_i[1][3], T_cw_i[2][3]],
+            },
+            'matrices': {'view_matrix': T_wc_i, 'projection_matrix': projection_matrix},
+            'camera_info': {
+                'location': locations[i].tolist(),
+                'rotation_euler': rotation_euler[i].tolist(),
+                'lens_angle_degrees': math.degrees(fov_rad),
+                'clip_start': near,
+                'clip_end': far,
+                'shift_x': shift_x,
+                'shift_y': shift_y,
+            },
+        }
+        if view_names is not None:
+            view['view_name'] = view_names[i]
+        views.append(view)
+    return views
+
+
+def rig_camera_parameters(rig, resolution=(512, 512), pixel_aspect=(1.0, 1.0), **kwargs):
+    """rig의 모든 뷰에 대한 camera_parameters"""
+    return camera_parameters(rig.positions, rig.target, rig.fov_deg, resolution, pixel_aspect,
+                             view_names=rig.view_names, **kwargs)
+
+
+def _max_difference(a, b):
+    """중첩 리스트/숫자 두 개의 최대 절댓값 차이"""
+    return float(np.max(np.abs(np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64))))
+
+
+def verify_camera_file(json_path, target=DEFAULT_TARGET, rig_name=None, tolerance=1e-4):
+    """Blender로 추출한 카메라 파라미터 JSON과 해석적 계산 결과 비교, 통과하면 True
+
+    reference의 위치/화각/clip 값으로 다시 계산해서 모든 행렬을 비교. rig_name을 주면 rig 위치도 비교.
+    위치 성분(최대 ~100)은 float32 반올림 차이가 있으므로 상대 오차로 비교.
+    """
+    with open(json_path, encoding="utf-8") as f:
+        reference = json.load(f)
+    metadata = reference['metadata']
+    ref_views = reference['views']
+    info = ref_views[0]['camera_info']
+
+    views = camera_parameters(
+        [view['camera_info']['location'] for view in ref_views], target, info['lens_angle_degrees'],
+        metadata['resolution'], metadata.get('pixel_aspect', (1.0, 1.0)),
+        info['clip_start'], info['clip_end'], (info['shift_x'], info['shift_y']),
+    )
+
+    fields = [
+        ('intrinsic', 'K'), ('extrinsic', 'T_cw'), ('extrinsic', 'T_wc'), ('extrinsic', 'R'), ('extrinsic', 't'),
+        ('matrices', 'view_matrix'), ('matrices', 'projection_matrix'), ('camera_info', 'rotation_euler'),
+    ]
+    worst = {}
+    for view, ref in zip(views, ref_views):
+        for section, key in fields:
+            scale = max(1.0, float(np.max(np.abs(np.asarray(ref[section][key], dtype=np.float64)))))
+            diff = _max_difference(view[section][key], ref[section][key]) / scale
+            worst[f"{section}.{key}"] = max(worst.get(f"{section}.{key}", 0.0), diff)
+
+    if rig_name:
+        rig = get_rig(rig_name)
+        if len(rig) != len(ref_views):
+            worst['rig.location'] = float("inf")
+        else:
+            locations = [view['camera_info']['location'] for view in ref_views]
+            worst['rig.location'] = _max_difference(rig.positions, locations) / rig.distance
+
+    passed = all(diff <= tolerance for diff in worst.values())
+    print(f"{os.path.basename(json_path)}: {len(ref_views)} views {'OK' if passed else 'FAILED'}")
+    for key, diff in worst.items():
+        print(f"  {key:<28} max rel diff {diff:.2e}{'' if diff <= tolerance else '  <-- exceeds tolerance'}")
+    return passed
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tooth rendering camera rigs")
+    parser.add_argument("--rig-file", action="append", default=[], help="추가 rig 정의 JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="등록된 rig 목록")
+    show = sub.add_parser("show", help="rig의 뷰 이름과 카메라 위치 출력")
+    show.add_argument("name")
+    verify = sub.add_parser("verify", help="Blender로 추출한 카메라 파라미터 JSON과 해석적 계산 결과 비교")
+    verify.add_argument("json_files", nargs="+")
+    verify.add_argument("--rig", default=None, help="rig 위치도 비교")
+    verify.add_argument("--tolerance", type=float, default=1e-4)
+
+    if "--" in sys.argv and argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    args = parser.parse_args(argv)
+    for path in args.rig_file:
+        register_rig_file(os.path.abspath(path), replace=True)
+
+    if args.command == "list":
+        for name in rig_names():
+            rig = get_rig(name)
+            print(f"{name:>10}: {len(rig)} views - {rig.description}")
+    elif args.command == "show":
+        rig = get_rig(args.name)
+        print(f"{rig.name}: {rig.description} (target {rig.target.tolist()}, fov {rig.fov_deg:g})")
+        for name, position in zip(rig.view_names, rig.positions):
+            print(f"  {name:<24} {position[0]:10.4f} {position[1]:10.4f} {position[2]:10.4f}")
+    elif args.command == "verify":
+        results = [verify_camera_file(path, rig_name=args.rig, tolerance=args.tolerance) for path in args.json_files]
+        if not all(results):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,14 @@ import math
 import sys
 import time
 
+# 같은 폴더의 보조 모듈(toothrendering_*.py) import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from toothrendering_mesh import assign_material_indices, fit_labels_to_vertices, load_labels
+from toothrendering_rigs import camera_parameters, get_rig
+
 """
 Single Case Tooth Rendering Script (Simplified & Robust)
 - Sequence: Fixed to 4 (54 views)
@@ -55,10 +63,10 @@ class OT_SingleCaseRendering(bpy.types.Operator):
         scene.cycles.use_adaptive_sampling = True
         scene.cycles.max_bounces = 8
 
-        # === Generate Camera Positions (Sequence 4) ===
-        target = mathutils.Vector((0, 100, 0))
-        distance = 100
-        camera_positions = self._generate_sequence_4_positions(target, distance)
+        # === Generate Camera Positions (Sequence 4 rig, shared with toothrendering_optimized.py) ===
+        self.camera_rig = get_rig("seq4")
+        target = self.camera_rig.target_vector()
+        camera_positions = self.camera_rig.camera_positions()
 
         # === Create Materials ===
         materials = self._create_lit_materials()
@@ -76,7 +84,7 @@ class OT_SingleCaseRendering(bpy.types.Operator):
         self._save_metadata(scene, camera_positions, target, metadata_path)
 
         # === Rendering Loop ===
-        print(f"Starting rendering for {case_name} (54 views)...")
+        print(f"Starting rendering for {case_name} ({len(camera_positions)} views)...")
         start_time = time.time()
         
         for idx, (view_name, cam_pos) in enumerate(camera_positions):
@@ -88,7 +96,7 @@ class OT_SingleCaseRendering(bpy.types.Operator):
             direction = target - cam_pos
             cam_obj.rotation_euler = direction.to_track_quat("-Z", "Y").to_euler()
             scene.camera = cam_obj
-            cam_data.angle = math.radians(60)
+            cam_data.angle = math.radians(self.camera_rig.fov_deg)
 
             # Create Light (Sun following camera)
             light_data = bpy.data.lights.new(view_name + "_sun", type="SUN")
@@ -112,7 +120,7 @@ class OT_SingleCaseRendering(bpy.types.Operator):
             bpy.data.objects.remove(cam_obj, do_unlink=True)
             bpy.data.objects.remove(light_obj, do_unlink=True)
             
-            print(f"  [{idx+1}/54] Rendered {view_name}")
+            print(f"  [{idx+1}/{len(camera_positions)}] Rendered {view_name}")
 
         self._cleanup_gpu_memory()
         total_time = time.time() - start_time
@@ -131,46 +139,6 @@ class OT_SingleCaseRendering(bpy.types.Operator):
             for item in block:
                 block.remove(item, do_unlink=True)
 
-    def _generate_sequence_4_positions(self, target, distance):
-        camera_positions = []
-        base_vec = mathutils.Vector((0, -1, 0)) # Forward
-
-        # Ring 1: +30 elevation (12 views)
-        for i in range(12):
-            rot_z = mathutils.Matrix.Rotation(math.radians(i * 30), 3, 'Z')
-            rot_x = mathutils.Matrix.Rotation(math.radians(30), 3, 'X')
-            pos = target + (rot_z @ rot_x @ base_vec).normalized() * distance
-            camera_positions.append((f"ring1_{i+1:02d}", pos))
-
-        # Ring 2: 0 elevation (18 views)
-        for i in range(18):
-            rot_z = mathutils.Matrix.Rotation(math.radians(i * 20), 3, 'Z')
-            pos = target + (rot_z @ base_vec).normalized() * distance
-            camera_positions.append((f"ring2_{i+1:02d}", pos))
-
-        # Ring 3: -30 elevation (12 views)
-        for i in range(12):
-            rot_z = mathutils.Matrix.Rotation(math.radians(i * 30), 3, 'Z')
-            rot_x = mathutils.Matrix.Rotation(math.radians(-30), 3, 'X')
-            pos = target + (rot_z @ rot_x @ base_vec).normalized() * distance
-            camera_positions.append((f"ring3_{i+1:02d}", pos))
-
-        # Ring 4: Front sweep (10 views)
-        for i in range(10):
-            elev = 60 - i * 12
-            rot_x = mathutils.Matrix.Rotation(math.radians(elev), 3, 'X')
-            pos = target + (rot_x @ base_vec).normalized() * distance
-            camera_positions.append((f"ring4_{i+1:02d}", pos))
-
-        # Ring 5: Poles (2 views)
-        for elev in [90, -90]:
-            rot_x = mathutils.Matrix.Rotation(math.radians(elev), 3, 'X')
-            rot_z = mathutils.Matrix.Rotation(math.radians(90), 3, 'Z')
-            pos = target + (rot_z @ rot_x @ base_vec).normalized() * distance
-            camera_positions.append((f"ring5_{1 if elev > 0 else 2:02d}", pos))
-
-        return camera_positions
-
     def _create_lit_materials(self):
         mats = {}
         
@@ -233,43 +201,30 @@ class OT_SingleCaseRendering(bpy.types.Operator):
         mesh.materials.append(materials['gum'])
         mesh.materials.append(materials['tooth'])
 
-        with open(json_file) as f:
-            meta = json.load(f)
-        labels = meta["labels"]
-        
-        for poly in mesh.polygons:
-            face_labels = [labels[v] for v in poly.vertices if v < len(labels)]
-            poly.material_index = 1 if all(l > 0 for l in face_labels) else 0
+        labels = load_labels(json_file)
+
+        # Vertices without a label are ignored (padded with a tooth label), mixed faces -> gum
+        if len(labels) < len(mesh.vertices):
+            labels = fit_labels_to_vertices(labels, len(mesh.vertices), pad_value=1, verbose=False)
+        assign_material_indices(mesh, labels, mixed_index=0)
         return obj
 
     def _save_metadata(self, scene, camera_positions, target, path):
-        views = []
         res_x = scene.render.resolution_x
         res_y = scene.render.resolution_y
-        
-        for name, pos in camera_positions:
-            # Temporary cam for calculation
-            cam_data = bpy.data.cameras.new("temp")
-            cam_obj = bpy.data.objects.new("temp", cam_data)
-            bpy.context.collection.objects.link(cam_obj)
-            cam_obj.location = pos
-            cam_obj.rotation_euler = (target - pos).to_track_quat("-Z", "Y").to_euler()
-            cam_data.angle = math.radians(60)
-            bpy.context.view_layer.update()
-            
-            # Intrinsics
-            f = (res_y / 2.0) / math.tan(cam_data.angle / 2.0)
-            K = [[f, 0, res_x/2], [0, f, res_y/2], [0, 0, 1]]
-            
+
+        # All views at once, no temporary cameras (same convention as to_track_quat("-Z", "Y"))
+        params = camera_parameters([pos for _, pos in camera_positions], target, self.camera_rig.fov_deg,
+                                   (res_x, res_y))
+        views = []
+        for (name, _), view in zip(camera_positions, params):
             views.append({
                 'view_name': name,
-                'location': list(cam_obj.location),
-                'rotation_euler': list(cam_obj.rotation_euler),
-                'intrinsic_K': K,
-                'extrinsic_matrix': [list(row) for row in cam_obj.matrix_world.inverted()]
+                'location': view['camera_info']['location'],
+                'rotation_euler': view['camera_info']['rotation_euler'],
+                'intrinsic_K': view['intrinsic']['K'],
+                'extrinsic_matrix': view['extrinsic']['T_wc']
             })
-            bpy.data.objects.remove(cam_obj, do_unlink=True)
-            bpy.data.cameras.remove(cam_data, do_unlink=True)
 
         metadata = {
             'info': {